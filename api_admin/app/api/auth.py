@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -7,34 +7,66 @@ from ..crud import crud_user
 from ..schemas.token import Token
 from ..database import get_async_session
 from ..core.config import settings
+from ..core.cache import auth_cache
+from ..core.rate_limit import login_ip_limiter, login_user_limiter, rate_limit_headers
+from ..core.security import PasswordHasherBusyError
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+async def _throttle_login(request: Request, username: str):
+    """Spend one attempt from the caller's IP and from the username; 429 once either runs out"""
+    ip = request.client.host if request.client else "unknown"
+    for limiter, key in (
+        (login_ip_limiter, f"login:ip:{ip}"),
+        (login_user_limiter, f"login:user:{username.strip().lower()}")
+    ):
+        result = await limiter.hit(key)
+        if result is not None and not result.allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts, try again later",
+                headers=rate_limit_headers(result)
+            )
+
 @router.post("/api/auth/login", response_model=Token)
 async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     session: AsyncSession = Depends(get_async_session)
 ):
+    await _throttle_login(request, form_data.username)
     try:
-        print(f"Login attempt for username: {form_data.username}")
         user = await crud_user.authenticate_user(form_data.username, form_data.password, session)
-        print(f"Authentication result: {user}")
         if not user:
+            logger.info("Login failed", extra={"username": form_data.username})
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        # The record was just read, so later requests with the new token can use it
+        auth_cache.invalidate_user(user.username)
+        auth_cache.store_user(user)
         access_token_expires = timedelta(minutes=settings.get_token_expire_minutes())
         access_token = security.create_access_token(
             data={"sub": user.username}, expires_delta=access_token_expires
         )
+        logger.debug("Login succeeded", extra={"username": user.username})
         return {"access_token": access_token, "token_type": "bearer"}
+    except HTTPException:
+        raise
+    except PasswordHasherBusyError as e:
+        logger.warning(f"Login rejected: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many logins in progress, try again shortly",
+            headers={"Retry-After": "1"}
+        )
     except Exception as e:
-        import traceback
-        print(f"Login error: {e}")
-        print("Traceback:")
-        print(traceback.format_exc())
+        logger.exception(f"Login error: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
@@ -0,0 +1,129 @@
+# api_admin/app/api/catalog.py
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, Optional
+import json
+from ..database import get_async_session, AsyncSessionLocal
+from ..crud import crud_catalog
+from ..core.auth import get_current_user
+from ..core.events import config_events
+from ..models.user import User
+
+router = APIRouter()
+
+@router.get("/api/catalog/version")
+async def get_catalog_version(
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Current global config version"""
+    return {"version": await crud_catalog.get_catalog_version(session)}
+
+@router.get("/api/catalog/snapshot")
+async def get_catalog_snapshot(
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Every active client, API configuration and parameter template in one response
+    Middleware instances load this on cold start, then follow /api/catalog/changes
+    """
+    snapshot = await crud_catalog.get_catalog_snapshot(session)
+    # Rows are already JSON-ready; skip the per-field encoder on large catalogs
+    return JSONResponse(content=snapshot, headers={"X-Catalog-Version": str(snapshot["version"])})
+
+@router.get("/api/catalog/changes")
+async def get_catalog_changes(
+    since: int = Query(..., ge=0),
+    limit: int = Query(500, ge=1, le=500),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Rows changed after version `since`; follow `has_more` to page through large gaps"""
+    changes = await crud_catalog.get_catalog_changes(session, since, limit)
+    return JSONResponse(content=changes, headers={"X-Catalog-Version": str(changes["version"])})
+
+@router.get("/api/catalog/changes/wait")
+async def wait_for_catalog_changes(
+    since: int = Query(..., ge=0),
+    timeout: float = Query(25, gt=0, le=60),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Long-poll variant of /api/catalog/changes
+    Answers as soon as a change newer than `since` commits, or empty after `timeout` seconds
+    """
+    # Subscribe before checking the log so a commit in between isn't missed
+    subscription = config_events.subscribe()
+    try:
+        current_version = await crud_catalog.get_catalog_version(session)
+        # Release the connection while waiting; the next query starts a fresh read
+        await session.rollback()
+        if current_version <= since:
+            await subscription.get(timeout)
+    finally:
+        config_events.unsubscribe(subscription)
+    
+    changes = await crud_catalog.get_catalog_changes(session, since)
+    return JSONResponse(content=changes, headers={"X-Catalog-Version": str(changes["version"])})
+
+SSE_HEARTBEAT_SECONDS = 15
+
+def _sse_message(event: Dict[str, Any]) -> str:
+    lines = []
+    if event.get("version") is not None:
+        lines.append(f"id: {event['version']}")
+    lines.append(f"event: {event['type']}")
+    lines.append(f"data: {json.dumps(event)}")
+    return "\n".join(lines) + "\n\n"
+
+@router.get("/api/catalog/events")
+async def stream_catalog_events(
+    request: Request,
+    since: Optional[int] = Query(None, ge=0),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Server-sent events for every committed config change
+    Each event carries the new version plus the affected client_id/api_name. Reconnecting
+    clients pass Last-Event-ID (or ?since=) to replay what they missed from the change log.
+    """
+    last_event_id = request.headers.get("last-event-id")
+    if since is None and last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+    
+    subscription = config_events.subscribe()
+    
+    async def event_stream():
+        try:
+            replayed = since or 0
+            if since is not None:
+                async with AsyncSessionLocal() as session:
+                    replayed = await crud_catalog.get_catalog_version(session)
+                    changes = await crud_catalog.get_changes_since(session, since, replayed)
+                for change in changes:
+                    yield _sse_message(crud_catalog.change_event(change))
+            
+            while not await request.is_disconnected():
+                event = await subscription.get(SSE_HEARTBEAT_SECONDS)
+                if event is None:
+                    yield ": keep-alive\n\n"
+                elif event.get("version") is None or event["version"] > replayed:
+                    yield _sse_message(event)
+        finally:
+            config_events.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/api/catalog/events/stats")
+async def get_catalog_event_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """Subscriber and delivery counters for the change broadcast hub"""
+    return config_events.stats()
@@ -1,5 +1,6 @@
 # api_admin/app/api/client_api_configs.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from ..database import get_async_session
@@ -8,9 +9,18 @@ from ..schemas.client_api_config import (
     ClientApiConfig,
     ClientApiConfigCreate, 
     ClientApiConfigUpdate,
-    ClientWithApiConfigs
+    ClientWithApiConfigs,
+    ClientBundle,
+    ResolveBatchRequest,
+    ResolveBatchResult
 )
 from ..core.auth import get_current_user
+from ..core.cache import resolution_cache, response_cache, auth_cache
+from ..core.api_keys import api_key_index
+from ..core.template_compiler import compiled_templates
+from ..core.circuit_breaker import circuit_breakers, CLOSED
+from ..core.rate_limit import rate_limiter, enforce_rate_limit, rate_limit_headers
+from ..core.bulkhead import bulkheads
 from ..models.user import User
 
 router = APIRouter()
@@ -29,27 +39,30 @@ async def create_client_api_config(
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
     
-    # Check if this API type already exists for this client
-    existing_config = await crud_client_api_config.get_client_api_config(
-        session, client_id, config.api_name
-    )
-    if existing_config:
+    # The (client_id, api_name) unique index rejects duplicate API types
+    try:
+        return await crud_client_api_config.create_client_api_config(
+            session=session,
+            client_id=client_id,
+            api_name=config.api_name,
+            api_base_url=config.api_base_url,
+            api_token=config.api_token,
+            api_version=config.api_version,
+            timeout_seconds=config.timeout_seconds,
+            max_retries=config.max_retries,
+            breaker_failure_rate=config.breaker_failure_rate,
+            breaker_slow_call_ms=config.breaker_slow_call_ms,
+            breaker_slow_call_rate=config.breaker_slow_call_rate,
+            breaker_minimum_calls=config.breaker_minimum_calls,
+            breaker_open_seconds=config.breaker_open_seconds,
+            max_concurrent_calls=config.max_concurrent_calls,
+            description=config.description
+        )
+    except IntegrityError:
         raise HTTPException(
             status_code=400, 
             detail=f"API configuration for '{config.api_name}' already exists for this client"
         )
-    
-    return await crud_client_api_config.create_client_api_config(
-        session=session,
-        client_id=client_id,
-        api_name=config.api_name,
-        api_base_url=config.api_base_url,
-        api_token=config.api_token,
-        api_version=config.api_version,
-        timeout_seconds=config.timeout_seconds,
-        max_retries=config.max_retries,
-        description=config.description
-    )
 
 @router.get("/api/clients/{client_id}/api-configs", response_model=List[ClientApiConfig])
 async def get_client_api_configs(
@@ -83,13 +96,51 @@ async def get_client_with_api_configs(
     return ClientWithApiConfigs(
         id=client.id,
         name=client.name,
-        api_key=client.api_key,
+        api_key_prefix=client.api_key_prefix,
         active=client.active,
         description=client.description,
         created_at=client.created_at,
         api_configs=configs
     )
 
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+# Utility endpoint for the main API middleware
+@router.get("/api/clients/by-key/{api_key}/bundle", response_model=ClientBundle)
+async def get_client_bundle(
+    api_key: str,
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Client, active API configurations and their active parameter templates
+    Honors If-None-Match so polling middleware gets a 304 when nothing changed
+    """
+    
+    client_id = api_key_index.lookup(api_key)
+    if not client_id:
+        raise HTTPException(status_code=404, detail="Client not found")
+    
+    if request.headers.get("if-none-match"):
+        etag = await crud_client_api_config.get_client_bundle_etag(session, client_id)
+        if etag and _etag_matches(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+    
+    bundle = await crud_client_api_config.get_client_bundle(session, client_id)
+    if not bundle:
+        raise HTTPException(status_code=404, detail="Client not found")
+    
+    client, etag = bundle
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return client
+
 @router.put("/api/client-api-configs/{config_id}", response_model=ClientApiConfig)
 async def update_client_api_config(
     config_id: str,
@@ -107,6 +158,12 @@ async def update_client_api_config(
         api_version=config_update.api_version,
         timeout_seconds=config_update.timeout_seconds,
         max_retries=config_update.max_retries,
+        breaker_failure_rate=config_update.breaker_failure_rate,
+        breaker_slow_call_ms=config_update.breaker_slow_call_ms,
+        breaker_slow_call_rate=config_update.breaker_slow_call_rate,
+        breaker_minimum_calls=config_update.breaker_minimum_calls,
+        breaker_open_seconds=config_update.breaker_open_seconds,
+        max_concurrent_calls=config_update.max_concurrent_calls,
         description=config_update.description,
         active=config_update.active
     )
@@ -135,6 +192,7 @@ async def delete_client_api_config(
 async def resolve_client_api(
     client_api_key: str,
     api_name: str,
+    response: Response,
     session: AsyncSession = Depends(get_async_session)
 ):
     """
@@ -142,20 +200,197 @@ async def resolve_client_api(
     This endpoint is used by your main API middleware
     """
     
-    config = await crud_client_api_config.get_api_config_for_request(
-        session, client_api_key, api_name
-    )
+    # Unknown keys and throttled clients are turned away here, without a database read
+    client_id = api_key_index.lookup(client_api_key)
+    if client_id:
+        await enforce_rate_limit(response, client_id)
+    resolved = await crud_client_api_config.resolve_api_config(
+        session, client_id, api_name
+    ) if client_id else None
     
-    if not config:
+    if not resolved:
         raise HTTPException(
             status_code=404, 
             detail=f"No {api_name} API configuration found for client"
         )
     
+    return resolved
+
+MAX_RESOLVE_BATCH_SIZE = 200
+
+@router.post("/api/resolve-client-api:batch", response_model=List[ResolveBatchResult])
+async def resolve_client_api_batch(
+    batch: ResolveBatchRequest,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Resolve many (client API key, API name) pairs in one round trip
+    Unknown and rate-limited pairs are reported per item instead of failing the batch;
+    every item counts as one call against its client's rate limit
+    """
+    
+    if len(batch.items) > MAX_RESOLVE_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch size exceeds the limit of {MAX_RESOLVE_BATCH_SIZE} items"
+        )
+    
+    client_ids = {
+        item.client_api_key: api_key_index.lookup(item.client_api_key)
+        for item in batch.items
+    }
+    calls = {}
+    for item in batch.items:
+        client_id = client_ids[item.client_api_key]
+        if client_id:
+            calls[client_id] = calls.get(client_id, 0) + 1
+    # Limits are spent before resolving, so throttled clients cost no database work
+    limited = set()
+    for client_id, cost in calls.items():
+        result = await rate_limiter.hit(client_id, cost)
+        if result is None:
+            continue
+        if not result.allowed:
+            limited.add(client_id)
+        if len(calls) == 1:
+            response.headers.update(rate_limit_headers(result))
+    
+    resolved = await crud_client_api_config.resolve_api_configs(
+        session, [
+            (client_ids[item.client_api_key], item.api_name)
+            for item in batch.items
+            if client_ids[item.client_api_key] and client_ids[item.client_api_key] not in limited
+        ]
+    )
+    
+    results = []
+    for item in batch.items:
+        client_id = client_ids[item.client_api_key]
+        config = resolved.get((client_id, item.api_name))
+        if client_id in limited:
+            status_name, config = "rate_limited", None
+        else:
+            status_name = "ok" if config else "not_found"
+        results.append(ResolveBatchResult(
+            client_api_key=item.client_api_key,
+            api_name=item.api_name,
+            status=status_name,
+            config=config
+        ))
+    return results
+
+@router.get("/api/cache/stats")
+async def get_cache_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """Hit/miss counters for the in-process caches"""
+    return {
+        "resolution": resolution_cache.stats(),
+        "compiled_templates": compiled_templates.stats(),
+        "responses": response_cache.stats(),
+        "rate_limits": rate_limiter.stats(),
+        "auth": auth_cache.stats(),
+        "api_keys": api_key_index.stats()
+    }
+
+@router.get("/api/circuit-breakers")
+async def get_circuit_breakers(
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Circuit breaker state for every upstream this worker has called
+    Open breakers are listed first so tripped client upstreams stand out
+    """
+    snapshots = circuit_breakers.snapshots()
+    configs = await crud_client_api_config.get_client_api_configs_by_ids(
+        session, [snapshot["config_id"] for snapshot in snapshots]
+    )
+    for snapshot in snapshots:
+        config = configs.get(snapshot["config_id"])
+        snapshot["client_id"] = config.client_id if config else None
+        snapshot["api_name"] = config.api_name if config else None
+    return sorted(snapshots, key=lambda snapshot: snapshot["state"] == CLOSED)
+
+@router.get("/api/client-api-configs/{config_id}/circuit-breaker")
+async def get_circuit_breaker(
+    config_id: str,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Circuit breaker state for one API configuration"""
+    
+    config = await crud_client_api_config.get_client_api_config_by_id(session, config_id)
+    if not config:
+        raise HTTPException(status_code=404, detail="API configuration not found")
+    
+    breaker = circuit_breakers.find(config_id)
+    if breaker is None:
+        return {
+            "config_id": config_id,
+            "client_id": config.client_id,
+            "api_name": config.api_name,
+            "state": CLOSED,
+            "calls_in_window": 0
+        }
+    return {**breaker.snapshot(), "client_id": config.client_id, "api_name": config.api_name}
+
+@router.post("/api/client-api-configs/{config_id}/circuit-breaker/reset")
+async def reset_circuit_breaker(
+    config_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Close a tripped breaker, e.g. after the upstream was fixed"""
+    
+    breaker = circuit_breakers.find(config_id)
+    if breaker is not None:
+        breaker.reset()
+    return {"status": "success", "message": "Circuit breaker reset", "state": CLOSED}
+
+def _client_bulkhead_summary(client_id: str, snapshots: List[dict]) -> dict:
     return {
-        "api_base_url": config.api_base_url,
-        "api_token": config.api_token,
-        "api_version": config.api_version,
-        "timeout_seconds": config.timeout_seconds,
-        "max_retries": config.max_retries
-    }
\ No newline at end of file
+        "client_id": client_id,
+        "active": sum(snapshot["active"] for snapshot in snapshots),
+        "queued": sum(snapshot["queued"] for snapshot in snapshots),
+        "rejected": sum(snapshot["rejected"] for snapshot in snapshots),
+        "timed_out": sum(snapshot["timed_out"] for snapshot in snapshots),
+        "bulkheads": snapshots
+    }
+
+@router.get("/api/bulkheads")
+async def get_bulkheads(
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    In-flight, queued and rejected upstream calls per client on this worker
+    Clients with the deepest queues are listed first
+    """
+    by_client = {}
+    for snapshot in bulkheads.snapshots():
+        by_client.setdefault(snapshot["client_id"], []).append(snapshot)
+    clients = await crud_client.get_clients_by_ids(session, list(by_client))
+    
+    summaries = []
+    for client_id, snapshots in by_client.items():
+        summary = _client_bulkhead_summary(client_id, snapshots)
+        client = clients.get(client_id)
+        summary["client_name"] = client.name if client else None
+        summaries.append(summary)
+    return sorted(summaries, key=lambda summary: (-summary["queued"], -summary["rejected"]))
+
+@router.get("/api/clients/{client_id}/bulkheads")
+async def get_client_bulkheads(
+    client_id: str,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Bulkhead state for one client and its API configurations"""
+    
+    client = await crud_client.get_client(session, client_id)
+    if not client:
+        raise HTTPException(status_code=404, detail="Client not found")
+    
+    snapshots = [bulkhead.snapshot() for bulkhead in bulkheads.find_client(client_id)]
+    return {**_client_bulkhead_summary(client_id, snapshots), "client_name": client.name}
@@ -6,18 +6,41 @@ from ..database import get_async_session
 from ..crud import crud_client
 from ..core.auth import get_current_user
 from ..models.user import User
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-from ..schemas.client import ClientCreate, Client as ClientResponse
+from ..schemas.client import ClientCreate, Client as ClientResponse, ClientWithApiKey
+
+def _with_api_key(client, api_key: str) -> ClientWithApiKey:
+    return ClientWithApiKey(**ClientResponse.model_validate(client).model_dump(), api_key=api_key)
 
-@router.post("/api/clients", response_model=ClientResponse)
+@router.post("/api/clients", response_model=ClientWithApiKey)
 async def create_client(
     client: ClientCreate,
     session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ):
-    return await crud_client.create_client(session, client.name)
+    """Create a client; the response carries its API key, which can't be read back later"""
+    created, api_key = await crud_client.create_client(
+        session, client.name, client.rate_limit_per_minute,
+        client.max_concurrent_calls, client.max_queued_calls
+    )
+    return _with_api_key(created, api_key)
+
+@router.post("/api/clients/{client_id}/api-key", response_model=ClientWithApiKey)
+async def rotate_client_api_key(
+    client_id: str,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Issue a new API key for a client; the old key stops working immediately"""
+    rotated = await crud_client.rotate_api_key(session, client_id)
+    if not rotated:
+        raise HTTPException(status_code=404, detail="Client not found")
+    return _with_api_key(*rotated)
 
 @router.get("/api/clients", response_model=List[ClientResponse])
 async def get_clients(
@@ -25,15 +48,11 @@ async def get_clients(
     current_user: User = Depends(get_current_user)
 ):
     try:
-        print("Getting clients for user:", current_user.username)
         clients = await crud_client.get_clients(session)
-        print("Found clients:", clients)
+        logger.debug(f"Listed {len(clients)} clients for {current_user.username}")
         return clients
     except Exception as e:
-        import traceback
-        print("Error getting clients:", str(e))
-        print("Traceback:")
-        print(traceback.format_exc())
+        logger.exception(f"Error getting clients: {e}")
         raise HTTPException(
             status_code=500,
             detail=f"Error getting clients: {str(e)}"
@@ -57,7 +76,10 @@ async def update_client(
     session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ):
-    updated_client = await crud_client.update_client(session, client_id, client.name, client.active)
+    # Only what the caller sent; the dashboard's edit form sends just name and active
+    updated_client = await crud_client.update_client(
+        session, client_id, client.model_dump(exclude_unset=True)
+    )
     if not updated_client:
         raise HTTPException(status_code=404, detail="Client not found")
     return updated_client
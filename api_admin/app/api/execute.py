@@ -0,0 +1,89 @@
+# api_admin/app/api/execute.py
+from fastapi import APIRouter, Depends, HTTPException, Response
+import math
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_async_session
+from ..crud import crud_client_api_config, crud_client_api_parameter
+from ..schemas.execute import ExecuteRequest, ExecuteResult
+from ..core.executor import upstream_executor, UpstreamError, CircuitOpenError
+from ..core.json_stream import JSONStreamError
+from ..core.bulkhead import BulkheadFullError
+from ..core.template_compiler import compile_template, MissingParametersError
+from ..core.rate_limit import enforce_rate_limit
+from ..core.api_keys import api_key_index
+from ..core.auth import get_current_user
+from ..models.user import User
+
+router = APIRouter()
+
+@router.post("/api/execute", response_model=ExecuteResult)
+async def execute_api_call(
+    request: ExecuteRequest,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Render a client's parameter template and call the upstream API with it
+    Uses the configuration's timeout, retries and token; the response is reduced
+    to the template's response_mapping when it has one
+    """
+    
+    client_id = api_key_index.lookup(request.client_api_key)
+    if client_id:
+        await enforce_rate_limit(response, client_id)
+    config = await crud_client_api_config.resolve_api_config(
+        session, client_id, request.api_name
+    ) if client_id else None
+    if not config:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No {request.api_name} API configuration found for client"
+        )
+    
+    template = await crud_client_api_parameter.get_parameter_template_by_name(
+        session, config["config_id"], request.template_name
+    )
+    if not template:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Parameter template '{request.template_name}' not found"
+        )
+    # Nothing below needs the database; don't hold a connection across the upstream call
+    await session.close()
+    
+    compiled = compile_template(template)
+    try:
+        call = compiled(request.input, config["api_base_url"])
+    except MissingParametersError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    mapping = compiled.streaming_mapping if compiled.response_mapping else None
+    try:
+        upstream = await upstream_executor.execute(call, config, mapping, cache_policy=compiled.cache_policy)
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(max(math.ceil(e.retry_after), 1))}
+        )
+    except BulkheadFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+    except UpstreamError as e:
+        raise HTTPException(status_code=504 if e.timed_out else 502, detail=str(e))
+    except JSONStreamError as e:
+        raise HTTPException(status_code=502, detail=f"Invalid upstream response: {e}")
+    
+    return ExecuteResult(
+        status_code=upstream.status_code,
+        data=upstream.mapped if upstream.mapped is not None else upstream.body,
+        attempts=upstream.attempts,
+        elapsed_ms=upstream.elapsed_ms,
+        cached=upstream.cached
+    )
+
+@router.get("/api/execute/stats")
+async def get_execute_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """Request, retry and connection pool counters for upstream calls"""
+    return {"executor": upstream_executor.stats()}
@@ -0,0 +1,150 @@
+# api_admin/app/api/intents.py
+from fastapi import APIRouter, Depends, HTTPException, Response
+from typing import Dict, List
+import asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_async_session
+from ..crud import crud_intent
+from ..schemas.intent import (
+    IntentClassifyRequest,
+    IntentClassifyResult,
+    IntentCandidate,
+    IntentClassifyBatchRequest,
+    IntentClassifyBatchResult
+)
+from ..core.intent_router import ClientIntents, intent_router
+from ..core.intent_classifier import IntentDecision, intent_classifier
+from ..core.intent_cache import intent_cache
+from ..core.rate_limit import enforce_rate_limit, rate_limiter, rate_limit_headers
+from ..core.api_keys import api_key_index
+from ..core.auth import get_current_user
+from ..models.user import User
+
+router = APIRouter()
+
+def _result(decision: IntentDecision, entities: Dict[str, str], top_k: int) -> IntentClassifyResult:
+    document = decision.document
+    if document is not None:
+        entities = {source: entities[source] for source in document.sources if source in entities}
+    return IntentClassifyResult(
+        template_name=document.template_name if document else None,
+        api_name=document.api_name if document else None,
+        confidence=decision.confidence,
+        source=decision.source,
+        cached=decision.cached,
+        entities=entities,
+        missing_sources=[
+            source for source in document.required_sources if source not in entities
+        ] if document else [],
+        candidates=[
+            IntentCandidate(
+                template_name=match.document.template_name,
+                api_name=match.document.api_name,
+                score=match.score
+            )
+            for match in decision.matches[:max(top_k, 0)]
+        ]
+    )
+
+@router.post("/api/intents:classify", response_model=IntentClassifyResult)
+async def classify(
+    request: IntentClassifyRequest,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Map a user question to one of the client's parameter templates
+    Scored locally against template names, descriptions and parameter sources;
+    the configured model is only asked when the local match is uncertain and no
+    similar question was answered recently
+    """
+    
+    client_id = api_key_index.lookup(request.client_api_key)
+    if client_id:
+        await enforce_rate_limit(response, client_id)
+    intents = await crud_intent.get_client_intents(session, client_id) if client_id else None
+    if not intents:
+        raise HTTPException(status_code=404, detail="Client not found")
+    # A model fallback can take a while; don't hold a connection across it
+    await session.close()
+    
+    decision = await intent_classifier.classify(intents.index, request.query, intents.client_id)
+    return _result(decision, intents.extractor.extract(request.query), request.top_k)
+
+MAX_INTENT_BATCH_SIZE = 100
+
+@router.post("/api/intents:classify-batch", response_model=List[IntentClassifyBatchResult])
+async def classify_batch(
+    batch: IntentClassifyBatchRequest,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Classify many questions in one round trip
+    Questions are grouped per client and each group needs at most one model call;
+    unknown and rate-limited clients are reported per item, and every item counts
+    as one call against its client's rate limit
+    """
+    
+    if len(batch.items) > MAX_INTENT_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch size exceeds the limit of {MAX_INTENT_BATCH_SIZE} items"
+        )
+    
+    groups: Dict[str, List[int]] = {}
+    for position, item in enumerate(batch.items):
+        groups.setdefault(item.client_api_key, []).append(position)
+    clients, limited = {}, set()
+    for api_key, positions in groups.items():
+        client_id = api_key_index.lookup(api_key)
+        limit = await rate_limiter.hit(client_id, len(positions)) if client_id else None
+        if limit is not None and len(groups) == 1:
+            response.headers.update(rate_limit_headers(limit))
+        if limit is not None and not limit.allowed:
+            limited.add(api_key)
+            continue
+        clients[api_key] = await crud_intent.get_client_intents(session, client_id) if client_id else None
+    await session.close()
+    
+    results: List[IntentClassifyBatchResult] = [None] * len(batch.items)
+    
+    async def classify_group(api_key: str, positions: List[int], intents: ClientIntents):
+        decisions = await intent_classifier.classify_many(
+            intents.index, [batch.items[position].query for position in positions], intents.client_id
+        )
+        for position, decision in zip(positions, decisions):
+            item = batch.items[position]
+            results[position] = IntentClassifyBatchResult(
+                client_api_key=api_key,
+                query=item.query,
+                status="ok",
+                result=_result(decision, intents.extractor.extract(item.query), item.top_k)
+            )
+    
+    classifying = []
+    for api_key, positions in groups.items():
+        intents = clients.get(api_key)
+        if intents is None:
+            status_name = "rate_limited" if api_key in limited else "not_found"
+            for position in positions:
+                item = batch.items[position]
+                results[position] = IntentClassifyBatchResult(
+                    client_api_key=api_key, query=item.query, status=status_name
+                )
+            continue
+        classifying.append(classify_group(api_key, positions, intents))
+    # Clients' model calls overlap instead of adding up; each group fills its own positions
+    await asyncio.gather(*classifying)
+    return results
+
+@router.get("/api/intents/stats")
+async def get_intent_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """How often the local router answered on its own, the cache answered, or the model was asked"""
+    return {
+        "decisions": intent_classifier.stats(),
+        "router": intent_router.stats(),
+        "cache": intent_cache.stats()
+    }
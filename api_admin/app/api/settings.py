@@ -1,15 +1,174 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Callable, Dict, List, Optional
 from ..database import get_async_session
 from ..crud import crud_setting
 from ..schemas.setting import Setting, SettingCreate, SettingUpdate
 from ..core.auth import get_current_user
 from ..models.user import User
 from ..core.config import settings
+from ..core.cache import auth_cache, resolution_cache, response_cache
+from ..core.rate_limit import rate_limiter, login_ip_limiter, login_user_limiter
+from ..core.security import password_hasher
+from ..core.executor import upstream_executor
+from ..core.circuit_breaker import circuit_breakers
+from ..core.bulkhead import bulkheads
+from ..core.intent_router import intent_router
+from ..core.llm import intent_model
+from ..core.intent_classifier import intent_classifier
+from ..core.intent_cache import intent_cache
+from ..core.logging_config import logging_system
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Each configure_* pushes the current `settings` values into one subsystem; the
+# lifespan in main.py calls them at startup and the routes below after a change
+
+def configure_logging():
+    logging_system.configure(
+        level=settings.get_log_level(),
+        log_format=settings.get_log_format(),
+        sample_rates=settings.get_log_sample_rates()
+    )
+
+def configure_resolution_cache():
+    resolution_cache.configure(
+        max_entries=settings.get_resolve_cache_max_entries(),
+        ttl_seconds=settings.get_resolve_cache_ttl_seconds(),
+        negative_ttl_seconds=settings.get_resolve_cache_negative_ttl_seconds()
+    )
+
+def configure_response_cache():
+    response_cache.configure(default_max_entries=settings.get_response_cache_max_entries())
+
+def configure_auth_cache():
+    auth_cache.configure(
+        max_tokens=settings.get_auth_token_cache_max_entries(),
+        user_ttl_seconds=settings.get_auth_user_cache_ttl_seconds()
+    )
+
+def configure_upstream():
+    upstream_executor.configure(
+        max_connections=settings.get_upstream_max_connections(),
+        max_keepalive_connections=settings.get_upstream_max_keepalive_connections(),
+        keepalive_expiry_seconds=settings.get_upstream_keepalive_expiry_seconds(),
+        backoff_base_seconds=settings.get_upstream_retry_backoff_seconds(),
+        backoff_max_seconds=settings.get_upstream_retry_backoff_max_seconds()
+    )
+
+def configure_circuit_breakers():
+    circuit_breakers.configure(
+        failure_rate=settings.get_breaker_failure_rate(),
+        slow_call_ms=settings.get_breaker_slow_call_ms(),
+        slow_call_rate=settings.get_breaker_slow_call_rate(),
+        minimum_calls=settings.get_breaker_minimum_calls(),
+        open_seconds=settings.get_breaker_open_seconds()
+    )
+
+def configure_bulkheads():
+    # Live bulkheads pick the new defaults up on their next call
+    bulkheads.configure(
+        max_concurrent=settings.get_bulkhead_max_concurrent_calls(),
+        max_queued=settings.get_bulkhead_max_queued_calls(),
+        queue_timeout_seconds=settings.get_bulkhead_queue_timeout_seconds()
+    )
+
+def configure_intents():
+    intent_router.configure(confidence_threshold=settings.get_intent_confidence_threshold())
+    intent_model.configure(
+        api_key=settings.get_openai_api_key(),
+        model=settings.get_openai_model(),
+        base_url=settings.get_openai_base_url(),
+        timeout_seconds=settings.get_intent_model_timeout_seconds()
+    )
+    intent_classifier.configure(
+        model_backend=settings.get_intent_model_backend(),
+        batch_window_ms=settings.get_intent_batch_window_ms(),
+        batch_max_size=settings.get_intent_batch_max_size()
+    )
+
+def configure_intent_cache():
+    intent_cache.configure(
+        ttl_seconds=settings.get_intent_cache_ttl_seconds(),
+        max_entries=settings.get_intent_cache_max_entries(),
+        similarity=settings.get_intent_cache_similarity()
+    )
+
+def configure_rate_limits():
+    for limiter, limit in (
+        (rate_limiter, settings.get_api_rate_limit()),
+        (login_ip_limiter, settings.get_login_rate_limit_per_ip()),
+        (login_user_limiter, settings.get_login_rate_limit_per_username())
+    ):
+        limiter.configure(
+            default_limit=limit,
+            backend=settings.get_rate_limit_backend(),
+            path=settings.get_rate_limit_path()
+        )
+
+def configure_password_hasher():
+    # A new concurrency takes effect with the next login; checks under way finish on the old pool
+    password_hasher.configure(
+        max_concurrency=settings.get_password_hash_max_concurrency(),
+        queue_timeout_seconds=settings.get_password_hash_queue_timeout_seconds()
+    )
+
+# Settings that take effect without a restart, and the function that applies them
+LIVE_SETTINGS: Dict[str, Callable[[], None]] = {
+    "log_level": configure_logging,
+    "log_format": configure_logging,
+    "log_sample_rates": configure_logging,
+    "resolve_cache_max_entries": configure_resolution_cache,
+    "resolve_cache_ttl_seconds": configure_resolution_cache,
+    "resolve_cache_negative_ttl_seconds": configure_resolution_cache,
+    "response_cache_max_entries": configure_response_cache,
+    "auth_token_cache_max_entries": configure_auth_cache,
+    "auth_user_cache_ttl_seconds": configure_auth_cache,
+    # Pool limits are fixed when an upstream's pool opens, so only the backoff is live
+    "upstream_retry_backoff_seconds": configure_upstream,
+    "upstream_retry_backoff_max_seconds": configure_upstream,
+    "breaker_failure_rate": configure_circuit_breakers,
+    "breaker_slow_call_ms": configure_circuit_breakers,
+    "breaker_slow_call_rate": configure_circuit_breakers,
+    "breaker_minimum_calls": configure_circuit_breakers,
+    "breaker_open_seconds": configure_circuit_breakers,
+    "bulkhead_max_concurrent_calls": configure_bulkheads,
+    "bulkhead_max_queued_calls": configure_bulkheads,
+    "bulkhead_queue_timeout_seconds": configure_bulkheads,
+    "intent_confidence_threshold": configure_intents,
+    "intent_model_timeout_seconds": configure_intents,
+    "intent_model_backend": configure_intents,
+    "openai_api_key": configure_intents,
+    "openai_model": configure_intents,
+    "openai_base_url": configure_intents,
+    "intent_batch_window_ms": configure_intents,
+    "intent_batch_max_size": configure_intents,
+    "intent_cache_ttl_seconds": configure_intent_cache,
+    "intent_cache_max_entries": configure_intent_cache,
+    "intent_cache_similarity": configure_intent_cache,
+    "api_rate_limit": configure_rate_limits,
+    "rate_limit_backend": configure_rate_limits,
+    "rate_limit_path": configure_rate_limits,
+    "login_rate_limit_per_ip": configure_rate_limits,
+    "login_rate_limit_per_username": configure_rate_limits,
+    "password_hash_max_concurrency": configure_password_hasher,
+    "password_hash_queue_timeout_seconds": configure_password_hasher
+}
+
+def _apply_setting(key: str, value: Optional[str]):
+    """Make a created, changed or deleted (value None) setting take effect"""
+    settings.set_database_setting(key, value)
+    configure = LIVE_SETTINGS.get(key)
+    if configure is None:
+        return
+    try:
+        configure()
+    except ValueError as e:
+        logger.warning(f"Invalid {key} value: {e}")
+
 @router.get("/api/settings", response_model=List[Setting])
 async def get_settings(
     session: AsyncSession = Depends(get_async_session),
@@ -44,13 +203,7 @@ async def create_setting(
         session, setting.key, setting.value, setting.description
     )
     
-    # Update config if jwt_token_expire_minutes is changed
-    if setting.key == 'jwt_token_expire_minutes':
-        try:
-            settings.ACCESS_TOKEN_EXPIRE_MINUTES = int(setting.value)
-        except (ValueError, TypeError):
-            print("Invalid jwt_token_expire_minutes value")
-            settings.ACCESS_TOKEN_EXPIRE_MINUTES = 30  # fallback to default
+    _apply_setting(setting.key, setting.value)
     
     return result
 
@@ -66,16 +219,9 @@ async def update_setting(
         session, key, setting.value, setting.description
     )
     
-    # Update config if jwt_token_expire_minutes is changed
-    if key == 'jwt_token_expire_minutes':
-        try:
-            settings.ACCESS_TOKEN_EXPIRE_MINUTES = int(setting.value)
-        except (ValueError, TypeError):
-            print("Invalid jwt_token_expire_minutes value")
-            settings.ACCESS_TOKEN_EXPIRE_MINUTES = 30  # fallback to default
-    
     if not result:
         raise HTTPException(status_code=404, detail="Setting not found")
+    _apply_setting(key, setting.value)
     return result
 
 @router.delete("/api/settings/{key}")
@@ -86,5 +232,7 @@ async def delete_setting(
 ):
     """Delete a setting"""
     if await crud_setting.delete_setting(session, key):
+        # Back to the built-in default
+        _apply_setting(key, None)
         return {"status": "success"}
     raise HTTPException(status_code=404, detail="Setting not found")
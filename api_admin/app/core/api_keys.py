@@ -0,0 +1,69 @@
+# api_admin/app/core/api_keys.py
+import hashlib
+import hmac
+import uuid
+from typing import Any, Dict, Iterable, Optional, Tuple
+from .config import settings
+
+# Characters of a key kept in clear so admins can tell keys apart
+PREFIX_LENGTH = 8
+
+def generate_api_key() -> str:
+    return str(uuid.uuid4())
+
+def hash_api_key(api_key: str) -> str:
+    """
+    Keyed SHA-256 of a client API key, the only form of it that is stored
+    Keyed with SECRET_KEY, so changing SECRET_KEY invalidates every client key.
+    """
+    return hmac.new(settings.SECRET_KEY.encode("utf-8"), api_key.encode("utf-8"), hashlib.sha256).hexdigest()
+
+def api_key_prefix(api_key: str) -> str:
+    return api_key[:PREFIX_LENGTH]
+
+class ApiKeyIndex:
+    """
+    Client API key hash -> client id for every client, so a key is checked without the database
+    Loaded at startup and kept current by the client CRUD functions and, for other
+    worker processes, by the config change tailer.
+    """
+
+    def __init__(self):
+        self._client_ids: Dict[str, str] = {}
+        self._hashes: Dict[str, str] = {}  # client id -> its key hash
+        self.loaded = False
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, rows: Iterable[Tuple[str, Optional[str]]]):
+        """Replace the index with (client_id, api_key_hash) rows"""
+        self._client_ids.clear()
+        self._hashes.clear()
+        for client_id, api_key_hash in rows:
+            self.set(client_id, api_key_hash)
+        self.loaded = True
+
+    def set(self, client_id: str, api_key_hash: Optional[str]):
+        self.remove(client_id)
+        if api_key_hash:
+            self._client_ids[api_key_hash] = client_id
+            self._hashes[client_id] = api_key_hash
+
+    def remove(self, client_id: str):
+        api_key_hash = self._hashes.pop(client_id, None)
+        if api_key_hash is not None:
+            self._client_ids.pop(api_key_hash, None)
+
+    def lookup(self, api_key: str) -> Optional[str]:
+        """The id of the client owning `api_key`, or None for an unknown key"""
+        client_id = self._client_ids.get(hash_api_key(api_key)) if api_key else None
+        if client_id is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return client_id
+
+    def stats(self) -> Dict[str, Any]:
+        return {"keys": len(self._client_ids), "loaded": self.loaded, "hits": self.hits, "misses": self.misses}
+
+api_key_index = ApiKeyIndex()
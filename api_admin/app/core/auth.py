@@ -1,61 +1,57 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
-from sqlalchemy.ext.asyncio import AsyncSession
-from ..database import get_async_session
+from ..database import AsyncSessionLocal
 from ..crud import crud_user
 from .config import settings
+from .cache import auth_cache
+import logging
+
+logger = logging.getLogger(__name__)
 
 security = HTTPBearer()
 
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    session: AsyncSession = Depends(get_async_session)
+    credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
+    """
+    The user a bearer token belongs to
+    Verified tokens and user records are cached (see AuthCache), so a repeat
+    call needs neither a signature check nor a database session
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    print(f"Received credentials: {credentials.credentials}")
-    try:
-        payload = jwt.decode(credentials.credentials, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        print(f"Decoded payload: {payload}")
-        username: str = payload.get("sub")
-        if username is None:
-            print("No username in payload")
+    token = credentials.credentials
+    username = auth_cache.lookup_token(token)
+    if username is None:
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            username: str = payload.get("sub")
+            if username is None:
+                logger.info("Rejected token without a subject")
+                raise credentials_exception
+        except JWTError as e:
+            logger.info(f"Rejected token: {e}")
             raise credentials_exception
-    except JWTError as e:
-        print(f"JWT Error: {e}")
-        raise credentials_exception
-    except Exception as e:
-        print(f"Unexpected error: {e}")
-        raise credentials_exception
-        
-    user = await crud_user.get_user(username, session)
-    if user is None:
-        print("User not found in database")
-        raise credentials_exception
-        
-    print(f"Successfully authenticated user: {user.username}")
-    return user
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.exception(f"Unexpected error verifying token: {e}")
+            raise credentials_exception
+        auth_cache.store_token(token, username, payload.get("exp"))
     
-    try:
-        token = credentials.credentials
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
+    found, user = auth_cache.lookup_user(username)
+    if not found:
+        generation = auth_cache.generation
+        async with AsyncSessionLocal() as session:
+            user = await crud_user.get_user(username, session)
+        if user is None:
+            logger.info(f"Token subject {username} is not a user")
             raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-        
-    user = await crud_user.get_user_by_username(session, username)
-    if user is None:
-        raise credentials_exception
-        
+        auth_cache.store_user(user, generation)
+        logger.debug(f"Authenticated user {user.username}")
+    
     return user
@@ -0,0 +1,200 @@
+# api_admin/app/core/bulkhead.py
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, List, NamedTuple, Optional
+from .events import config_events
+
+CLIENT_SCOPE = "client"
+CONFIG_SCOPE = "api_config"
+
+class BulkheadFullError(Exception):
+    """Raised without calling the upstream when a client's bulkhead and wait queue are full"""
+
+    def __init__(self, scope: str, key: str, timed_out: bool = False):
+        reason = "timed out waiting for a free slot" if timed_out else "has no free slot or queue space"
+        super().__init__(f"Concurrency limit for {scope} {key} {reason}")
+        self.scope = scope
+        self.key = key
+        self.timed_out = timed_out
+
+class BulkheadSettings(NamedTuple):
+    max_concurrent: int  # In-flight upstream calls; 0 or less disables the bulkhead
+    max_queued: int  # Calls waiting for a slot; more are rejected at once
+    queue_timeout_seconds: float  # Longest wait for a slot
+
+class Bulkhead:
+    """
+    Caps in-flight calls for one client or API configuration
+    Calls beyond `max_concurrent` wait in FIFO order; once `max_queued` are waiting,
+    further calls are rejected immediately instead of piling up.
+    """
+
+    def __init__(self, scope: str, key: str, settings: BulkheadSettings, client_id: Optional[str] = None):
+        self.scope = scope
+        self.key = key
+        self.client_id = client_id
+        self.settings = settings
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.accepted = 0
+        self.queued_total = 0
+        self.peak_queued = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    @property
+    def idle(self) -> bool:
+        return self.active == 0 and not self.queued
+
+    def reconfigure(self, settings: BulkheadSettings):
+        if settings == self.settings:
+            return
+        self.settings = settings
+        self._wake()
+
+    async def acquire(self):
+        if self.settings.max_concurrent <= 0:
+            self.accepted += 1
+            return
+        if self.active < self.settings.max_concurrent and not self.queued:
+            self.active += 1
+            self.accepted += 1
+            return
+        if self.queued >= self.settings.max_queued:
+            self.rejected += 1
+            raise BulkheadFullError(self.scope, self.key)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued_total += 1
+        self.peak_queued = max(self.peak_queued, self.queued)
+        try:
+            await asyncio.wait_for(waiter, self.settings.queue_timeout_seconds)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the caller gave up
+                self.release()
+            if isinstance(e, asyncio.TimeoutError):
+                self.timed_out += 1
+                raise BulkheadFullError(self.scope, self.key, timed_out=True) from None
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        self.accepted += 1
+
+    def release(self):
+        if self.active > 0:
+            self.active -= 1
+        self._wake()
+
+    def _wake(self):
+        # Slots go to waiters directly, so a newcomer can't overtake the queue
+        limit = self.settings.max_concurrent
+        while self._waiters and (limit <= 0 or self.active < limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            if limit > 0:
+                self.active += 1
+            waiter.set_result(None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "scope": self.scope,
+            "key": self.key,
+            "client_id": self.client_id,
+            "active": self.active,
+            "queued": self.queued,
+            "peak_queued": self.peak_queued,
+            "accepted": self.accepted,
+            "queued_total": self.queued_total,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "settings": self.settings._asdict()
+        }
+
+class BulkheadRegistry:
+    """
+    Bulkheads keyed by Client.id, plus optional tighter ones keyed by ClientApiConfig.id
+    Client limits missing on a client use the defaults; a configuration only gets its
+    own bulkhead when it sets max_concurrent_calls.
+    """
+
+    def __init__(self):
+        self._bulkheads: Dict[tuple, Bulkhead] = {}
+        self.defaults = BulkheadSettings(max_concurrent=20, max_queued=50, queue_timeout_seconds=5.0)
+
+    def configure(self, **defaults):
+        self.defaults = self.defaults._replace(**{k: v for k, v in defaults.items() if v is not None})
+
+    def _get(self, scope: str, key: str, settings: BulkheadSettings, client_id: Optional[str]) -> Bulkhead:
+        bulkhead = self._bulkheads.get((scope, key))
+        if bulkhead is None:
+            bulkhead = self._bulkheads[(scope, key)] = Bulkhead(scope, key, settings, client_id)
+        else:
+            bulkhead.reconfigure(settings)
+        return bulkhead
+
+    def for_config(self, config: Dict[str, Any]) -> List[Bulkhead]:
+        """Bulkheads a call through a resolved config payload passes, narrowest first"""
+        defaults = self.defaults
+        client_id = config.get("client_id")
+        bulkheads = []
+        if config.get("config_id") and config.get("max_concurrent_calls"):
+            bulkheads.append(self._get(CONFIG_SCOPE, config["config_id"], BulkheadSettings(
+                max_concurrent=config["max_concurrent_calls"],
+                max_queued=defaults.max_queued if config.get("client_max_queued_calls") is None else config["client_max_queued_calls"],
+                queue_timeout_seconds=defaults.queue_timeout_seconds
+            ), client_id))
+        if client_id:
+            client_limit = config.get("client_max_concurrent_calls")
+            client_queue = config.get("client_max_queued_calls")
+            bulkheads.append(self._get(CLIENT_SCOPE, client_id, BulkheadSettings(
+                max_concurrent=defaults.max_concurrent if client_limit is None else client_limit,
+                max_queued=defaults.max_queued if client_queue is None else client_queue,
+                queue_timeout_seconds=defaults.queue_timeout_seconds
+            ), client_id))
+        return bulkheads
+
+    @asynccontextmanager
+    async def slot(self, config: Dict[str, Any]):
+        """Hold a slot in every bulkhead for the config for the duration of the block"""
+        held = []
+        try:
+            for bulkhead in self.for_config(config):
+                await bulkhead.acquire()
+                held.append(bulkhead)
+            yield
+        finally:
+            for bulkhead in reversed(held):
+                bulkhead.release()
+
+    def find_client(self, client_id: str) -> List[Bulkhead]:
+        return [bulkhead for bulkhead in self._bulkheads.values() if bulkhead.client_id == client_id]
+
+    def discard_idle(self, scope: str, key: str):
+        bulkhead = self._bulkheads.get((scope, key))
+        if bulkhead is not None and bulkhead.idle:
+            del self._bulkheads[(scope, key)]
+
+    def snapshots(self) -> List[Dict[str, Any]]:
+        return [bulkhead.snapshot() for bulkhead in self._bulkheads.values()]
+
+bulkheads = BulkheadRegistry()
+
+def _on_config_change(event: Dict[str, Any]):
+    # Busy bulkheads are kept so their slot accounting stays right; limits follow the payload
+    if event.get("operation") != "delete":
+        return
+    if event.get("entity_type") == "client":
+        bulkheads.discard_idle(CLIENT_SCOPE, event["entity_id"])
+    elif event.get("entity_type") == "api_config":
+        bulkheads.discard_idle(CONFIG_SCOPE, event["entity_id"])
+
+config_events.add_listener(_on_config_change)
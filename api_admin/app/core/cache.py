@@ -0,0 +1,320 @@
+# api_admin/app/core/cache.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+from .events import config_events
+
+class LRUCache:
+    """Thread-safe LRU cache with optional per-entry TTL and hit/miss counters"""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (found, value) so cached None values can be told apart from misses"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        found, value = self.lookup(key)
+        return value if found else default
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return entry[0] if entry else None
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every entry whose key matches the predicate"""
+        with self._lock:
+            stale = [key for key in self._entries if predicate(key)]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def configure(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if ttl_seconds is not None:
+                self.ttl_seconds = ttl_seconds
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class ResolutionCache:
+    """
+    Read-through cache for /api/resolve-client-api keyed by (client_id, api_name).
+    Unknown API names are cached as None for a shorter negative TTL.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: float = 60,
+        negative_ttl_seconds: float = 10
+    ):
+        self._cache = LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.negative_ttl_seconds = negative_ttl_seconds
+        # Bumped on every invalidation so in-flight reads can't store stale rows
+        self.generation = 0
+
+    def lookup(self, client_id: str, api_name: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        return self._cache.lookup((client_id, api_name))
+
+    def store(
+        self,
+        client_id: str,
+        api_name: str,
+        payload: Optional[Dict[str, Any]],
+        generation: Optional[int] = None
+    ):
+        """Cache a resolved payload, or None for a negative entry"""
+        if generation is not None and generation != self.generation:
+            return
+        ttl = self.negative_ttl_seconds if payload is None else None
+        self._cache.set((client_id, api_name), payload, ttl_seconds=ttl)
+
+    def invalidate_client(self, client_id: Optional[str]) -> int:
+        self.generation += 1
+        if not client_id:
+            return 0
+        return self._cache.invalidate_where(lambda key: key[0] == client_id)
+
+    def invalidate_all(self):
+        self.generation += 1
+        self._cache.clear()
+
+    def configure(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        negative_ttl_seconds: Optional[float] = None
+    ):
+        self._cache.configure(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        if negative_ttl_seconds is not None:
+            self.negative_ttl_seconds = negative_ttl_seconds
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._cache.stats()
+        stats["negative_ttl_seconds"] = self.negative_ttl_seconds
+        return stats
+
+resolution_cache = ResolutionCache()
+
+class AuthCache:
+    """
+    Verified bearer tokens and the users they belong to, for get_current_user
+    Tokens are keyed by SHA-256 digest and kept until their `exp`; user records
+    are kept for `user_ttl_seconds` and dropped with invalidate_user when they change.
+    """
+
+    def __init__(self, max_tokens: int = 10000, max_users: int = 1000, user_ttl_seconds: float = 60):
+        self._tokens = LRUCache(max_entries=max_tokens)
+        self._users = LRUCache(max_entries=max_users, ttl_seconds=user_ttl_seconds)
+        # Bumped on every user invalidation so in-flight reads can't store stale records
+        self.generation = 0
+
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def lookup_token(self, token: str) -> Optional[str]:
+        """The username of an already verified, unexpired token"""
+        return self._tokens.get(self._digest(token))
+
+    def store_token(self, token: str, username: str, expires_at: Any):
+        try:
+            ttl = float(expires_at) - time.time()
+        except (TypeError, ValueError):
+            return  # No usable exp; verify it every time
+        if ttl > 0:
+            self._tokens.set(self._digest(token), username, ttl_seconds=ttl)
+
+    def lookup_user(self, username: str) -> Tuple[bool, Any]:
+        return self._users.lookup(username)
+
+    def store_user(self, user: Any, generation: Optional[int] = None):
+        if generation is not None and generation != self.generation:
+            return
+        self._users.set(user.username, user)
+
+    def invalidate_user(self, username: Optional[str] = None):
+        """Drop one user's record, or every record when no username is given"""
+        self.generation += 1
+        if username is None:
+            self._users.clear()
+        else:
+            self._users.pop(username)
+
+    def clear(self):
+        self.generation += 1
+        self._tokens.clear()
+        self._users.clear()
+
+    def configure(
+        self,
+        max_tokens: Optional[int] = None,
+        max_users: Optional[int] = None,
+        user_ttl_seconds: Optional[float] = None
+    ):
+        self._tokens.configure(max_entries=max_tokens)
+        self._users.configure(max_entries=max_users, ttl_seconds=user_ttl_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"tokens": self._tokens.stats(), "users": self._users.stats()}
+
+auth_cache = AuthCache()
+
+class ResponseCachePolicy(NamedTuple):
+    """A parameter template's caching settings, as of one template version"""
+    template_id: str
+    version: Any  # the template's updated_at
+    config_id: Optional[str]
+    ttl_seconds: float
+    max_entries: Optional[int]
+    cache_errors: bool
+
+def _is_newer(version: Any, current: Any) -> bool:
+    if version == current or version is None:
+        return False
+    if current is None:
+        return True
+    try:
+        return version > current
+    except TypeError:
+        return True
+
+class ResponseCache:
+    """
+    Upstream responses keyed by rendered request, one LRU per parameter template
+    Each template's cache is dropped when the template, its API configuration or its
+    client changes, and starts over when a newer template version is seen.
+    """
+
+    def __init__(self, default_max_entries: int = 1000):
+        self.default_max_entries = default_max_entries
+        self._templates: Dict[str, Tuple[ResponseCachePolicy, LRUCache]] = {}
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so in-flight fetches can't store stale responses
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _cache_for(self, policy: ResponseCachePolicy) -> LRUCache:
+        with self._lock:
+            entry = self._templates.get(policy.template_id)
+            if entry is None or _is_newer(policy.version, entry[0].version):
+                cache = LRUCache(max_entries=policy.max_entries or self.default_max_entries)
+                self._templates[policy.template_id] = (policy, cache)
+                return cache
+            if entry[0].version != policy.version:
+                # A request still holding an older template version must not reset or fill the current cache
+                return LRUCache(max_entries=1)
+            return entry[1]
+
+    def lookup(self, policy: ResponseCachePolicy, key: Hashable) -> Tuple[bool, Any]:
+        found, value = self._cache_for(policy).lookup(key)
+        if found:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return found, value
+
+    def store(self, policy: ResponseCachePolicy, key: Hashable, value: Any, generation: Optional[int] = None):
+        if generation is not None and generation != self.generation:
+            return
+        self._cache_for(policy).set(key, value, ttl_seconds=policy.ttl_seconds)
+
+    def invalidate_template(self, template_id: str):
+        with self._lock:
+            self.generation += 1
+            self._templates.pop(template_id, None)
+
+    def invalidate_config(self, config_id: str):
+        with self._lock:
+            self.generation += 1
+            for template_id in [t for t, (policy, _) in self._templates.items() if policy.config_id == config_id]:
+                del self._templates[template_id]
+
+    def invalidate_all(self):
+        with self._lock:
+            self.generation += 1
+            self._templates.clear()
+
+    def configure(self, default_max_entries: Optional[int] = None):
+        if default_max_entries is not None:
+            self.default_max_entries = default_max_entries
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        with self._lock:
+            templates = list(self._templates.values())
+        return {
+            "templates": len(templates),
+            "entries": sum(len(cache) for _, cache in templates),
+            "evictions": sum(cache.evictions for _, cache in templates),
+            "default_max_entries": self.default_max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+response_cache = ResponseCache()
+
+def _on_config_change(event: Dict[str, Any]):
+    entity_type = event.get("entity_type")
+    if entity_type == "parameter_template":
+        response_cache.invalidate_template(event["entity_id"])
+    elif entity_type == "api_config":
+        response_cache.invalidate_config(event["entity_id"])
+    elif entity_type == "client":
+        response_cache.invalidate_all()
+
+config_events.add_listener(_on_config_change)
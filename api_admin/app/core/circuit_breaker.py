@@ -0,0 +1,191 @@
+# api_admin/app/core/circuit_breaker.py
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Tuple
+from .events import config_events
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+class BreakerSettings(NamedTuple):
+    failure_rate: float  # Trip when this share of the window failed; 0 disables
+    slow_call_ms: Optional[float]  # Calls slower than this count as slow; None or 0 disables
+    slow_call_rate: float  # Trip when this share of the window was slow; 0 disables
+    minimum_calls: int  # Window size; rates are only judged on a full window
+    open_seconds: float  # How long to fail fast before letting a probe through
+
+DEFAULT_BREAKER_SETTINGS = BreakerSettings(
+    failure_rate=0.5,
+    slow_call_ms=None,
+    slow_call_rate=0.5,
+    minimum_calls=10,
+    open_seconds=30
+)
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open breaker for one upstream API configuration
+    Outcomes of the last `minimum_calls` calls are kept; once the failure or slow-call
+    share reaches its threshold the breaker opens and calls fail fast. After
+    `open_seconds` one probe call is let through: success closes it, failure reopens it.
+    """
+
+    def __init__(self, config_id: str, settings: BreakerSettings):
+        self.config_id = config_id
+        self.settings = settings
+        self.state = CLOSED
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=settings.minimum_calls)
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.opened_count = 0
+        self.rejected = 0
+        self.last_failure: Optional[str] = None
+
+    def reconfigure(self, settings: BreakerSettings):
+        if settings == self.settings:
+            return
+        self.settings = settings
+        self._outcomes = deque(self._outcomes, maxlen=settings.minimum_calls)
+
+    def allow(self) -> Optional[float]:
+        """None if a call may proceed, otherwise seconds until the breaker will let one through"""
+        if self.state == CLOSED:
+            return None
+        if self.state == OPEN:
+            remaining = self._opened_at + self.settings.open_seconds - time.monotonic()
+            if remaining > 0:
+                self.rejected += 1
+                return remaining
+            self.state = HALF_OPEN
+        if self._probe_in_flight:
+            self.rejected += 1
+            return self.settings.open_seconds
+        self._probe_in_flight = True
+        return None
+
+    def release(self):
+        """Give up a call slot without an outcome (e.g. the caller was cancelled)"""
+        self._probe_in_flight = False
+
+    def record(self, failed: bool, elapsed_ms: float, reason: Optional[str] = None):
+        slow_call_ms = self.settings.slow_call_ms
+        slow = bool(slow_call_ms) and elapsed_ms > slow_call_ms
+        if failed:
+            self.last_failure = reason
+        if self.state == HALF_OPEN:
+            self._probe_in_flight = False
+            if failed or slow:
+                self._open()
+            else:
+                self._close()
+            return
+        if self.state == OPEN:
+            # A call admitted before the breaker opened; the window restarts on close anyway
+            return
+
+        self._outcomes.append((failed, slow))
+        if len(self._outcomes) < self.settings.minimum_calls:
+            return
+        failure_rate, slow_rate = self._rates()
+        settings = self.settings
+        if (settings.failure_rate and failure_rate >= settings.failure_rate) or (
+            slow_call_ms and settings.slow_call_rate and slow_rate >= settings.slow_call_rate
+        ):
+            self._open()
+
+    def reset(self):
+        self._close()
+
+    def _rates(self) -> Tuple[float, float]:
+        calls = len(self._outcomes)
+        if not calls:
+            return 0.0, 0.0
+        failures = sum(1 for failed, _ in self._outcomes if failed)
+        slow = sum(1 for _, slow in self._outcomes if slow)
+        return failures / calls, slow / calls
+
+    def _open(self):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        self.opened_count += 1
+
+    def _close(self):
+        self.state = CLOSED
+        self._outcomes.clear()
+        self._probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        failure_rate, slow_rate = self._rates()
+        retry_after = None
+        if self.state == OPEN:
+            retry_after = round(max(self._opened_at + self.settings.open_seconds - time.monotonic(), 0), 2)
+        return {
+            "config_id": self.config_id,
+            "state": self.state,
+            "calls_in_window": len(self._outcomes),
+            "failure_rate": round(failure_rate, 4),
+            "slow_call_rate": round(slow_rate, 4),
+            "retry_after_seconds": retry_after,
+            "times_opened": self.opened_count,
+            "rejected": self.rejected,
+            "last_failure": self.last_failure,
+            "settings": self.settings._asdict()
+        }
+
+class CircuitBreakerRegistry:
+    """Breakers keyed by ClientApiConfig id; thresholds missing on a config use the defaults"""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.defaults = DEFAULT_BREAKER_SETTINGS
+
+    def configure(self, **defaults):
+        """Replace the defaults; anything not given (or None) goes back to DEFAULT_BREAKER_SETTINGS"""
+        self.defaults = DEFAULT_BREAKER_SETTINGS._replace(**{k: v for k, v in defaults.items() if v is not None})
+
+    def settings_for(self, config: Dict[str, Any]) -> BreakerSettings:
+        defaults = self.defaults
+
+        def pick(field: str, default: Any) -> Any:
+            # 0 is a real per-config value (it disables that check), only a missing one falls back
+            value = config.get(field)
+            return default if value is None else value
+
+        return BreakerSettings(
+            failure_rate=pick("breaker_failure_rate", defaults.failure_rate),
+            slow_call_ms=pick("breaker_slow_call_ms", defaults.slow_call_ms),
+            slow_call_rate=pick("breaker_slow_call_rate", defaults.slow_call_rate),
+            minimum_calls=max(int(pick("breaker_minimum_calls", defaults.minimum_calls)), 1),
+            open_seconds=pick("breaker_open_seconds", defaults.open_seconds)
+        )
+
+    def get(self, config: Dict[str, Any]) -> Optional[CircuitBreaker]:
+        """The breaker for a resolved config payload, or None if it has no config_id"""
+        config_id = config.get("config_id")
+        if config_id is None:
+            return None
+        settings = self.settings_for(config)
+        breaker = self._breakers.get(config_id)
+        if breaker is None:
+            breaker = self._breakers[config_id] = CircuitBreaker(config_id, settings)
+        else:
+            breaker.reconfigure(settings)
+        return breaker
+
+    def find(self, config_id: str) -> Optional[CircuitBreaker]:
+        return self._breakers.get(config_id)
+
+    def remove(self, config_id: str):
+        self._breakers.pop(config_id, None)
+
+    def snapshots(self) -> List[Dict[str, Any]]:
+        return [breaker.snapshot() for breaker in self._breakers.values()]
+
+circuit_breakers = CircuitBreakerRegistry()
+
+def _on_config_change(event: Dict[str, Any]):
+    # A changed base URL or token deserves a fresh start
+    if event.get("entity_type") == "api_config":
+        circuit_breakers.remove(event["entity_id"])
+
+config_events.add_listener(_on_config_change)
@@ -40,6 +40,17 @@ class Settings(BaseModel):
                 self.ACCESS_TOKEN_EXPIRE_MINUTES = int(db_settings['jwt_token_expire_minutes'])
             except (ValueError, TypeError):
                 self.ACCESS_TOKEN_EXPIRE_MINUTES = 30
+        else:
+            self.ACCESS_TOKEN_EXPIRE_MINUTES = None
+    
+    def set_database_setting(self, key: str, value: Optional[str]):
+        """Apply a setting written through the settings API; None means it was deleted"""
+        db_settings = dict(self._db_settings)
+        if value is None:
+            db_settings.pop(key, None)
+        else:
+            db_settings[key] = value
+        self.load_database_settings(db_settings)
     
     def get_token_expire_minutes(self) -> int:
         if self.ACCESS_TOKEN_EXPIRE_MINUTES is None:
@@ -65,6 +76,54 @@ class Settings(BaseModel):
     def get_openai_model(self) -> str:
         return self._db_settings.get('openai_model', 'gpt-3.5-turbo')
     
+    def get_openai_base_url(self) -> str:
+        return self._db_settings.get('openai_base_url', 'https://api.openai.com/v1')
+    
+    def get_intent_confidence_threshold(self) -> float:
+        try:
+            return float(self._db_settings.get('intent_confidence_threshold', '0.5'))
+        except (ValueError, TypeError):
+            return 0.5
+    
+    def get_intent_model_timeout_seconds(self) -> float:
+        try:
+            return float(self._db_settings.get('intent_model_timeout_seconds', '10'))
+        except (ValueError, TypeError):
+            return 10.0
+    
+    def get_intent_model_backend(self) -> str:
+        return self._db_settings.get('intent_model_backend', 'openai')
+    
+    def get_intent_cache_ttl_seconds(self) -> float:
+        try:
+            return float(self._db_settings.get('intent_cache_ttl_seconds', '3600'))
+        except (ValueError, TypeError):
+            return 3600.0
+    
+    def get_intent_cache_max_entries(self) -> int:
+        try:
+            return int(self._db_settings.get('intent_cache_max_entries', '1000'))
+        except (ValueError, TypeError):
+            return 1000
+    
+    def get_intent_cache_similarity(self) -> float:
+        try:
+            return float(self._db_settings.get('intent_cache_similarity', '0.8'))
+        except (ValueError, TypeError):
+            return 0.8
+    
+    def get_intent_batch_window_ms(self) -> float:
+        try:
+            return float(self._db_settings.get('intent_batch_window_ms', '5'))
+        except (ValueError, TypeError):
+            return 5.0
+    
+    def get_intent_batch_max_size(self) -> int:
+        try:
+            return int(self._db_settings.get('intent_batch_max_size', '16'))
+        except (ValueError, TypeError):
+            return 16
+    
     def get_employee_api_base_url(self) -> str:
         return self._db_settings.get('employee_api_base_url', 'http://localhost:8001')
     
@@ -89,6 +148,165 @@ class Settings(BaseModel):
     def get_log_format(self) -> str:
         return self._db_settings.get('log_format', 'text')
     
+    def get_log_sample_rates(self) -> str:
+        return self._db_settings.get('log_sample_rates', '')
+    
+    def get_resolve_cache_ttl_seconds(self) -> float:
+        try:
+            return float(self._db_settings.get('resolve_cache_ttl_seconds', '60'))
+        except (ValueError, TypeError):
+            return 60.0
+    
+    def get_resolve_cache_negative_ttl_seconds(self) -> float:
+        try:
+            return float(self._db_settings.get('resolve_cache_negative_ttl_seconds', '10'))
+        except (ValueError, TypeError):
+            return 10.0
+    
+    def get_resolve_cache_max_entries(self) -> int:
+        try:
+            return int(self._db_settings.get('resolve_cache_max_entries', '10000'))
+        except (ValueError, TypeError):
+            return 10000
+    
+    def get_config_change_poll_seconds(self) -> float:
+        try:
+            return float(self._db_settings.get('config_change_poll_seconds', '1'))
+        except (ValueError, TypeError):
+            return 1.0
+    
+    def get_upstream_max_connections(self) -> int:
+        try:
+            return int(self._db_settings.get('upstream_max_connections', '100'))
+        except (ValueError, TypeError):
+            return 100
+    
+    def get_upstream_max_keepalive_connections(self) -> int:
+        try:
+            return int(self._db_settings.get('upstream_max_keepalive_connections', '20'))
+        except (ValueError, TypeError):
+            return 20
+    
+    def get_upstream_keepalive_expiry_seconds(self) -> float:
+        try:
+            return float(self._db_settings.get('upstream_keepalive_expiry_seconds', '30'))
+        except (ValueError, TypeError):
+            return 30.0
+    
+    def get_upstream_retry_backoff_seconds(self) -> float:
+        try:
+            return float(self._db_settings.get('upstream_retry_backoff_seconds', '0.1'))
+        except (ValueError, TypeError):
+            return 0.1
+    
+    def get_upstream_retry_backoff_max_seconds(self) -> float:
+        try:
+            return float(self._db_settings.get('upstream_retry_backoff_max_seconds', '2'))
+        except (ValueError, TypeError):
+            return 2.0
+    
+    def get_response_cache_max_entries(self) -> int:
+        try:
+            return int(self._db_settings.get('response_cache_max_entries', '1000'))
+        except (ValueError, TypeError):
+            return 1000
+    
+    def get_auth_token_cache_max_entries(self) -> int:
+        try:
+            return int(self._db_settings.get('auth_token_cache_max_entries', '10000'))
+        except (ValueError, TypeError):
+            return 10000
+    
+    def get_auth_user_cache_ttl_seconds(self) -> float:
+        try:
+            return float(self._db_settings.get('auth_user_cache_ttl_seconds', '60'))
+        except (ValueError, TypeError):
+            return 60.0
+    
+    def get_password_hash_max_concurrency(self) -> int:
+        try:
+            return int(self._db_settings.get('password_hash_max_concurrency', '2'))
+        except (ValueError, TypeError):
+            return 2
+    
+    def get_password_hash_queue_timeout_seconds(self) -> float:
+        try:
+            return float(self._db_settings.get('password_hash_queue_timeout_seconds', '5'))
+        except (ValueError, TypeError):
+            return 5.0
+    
+    def get_login_rate_limit_per_ip(self) -> int:
+        try:
+            return int(self._db_settings.get('login_rate_limit_per_ip', '20'))
+        except (ValueError, TypeError):
+            return 20
+    
+    def get_login_rate_limit_per_username(self) -> int:
+        try:
+            return int(self._db_settings.get('login_rate_limit_per_username', '10'))
+        except (ValueError, TypeError):
+            return 10
+    
+    def get_breaker_failure_rate(self) -> float:
+        try:
+            return float(self._db_settings.get('breaker_failure_rate', '0.5'))
+        except (ValueError, TypeError):
+            return 0.5
+    
+    def get_breaker_slow_call_ms(self) -> Optional[float]:
+        try:
+            return float(self._db_settings.get('breaker_slow_call_ms', '0')) or None
+        except (ValueError, TypeError):
+            return None
+    
+    def get_breaker_slow_call_rate(self) -> float:
+        try:
+            return float(self._db_settings.get('breaker_slow_call_rate', '0.5'))
+        except (ValueError, TypeError):
+            return 0.5
+    
+    def get_breaker_minimum_calls(self) -> int:
+        try:
+            return int(self._db_settings.get('breaker_minimum_calls', '10'))
+        except (ValueError, TypeError):
+            return 10
+    
+    def get_breaker_open_seconds(self) -> float:
+        try:
+            return float(self._db_settings.get('breaker_open_seconds', '30'))
+        except (ValueError, TypeError):
+            return 30.0
+    
+    def get_bulkhead_max_concurrent_calls(self) -> int:
+        try:
+            return int(self._db_settings.get('bulkhead_max_concurrent_calls', '20'))
+        except (ValueError, TypeError):
+            return 20
+    
+    def get_bulkhead_max_queued_calls(self) -> int:
+        try:
+            return int(self._db_settings.get('bulkhead_max_queued_calls', '50'))
+        except (ValueError, TypeError):
+            return 50
+    
+    def get_bulkhead_queue_timeout_seconds(self) -> float:
+        try:
+            return float(self._db_settings.get('bulkhead_queue_timeout_seconds', '5'))
+        except (ValueError, TypeError):
+            return 5.0
+    
+    def get_api_rate_limit(self) -> int:
+        try:
+            return int(self._db_settings.get('api_rate_limit', '100'))
+        except (ValueError, TypeError):
+            return 100
+    
+    def get_rate_limit_backend(self) -> str:
+        return self._db_settings.get('rate_limit_backend', 'memory')
+    
+    def get_rate_limit_path(self) -> str:
+        return self._db_settings.get('rate_limit_path', os.path.join(self.DATABASE_DIR, 'rate_limits.sqlite'))
+    
     def get_environment(self) -> str:
         return self._db_settings.get('environment', 'development')
     
@@ -0,0 +1,166 @@
+# api_admin/app/core/entity_extractor.py
+import re
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+import logging
+from .text import words
+
+logger = logging.getLogger(__name__)
+
+# Patterns for sources an admin hasn't given one, by the last word of the source name
+_ID_PATTERN = r"(?=[\w-]*\d)[A-Za-z0-9][\w-]*"
+DEFAULT_PATTERNS = {
+    "id": _ID_PATTERN,
+    "number": _ID_PATTERN,
+    "code": _ID_PATTERN,
+    "email": r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+",
+    "date": r"\d{4}-\d{2}-\d{2}",
+}
+# Words in a source name that say what kind of value it is, not what it belongs to
+_KIND_WORDS = frozenset(DEFAULT_PATTERNS) | {"no", "num", "key"}
+_LABEL = r"(?:(?:id|number|no|num|code|#)\b[\s:#.-]*)?"
+
+def _is_date(value: str) -> bool:
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+VALIDATORS: Dict[str, Callable[[str], bool]] = {
+    "int": lambda value: value.isdigit(),
+    "alnum": lambda value: value.replace("-", "").isalnum(),
+    "uuid": lambda value: re.fullmatch(r"[0-9a-fA-F]{8}-(?:[0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}", value) is not None,
+    "email": lambda value: re.fullmatch(DEFAULT_PATTERNS["email"], value) is not None,
+    "date": _is_date,
+}
+
+# Escapes and character classes are skipped so "\\1" or "[\1]" aren't taken for references
+_GROUP_REFERENCE = re.compile(r"(?P<reference>\\[1-9]|\(\?\()|\\.|\[\^?\]?(?:\\.|[^\]\\])*\]")
+
+def pattern_problem(pattern: str) -> Optional[str]:
+    """
+    Why an admin pattern can't be used, or None
+    Patterns become alternatives of one combined regex, where group numbers shift
+    and group names clash, so named groups and group references are refused.
+    """
+    try:
+        compiled = re.compile(pattern)
+    except re.error as e:
+        return f"invalid pattern: {e}"
+    if compiled.groupindex:
+        return "named groups aren't supported"
+    if any(match.group("reference") for match in _GROUP_REFERENCE.finditer(pattern)):
+        return "backreferences and conditional groups aren't supported"
+    return None
+
+def check_entity_patterns(parameter_template: Optional[Dict[str, Any]]):
+    """Raise ValueError for the first parameter whose `pattern` the extractor would ignore"""
+    for section in ("path_params", "query_params"):
+        for name, config in ((parameter_template or {}).get(section) or {}).items():
+            if not isinstance(config, dict) or not config.get("pattern"):
+                continue
+            problem = pattern_problem(config["pattern"])
+            if problem is not None:
+                raise ValueError(f"Pattern for source '{config.get('source', name)}': {problem}")
+
+class EntityRule(NamedTuple):
+    source: str
+    pattern: Optional[str]  # Admin-supplied regex for the value; None uses DEFAULT_PATTERNS
+    validator: Optional[str]  # Name in VALIDATORS
+    context: Tuple[str, ...]  # Words that introduce the value, e.g. ("employee",)
+
+def collect_entity_rules(parameter_templates: Iterable[Dict[str, Any]]) -> List[EntityRule]:
+    """
+    One rule per distinct source across a client's templates
+    A parameter may carry `pattern`, `validator` and `context` next to its `source`;
+    the first template that sets one of them wins.
+    """
+    rules: Dict[str, Dict[str, Any]] = {}
+    for parameter_template in parameter_templates:
+        for section in ("path_params", "query_params"):
+            for name, config in ((parameter_template or {}).get(section) or {}).items():
+                config = config if isinstance(config, dict) else {}
+                source = config.get("source", name)
+                rule = rules.setdefault(source, {"pattern": None, "validator": None, "context": None})
+                for key in rule:
+                    if rule[key] is None and config.get(key):
+                        rule[key] = config[key]
+
+    collected = []
+    for source, rule in rules.items():
+        context = rule["context"]
+        if isinstance(context, str):
+            context = [context]
+        if not context:
+            context = [word for word in words(source) if word not in _KIND_WORDS]
+        collected.append(EntityRule(source, rule["pattern"], rule["validator"], tuple(context)))
+    return collected
+
+def _default_pattern(source: str) -> Optional[str]:
+    source_words = words(source)
+    return DEFAULT_PATTERNS.get(source_words[-1]) if source_words else None
+
+class EntityExtractor:
+    """
+    Pulls the values for a client's parameter sources out of free text in one pass
+    Every rule becomes alternatives of a single regex: "<context word> [id|no|#] <value>"
+    first, then the bare value for rules that can be told apart without context
+    (an admin pattern, or the only rule using its default pattern). Each source
+    keeps its first valid value, preferring one introduced by a context word.
+    """
+
+    def __init__(self, rules: Iterable[EntityRule]):
+        self.rules: List[EntityRule] = []
+        anchored, bare = [], []
+        usable = []
+        for rule in rules:
+            pattern = rule.pattern or _default_pattern(rule.source)
+            if pattern is None:
+                continue
+            problem = pattern_problem(pattern)
+            if problem is not None:
+                logger.warning(f"Ignoring pattern for source '{rule.source}': {problem}")
+                continue
+            if rule.validator and rule.validator not in VALIDATORS:
+                logger.warning(f"Ignoring unknown validator '{rule.validator}' for source '{rule.source}'")
+                rule = rule._replace(validator=None)
+            usable.append((rule, pattern))
+
+        default_uses: Dict[str, int] = {}
+        for rule, pattern in usable:
+            if rule.pattern is None:
+                default_uses[pattern] = default_uses.get(pattern, 0) + 1
+
+        # group name -> (rule position, anchored by a context word)
+        self._groups: Dict[str, Tuple[int, bool]] = {}
+        for position, (rule, pattern) in enumerate(usable):
+            self.rules.append(rule)
+            if rule.context:
+                context = "|".join(re.escape(word) for word in rule.context)
+                group = f"a{position}"
+                anchored.append(rf"\b(?:{context})s?\b[\s:#-]*{_LABEL}(?P<{group}>{pattern})")
+                self._groups[group] = (position, True)
+            if rule.pattern is not None or default_uses[pattern] == 1:
+                group = f"b{position}"
+                # Admin patterns are specific, so they get first go at a bare value
+                bare.append((rule.pattern is None, rf"(?<![\w@.-])(?P<{group}>{pattern})"))
+                self._groups[group] = (position, False)
+
+        alternatives = anchored + [alternative for _, alternative in sorted(bare, key=lambda item: item[0])]
+        self._regex = re.compile("|".join(alternatives), re.IGNORECASE) if alternatives else None
+
+    def extract(self, text: str) -> Dict[str, str]:
+        if self._regex is None or not text:
+            return {}
+        found: Dict[str, Tuple[str, bool]] = {}
+        for match in self._regex.finditer(text):
+            position, anchored = self._groups[match.lastgroup]
+            rule = self.rules[position]
+            value = match.group(match.lastgroup)
+            if rule.validator and not VALIDATORS[rule.validator](value):
+                continue
+            previous = found.get(rule.source)
+            if previous is None or (anchored and not previous[1]):
+                found[rule.source] = (value, anchored)
+        return {source: value for source, (value, _) in found.items()}
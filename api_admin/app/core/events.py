@@ -0,0 +1,84 @@
+# api_admin/app/core/events.py
+import asyncio
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Subscription:
+    """One subscriber's bounded event queue"""
+
+    def __init__(self, max_queue_size: int):
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max_queue_size)
+        # Set when events were dropped; the subscriber must resync from the change log
+        self.overflowed = False
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Next event, a resync marker after an overflow, or None on timeout"""
+        if self.overflowed:
+            self.overflowed = False
+            return {"type": "resync"}
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+class ConfigEventHub:
+    """In-process fan-out of committed config changes to SSE and long-poll subscribers"""
+
+    def __init__(self, max_queue_size: int = 1000, dedupe_window: int = 4096):
+        self.max_queue_size = max_queue_size
+        self._subscribers: Set[Subscription] = set()
+        # In-process caches derived from config rows register here to drop stale entries
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        # Versions published recently, so the log tailer doesn't repeat local writes
+        self._recent: "OrderedDict[int, None]" = OrderedDict()
+        self._dedupe_window = dedupe_window
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self.max_queue_size)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscribers.discard(subscription)
+
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        """Call `listener(event)` synchronously for every published event"""
+        self._listeners.append(listener)
+
+    def publish(self, event: Dict[str, Any]) -> bool:
+        """Fan an event out without blocking; returns False if it was already published"""
+        version = event.get("version")
+        if version is not None:
+            if version in self._recent:
+                return False
+            self._recent[version] = None
+            while len(self._recent) > self._dedupe_window:
+                self._recent.popitem(last=False)
+
+        self.published += 1
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logger.warning(f"Config event listener {listener!r} failed: {e}")
+        for subscription in self._subscribers:
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                subscription.overflowed = True
+                self.dropped += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "dropped": self.dropped
+        }
+
+config_events = ConfigEventHub()
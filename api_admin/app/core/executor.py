@@ -0,0 +1,329 @@
+# api_admin/app/core/executor.py
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, NamedTuple, Optional
+import httpx
+import logging
+from .json_stream import StreamingMapping
+from .singleflight import SingleFlight
+from .cache import ResponseCachePolicy, response_cache
+from .circuit_breaker import circuit_breakers
+from .bulkhead import bulkheads, BulkheadFullError
+
+logger = logging.getLogger(__name__)
+
+# Safe to repeat: the upstream ends in the same state however many times they arrive
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# Read-only, so concurrent identical calls may share one upstream response
+COALESCIBLE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+class UpstreamError(Exception):
+    """Raised when an upstream call fails on every allowed attempt"""
+
+    def __init__(self, message: str, attempts: int, timed_out: bool = False):
+        super().__init__(message)
+        self.attempts = attempts
+        self.timed_out = timed_out
+
+class CircuitOpenError(UpstreamError):
+    """Raised without calling the upstream while its circuit breaker is open"""
+
+    def __init__(self, config_id: str, retry_after: float):
+        super().__init__(f"Circuit breaker open for API configuration {config_id}", 0)
+        self.config_id = config_id
+        self.retry_after = retry_after
+
+class UpstreamResponse(NamedTuple):
+    status_code: int
+    headers: Dict[str, str]
+    # Parsed JSON (or text) body; None when the body was streamed through a mapping
+    body: Any
+    # response_mapping fields, a list of them for NDJSON; None without a mapping
+    mapped: Any
+    attempts: int
+    elapsed_ms: float
+    # True when served from the template's response cache
+    cached: bool = False
+
+def _is_ndjson(content_type: str) -> bool:
+    return "ndjson" in content_type or "jsonlines" in content_type
+
+class UpstreamExecutor:
+    """
+    Runs rendered API calls (see build_api_call) against upstream services
+    Each api_base_url gets its own keep-alive pool; timeout_seconds bounds every
+    attempt, and idempotent calls are retried with jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry_seconds: float = 30.0,
+        backoff_base_seconds: float = 0.1,
+        backoff_max_seconds: float = 2.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self._pools: Dict[str, httpx.AsyncClient] = {}
+        # Every pool sends through this instead of the network when set, e.g. an httpx.MockTransport in tests
+        self.transport = transport
+        self._flights = SingleFlight()
+        self.configure(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry_seconds=keepalive_expiry_seconds,
+            backoff_base_seconds=backoff_base_seconds,
+            backoff_max_seconds=backoff_max_seconds
+        )
+        self._stats = {
+            "requests": 0,
+            "attempts": 0,
+            "retries": 0,
+            "timeouts": 0,
+            "failures": 0,
+            "rejected_open_circuit": 0,
+            "rejected_bulkhead": 0
+        }
+
+    def configure(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry_seconds: Optional[float] = None,
+        backoff_base_seconds: Optional[float] = None,
+        backoff_max_seconds: Optional[float] = None
+    ):
+        """Update limits; pool limits apply to pools opened afterwards"""
+        if max_connections is not None:
+            self.max_connections = max_connections
+        if max_keepalive_connections is not None:
+            self.max_keepalive_connections = max_keepalive_connections
+        if keepalive_expiry_seconds is not None:
+            self.keepalive_expiry_seconds = keepalive_expiry_seconds
+        if backoff_base_seconds is not None:
+            self.backoff_base_seconds = backoff_base_seconds
+        if backoff_max_seconds is not None:
+            self.backoff_max_seconds = backoff_max_seconds
+
+    def _pool(self, base_url: str) -> httpx.AsyncClient:
+        key = base_url.rstrip("/")
+        pool = self._pools.get(key)
+        if pool is None or pool.is_closed:
+            pool = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry_seconds
+                ),
+                transport=self.transport
+            )
+            self._pools[key] = pool
+        return pool
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """Full-jitter exponential delay before retry number `attempt`"""
+        delay = random.uniform(0, min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** (attempt - 1)))
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(float(retry_after), self.backoff_max_seconds))
+        return delay
+
+    async def execute(
+        self,
+        call: Dict[str, Any],
+        config: Dict[str, Any],
+        mapping: Optional[StreamingMapping] = None,
+        coalesce: bool = True,
+        cache_policy: Optional[ResponseCachePolicy] = None
+    ) -> UpstreamResponse:
+        """
+        Send a rendered call using a resolved config's base URL, token, timeout and retries
+        With `mapping`, JSON/NDJSON bodies are streamed through it instead of parsed whole.
+        Non-2xx responses are returned, not raised; UpstreamError means no response was usable.
+        Concurrent identical read-only calls for the same client share one upstream request
+        and the same response object, which callers must treat as read-only. With a
+        template's `cache_policy`, read-only responses are also reused for its TTL.
+        """
+        method = call["method"].upper()
+        if method not in COALESCIBLE_METHODS or call.get("json") is not None:
+            return await self._execute(call, config, mapping)
+
+        params = call.get("params") or {}
+        key = (
+            method,
+            call["url"],
+            tuple(sorted((name, str(value)) for name, value in params.items())),
+            config.get("config_id"),
+            config.get("api_token")
+        )
+        if cache_policy is not None:
+            found, cached = response_cache.lookup(cache_policy, key)
+            if found:
+                if isinstance(cached, UpstreamError):
+                    raise UpstreamError(str(cached), cached.attempts, cached.timed_out)
+                return cached._replace(cached=True)
+            generation = response_cache.generation
+
+        try:
+            if coalesce:
+                response = await self._flights.do(key + (id(mapping),), lambda: self._execute(call, config, mapping))
+            else:
+                response = await self._execute(call, config, mapping)
+        except UpstreamError as e:
+            if cache_policy is not None and cache_policy.cache_errors and not isinstance(e, CircuitOpenError):
+                response_cache.store(cache_policy, key, e, generation)
+            raise
+
+        if cache_policy is not None and (cache_policy.cache_errors or 200 <= response.status_code < 300):
+            response_cache.store(cache_policy, key, response, generation)
+        return response
+
+    async def _execute(
+        self,
+        call: Dict[str, Any],
+        config: Dict[str, Any],
+        mapping: Optional[StreamingMapping]
+    ) -> UpstreamResponse:
+        """
+        _send behind the config's circuit breaker and the client's bulkheads
+        5xx, timeouts and transport errors count as breaker failures; time spent
+        queueing for a bulkhead slot does not count towards slow calls.
+        """
+        breaker = circuit_breakers.get(config)
+        if breaker is None:
+            async with self._slot(config):
+                return await self._send(call, config, mapping)
+
+        retry_after = breaker.allow()
+        if retry_after is not None:
+            self._stats["rejected_open_circuit"] += 1
+            raise CircuitOpenError(breaker.config_id, retry_after)
+
+        try:
+            async with self._slot(config):
+                started = time.perf_counter()
+                response = await self._send(call, config, mapping)
+        except UpstreamError as e:
+            breaker.record(True, (time.perf_counter() - started) * 1000, str(e))
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        failed = response.status_code >= 500
+        breaker.record(failed, response.elapsed_ms, f"HTTP {response.status_code}" if failed else None)
+        return response
+
+    @asynccontextmanager
+    async def _slot(self, config: Dict[str, Any]):
+        try:
+            async with bulkheads.slot(config):
+                yield
+        except BulkheadFullError:
+            self._stats["rejected_bulkhead"] += 1
+            raise
+
+    async def _send(
+        self,
+        call: Dict[str, Any],
+        config: Dict[str, Any],
+        mapping: Optional[StreamingMapping]
+    ) -> UpstreamResponse:
+        method = call["method"].upper()
+        timeout = float(config.get("timeout_seconds") or 30)
+        max_attempts = 1 + max(int(config.get("max_retries") or 0), 0)
+        idempotent = method in IDEMPOTENT_METHODS
+        pool = self._pool(config["api_base_url"])
+
+        headers = dict(call.get("headers") or {})
+        if config.get("api_token") and not any(name.lower() == "authorization" for name in headers):
+            headers["Authorization"] = f"Bearer {config['api_token']}"
+        request_kwargs = {"params": call.get("params") or None, "headers": headers}
+        if call.get("json") is not None:
+            request_kwargs["json"] = call["json"]
+
+        self._stats["requests"] += 1
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            self._stats["attempts"] += 1
+            try:
+                # One deadline covers connecting, the response and reading the body
+                response, body, mapped = await asyncio.wait_for(
+                    self._attempt(pool, method, call["url"], request_kwargs, timeout, mapping),
+                    timeout
+                )
+            except (asyncio.TimeoutError, httpx.TimeoutException, httpx.TransportError) as e:
+                timed_out = isinstance(e, (asyncio.TimeoutError, httpx.TimeoutException))
+                if timed_out:
+                    self._stats["timeouts"] += 1
+                # A failed connect never reached the upstream, so any method may retry it
+                retryable = idempotent or isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+                if retryable and attempt < max_attempts:
+                    self._stats["retries"] += 1
+                    await asyncio.sleep(self._backoff(attempt))
+                    continue
+                self._stats["failures"] += 1
+                reason = f"timed out after {timeout}s" if timed_out else (str(e) or e.__class__.__name__)
+                logger.warning(f"Upstream {method} {call['url']} failed after {attempt} attempt(s): {reason}")
+                raise UpstreamError(f"Upstream request {reason}", attempt, timed_out) from e
+
+            if response.status_code in RETRY_STATUS_CODES and idempotent and attempt < max_attempts:
+                self._stats["retries"] += 1
+                await asyncio.sleep(self._backoff(attempt, response))
+                continue
+
+            return UpstreamResponse(
+                status_code=response.status_code,
+                headers=dict(response.headers),
+                body=body,
+                mapped=mapped,
+                attempts=attempt,
+                elapsed_ms=round((time.perf_counter() - started) * 1000, 2)
+            )
+
+    async def _attempt(
+        self,
+        pool: httpx.AsyncClient,
+        method: str,
+        url: str,
+        request_kwargs: Dict[str, Any],
+        timeout: float,
+        mapping: Optional[StreamingMapping]
+    ):
+        async with pool.stream(method, url, timeout=timeout, **request_kwargs) as response:
+            content_type = response.headers.get("content-type", "")
+            if mapping is not None and response.is_success and "json" in content_type:
+                if _is_ndjson(content_type):
+                    return response, None, [record async for record in mapping.aiter_ndjson(response.aiter_bytes())]
+                # Leaving the block unread closes the connection instead of draining it
+                return response, None, await mapping.aextract(response.aiter_bytes())
+
+            await response.aread()
+            if not response.content:
+                return response, None, None
+            try:
+                body = response.json()
+            except ValueError:
+                body = response.text
+            return response, body, None
+
+    async def aclose(self):
+        """Close every pool; later calls open new ones"""
+        pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            await pool.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "coalescing": self._flights.stats(),
+            "pools": len(self._pools),
+            "max_connections": self.max_connections,
+            "max_keepalive_connections": self.max_keepalive_connections
+        }
+
+upstream_executor = UpstreamExecutor()
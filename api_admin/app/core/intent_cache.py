@@ -0,0 +1,151 @@
+# api_admin/app/core/intent_cache.py
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Optional, Set, Tuple
+from .events import config_events
+from .text import normalize_query
+
+class _Namespace:
+    """One client's cached decisions, LRU ordered, with a term index for near-duplicate search"""
+
+    def __init__(self):
+        self.entries: "OrderedDict[FrozenSet[str], Tuple[Any, float]]" = OrderedDict()
+        self.postings: Dict[str, Set[FrozenSet[str]]] = {}
+
+    def add(self, key: FrozenSet[str], value: Any, expires_at: float):
+        if key not in self.entries:
+            for term in key:
+                self.postings.setdefault(term, set()).add(key)
+        self.entries[key] = (value, expires_at)
+        self.entries.move_to_end(key)
+
+    def remove(self, key: FrozenSet[str]):
+        if self.entries.pop(key, None) is None:
+            return
+        for term in key:
+            keys = self.postings.get(term)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.postings[term]
+
+    def pop_oldest(self):
+        self.remove(next(iter(self.entries)))
+
+class SemanticIntentCache:
+    """
+    Intent decisions keyed by normalized question, one namespace per client
+    Questions are reduced to their masked, stopword-free terms (see normalize_query);
+    a lookup first tries that exact term set, then the most similar cached set whose
+    Jaccard similarity reaches `similarity`. Entries expire after `ttl_seconds` and
+    each namespace keeps at most `max_entries`, least recently used going first.
+    """
+
+    def __init__(self, ttl_seconds: float = 3600.0, max_entries: int = 1000, similarity: float = 0.8):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.similarity = similarity
+        self._namespaces: Dict[str, _Namespace] = {}
+        self.generation = 0
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def configure(
+        self,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        similarity: Optional[float] = None
+    ):
+        if ttl_seconds is not None:
+            self.ttl_seconds = ttl_seconds
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if similarity is not None:
+            self.similarity = similarity
+
+    @staticmethod
+    def key(query: str) -> FrozenSet[str]:
+        return frozenset(normalize_query(query))
+
+    def lookup(self, client_id: str, query: str) -> Tuple[bool, Any]:
+        key = self.key(query)
+        namespace = self._namespaces.get(client_id)
+        if namespace is None or not key or self.ttl_seconds <= 0:
+            self.misses += 1
+            return False, None
+
+        now = time.monotonic()
+        entry = namespace.entries.get(key)
+        if entry is not None:
+            if entry[1] > now:
+                namespace.entries.move_to_end(key)
+                self.exact_hits += 1
+                return True, entry[0]
+            namespace.remove(key)
+
+        best, best_similarity = None, 0.0
+        candidates = set()
+        for term in key:
+            candidates.update(namespace.postings.get(term, ()))
+        for candidate in candidates:
+            similarity = len(key & candidate) / len(key | candidate)
+            if similarity >= self.similarity and similarity > best_similarity:
+                best, best_similarity = candidate, similarity
+        if best is not None:
+            value, expires_at = namespace.entries[best]
+            if expires_at > now:
+                namespace.entries.move_to_end(best)
+                self.similar_hits += 1
+                return True, value
+            namespace.remove(best)
+
+        self.misses += 1
+        return False, None
+
+    def store(self, client_id: str, query: str, value: Any, generation: Optional[int] = None):
+        """Cache a decision; skipped if the client's templates changed since `generation`"""
+        if generation is not None and generation != self.generation:
+            return
+        key = self.key(query)
+        if not key or self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        namespace = self._namespaces.setdefault(client_id, _Namespace())
+        namespace.add(key, value, time.monotonic() + self.ttl_seconds)
+        while len(namespace.entries) > self.max_entries:
+            namespace.pop_oldest()
+            self.evictions += 1
+
+    def invalidate_client(self, client_id: str):
+        self.generation += 1
+        self._namespaces.pop(client_id, None)
+
+    def invalidate_all(self):
+        self.generation += 1
+        self._namespaces.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.exact_hits + self.similar_hits
+        lookups = hits + self.misses
+        return {
+            "clients": len(self._namespaces),
+            "entries": sum(len(namespace.entries) for namespace in self._namespaces.values()),
+            "exact_hits": self.exact_hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0
+        }
+
+intent_cache = SemanticIntentCache()
+
+def _on_config_change(event: Dict[str, Any]):
+    # Cached decisions name templates; any change to the client's templates can make them stale
+    client_id = event.get("client_id")
+    if client_id:
+        intent_cache.invalidate_client(client_id)
+    else:
+        intent_cache.invalidate_all()
+
+config_events.add_listener(_on_config_change)
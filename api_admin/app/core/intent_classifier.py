@@ -0,0 +1,148 @@
+# api_admin/app/core/intent_classifier.py
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+import logging
+from .intent_router import IntentDocument, IntentIndex, IntentMatch, IntentScores, intent_router
+from .intent_cache import intent_cache
+from .llm import IntentModelError, intent_model, local_intent_model
+from .micro_batcher import MicroBatcher
+
+logger = logging.getLogger(__name__)
+
+# Templates shown to the model; the local ranking picks which ones
+MAX_MODEL_CANDIDATES = 20
+
+SOURCE_LOCAL = "local"
+SOURCE_MODEL = "llm"
+SOURCE_NONE = "none"
+
+MODEL_BACKENDS = {"openai": intent_model, "local": local_intent_model}
+
+class IntentDecision(NamedTuple):
+    document: Optional[IntentDocument]
+    confidence: float
+    source: str  # SOURCE_LOCAL, SOURCE_MODEL or SOURCE_NONE
+    matches: List[IntentMatch]  # Local ranking, best first
+    cached: bool = False  # A model decision reused from the semantic cache
+
+class IntentClassifier:
+    """
+    Picks the parameter template a query is about
+    The local BM25 ranking is used as is when its confidence reaches the router's
+    threshold. Below it the model chooses among the best local candidates; its
+    decisions are kept in the semantic cache so rephrasings don't call it again.
+    Single queries that need the model wait a few milliseconds in a micro-batch so
+    concurrent questions for the same client share one model call.
+    """
+
+    def __init__(self):
+        self.model = intent_model
+        self._stats = {SOURCE_LOCAL: 0, SOURCE_MODEL: 0, SOURCE_NONE: 0, "cached": 0, "model_errors": 0}
+        self.batcher = MicroBatcher(self._classify_batch)
+
+    def configure(
+        self,
+        model_backend: Optional[str] = None,
+        batch_window_ms: Optional[float] = None,
+        batch_max_size: Optional[int] = None
+    ):
+        if model_backend is not None:
+            if model_backend not in MODEL_BACKENDS:
+                raise ValueError(f"Unknown intent model backend: {model_backend}")
+            self.model = MODEL_BACKENDS[model_backend]
+        self.batcher.configure(
+            window_seconds=batch_window_ms / 1000 if batch_window_ms is not None else None,
+            max_batch_size=batch_max_size
+        )
+
+    def _decided(self, decision: IntentDecision) -> IntentDecision:
+        self._stats[decision.source] += 1
+        if decision.cached:
+            self._stats["cached"] += 1
+        return decision
+
+    @staticmethod
+    def _confident(scores: IntentScores) -> bool:
+        return bool(scores.matches) and scores.confidence >= intent_router.confidence_threshold
+
+    def _local(self, scores: IntentScores) -> IntentDecision:
+        # No usable model answer: a weak local answer beats none, the confidence tells callers how weak
+        if scores.matches:
+            return self._decided(IntentDecision(scores.matches[0].document, scores.confidence, SOURCE_LOCAL, scores.matches))
+        return self._decided(IntentDecision(None, 0.0, SOURCE_NONE, scores.matches))
+
+    def _cached(self, client_id: str, query: str, scores: IntentScores) -> Optional[IntentDecision]:
+        found, cached = intent_cache.lookup(client_id, query)
+        if not found:
+            return None
+        document, confidence, source = cached
+        return self._decided(IntentDecision(document, confidence, source, scores.matches, cached=True))
+
+    async def classify(self, index: IntentIndex, query: str, client_id: Optional[str] = None) -> IntentDecision:
+        scores = index.score(query)
+        if self._confident(scores) or not (self.model.enabled and len(index)):
+            return self._local(scores)
+        # A cached answer is already here, so it doesn't wait out a batch window
+        if client_id is not None:
+            decision = self._cached(client_id, query, scores)
+            if decision is not None:
+                return decision
+        return await self.batcher.submit((client_id, index), query)
+
+    async def _classify_batch(self, key: Tuple[Optional[str], IntentIndex], queries: List[str]) -> List[IntentDecision]:
+        client_id, index = key
+        # classify() looked each of these up just before queueing it
+        return await self.classify_many(index, queries, client_id, check_cache=False)
+
+    async def classify_many(
+        self,
+        index: IntentIndex,
+        queries: List[str],
+        client_id: Optional[str] = None,
+        check_cache: bool = True
+    ) -> List[IntentDecision]:
+        """classify() for several queries of one client, with at most one model call"""
+        all_scores = [index.score(query) for query in queries]
+        decisions: List[Optional[IntentDecision]] = [None] * len(queries)
+        asking: Dict[Any, List[int]] = {}  # Questions for the model, repeats asked once
+        use_model = self.model.enabled and len(index) > 0
+        for position, (query, scores) in enumerate(zip(queries, all_scores)):
+            if self._confident(scores) or not use_model:
+                decisions[position] = self._local(scores)
+                continue
+            if client_id is not None and check_cache:
+                decisions[position] = self._cached(client_id, query, scores)
+                if decisions[position] is not None:
+                    continue
+            asking.setdefault(intent_cache.key(query) or query, []).append(position)
+
+        if asking:
+            generation = intent_cache.generation
+            firsts = [positions[0] for positions in asking.values()]
+            candidates = []
+            for position in firsts:
+                matches = all_scores[position].matches[:MAX_MODEL_CANDIDATES]
+                candidates.append([match.document for match in matches] or index.documents[:MAX_MODEL_CANDIDATES])
+            try:
+                answers = await self.model.classify_batch([queries[position] for position in firsts], candidates)
+            except IntentModelError as e:
+                self._stats["model_errors"] += 1
+                logger.warning(f"Falling back to the local intent ranking: {e}")
+            else:
+                for positions, (document, confidence) in zip(asking.values(), answers):
+                    source = SOURCE_MODEL if document is not None else SOURCE_NONE
+                    if client_id is not None:
+                        intent_cache.store(client_id, queries[positions[0]], (document, confidence, source), generation)
+                    for position in positions:
+                        decisions[position] = self._decided(
+                            IntentDecision(document, confidence, source, all_scores[position].matches)
+                        )
+
+        return [
+            decision if decision is not None else self._local(scores)
+            for decision, scores in zip(decisions, all_scores)
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "model": self.model.stats(), "batching": self.batcher.stats()}
+
+intent_classifier = IntentClassifier()
@@ -0,0 +1,188 @@
+# api_admin/app/core/intent_router.py
+import math
+from collections import Counter
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from .events import config_events
+from .text import terms, template_sources
+from .entity_extractor import EntityExtractor
+
+# Term weights per template field; a template's name says the most about it
+FIELD_WEIGHTS = (("template_name", 3.0), ("sources", 2.0), ("api_name", 1.0), ("description", 1.0))
+
+class IntentDocument(NamedTuple):
+    template_id: str
+    template_name: str
+    api_name: str
+    description: str
+    sources: Tuple[str, ...] = ()  # Input keys the template reads
+    required_sources: Tuple[str, ...] = ()  # Of those, the ones without a default
+
+class IntentMatch(NamedTuple):
+    document: IntentDocument
+    score: float
+
+class IntentScores(NamedTuple):
+    matches: List[IntentMatch]  # Best first, positive scores only
+    confidence: float  # 0-1; how safely the top match can be used without the LLM
+
+def template_document(template: Any, api_name: str) -> IntentDocument:
+    parameter_template = template.parameter_template or {}
+    required = [
+        config.get("source", name)
+        for section in ("path_params", "query_params")
+        for name, config in (parameter_template.get(section) or {}).items()
+        if isinstance(config, dict) and "default" not in config
+        and (section == "path_params" or config.get("required", False))
+    ]
+    return IntentDocument(
+        template.id,
+        template.template_name,
+        api_name,
+        template.description or "",
+        tuple(dict.fromkeys(template_sources(parameter_template))),
+        tuple(dict.fromkeys(required))
+    )
+
+def template_fields(template: Any, api_name: str) -> Dict[str, str]:
+    """Searchable text of a ClientApiParameter, per FIELD_WEIGHTS field"""
+    return {
+        "template_name": template.template_name or "",
+        "sources": " ".join(template_sources(template.parameter_template)),
+        "api_name": api_name or "",
+        "description": template.description or ""
+    }
+
+class IntentIndex:
+    """
+    BM25 index over one client's parameter templates
+    Fields are folded into one weighted bag of terms per template; templates are
+    few per client, so scoring walks the postings of the query terms only.
+    """
+
+    def __init__(self, documents: Iterable[Tuple[IntentDocument, Dict[str, str]]], k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.documents: List[IntentDocument] = []
+        self._lengths: List[float] = []
+        self._postings: Dict[str, List[Tuple[int, float]]] = {}
+        for document, fields in documents:
+            frequencies: Counter = Counter()
+            for field, weight in FIELD_WEIGHTS:
+                for term in terms(fields.get(field, "")):
+                    frequencies[term] += weight
+            position = len(self.documents)
+            self.documents.append(document)
+            self._lengths.append(sum(frequencies.values()))
+            for term, frequency in frequencies.items():
+                self._postings.setdefault(term, []).append((position, frequency))
+        count = len(self.documents)
+        self._average_length = (sum(self._lengths) / count) if count else 0.0
+        self._idf = {
+            term: math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def score(self, query: str) -> IntentScores:
+        query_terms = list(dict.fromkeys(terms(query)))
+        if not query_terms or not self.documents:
+            return IntentScores([], 0.0)
+
+        scores: Dict[int, float] = {}
+        matched: Dict[int, int] = {}
+        for term in query_terms:
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for position, frequency in self._postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[position] / self._average_length)
+                scores[position] = scores.get(position, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+                matched[position] = matched.get(position, 0) + 1
+        if not scores:
+            return IntentScores([], 0.0)
+
+        ranked = sorted(scores.items(), key=lambda item: -item[1])
+        top_position, top = ranked[0]
+        second = ranked[1][1] if len(ranked) > 1 else 0.0
+        # How much of the question the winner explains, discounted when the runner-up is close
+        coverage = matched[top_position] / len(query_terms)
+        margin = (top - second) / top
+        confidence = coverage * (0.5 + 0.5 * margin)
+        return IntentScores(
+            [IntentMatch(self.documents[position], round(score, 4)) for position, score in ranked],
+            round(confidence, 4)
+        )
+
+class ClientIntents(NamedTuple):
+    client_id: str
+    index: IntentIndex
+    extractor: EntityExtractor
+
+class IntentRouter:
+    """
+    Intent indexes and entity extractors keyed by client id
+    A hit needs no database access; entries are dropped through config change
+    events when the client, its configurations or its templates change.
+    """
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self.confidence_threshold = 0.5
+        self._entries: Dict[str, ClientIntents] = {}
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, confidence_threshold: Optional[float] = None, max_entries: Optional[int] = None):
+        if confidence_threshold is not None:
+            self.confidence_threshold = confidence_threshold
+        if max_entries is not None:
+            self.max_entries = max_entries
+
+    def lookup(self, client_id: str) -> Optional[ClientIntents]:
+        entry = self._entries.get(client_id)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def store(self, entry: ClientIntents, generation: int):
+        """Cache an index built from reads that started at `generation`"""
+        if generation != self.generation:
+            return  # Invalidated while it was being built
+        if entry.client_id not in self._entries and len(self._entries) >= self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[entry.client_id] = entry
+
+    def invalidate_client(self, client_id: str):
+        self.generation += 1
+        self._entries.pop(client_id, None)
+
+    def invalidate_all(self):
+        self.generation += 1
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "clients": len(self._entries),
+            "templates": sum(len(entry.index) for entry in self._entries.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "confidence_threshold": self.confidence_threshold
+        }
+
+intent_router = IntentRouter()
+
+def _on_config_change(event: Dict[str, Any]):
+    client_id = event.get("client_id")
+    if client_id:
+        intent_router.invalidate_client(client_id)
+    else:
+        intent_router.invalidate_all()
+
+config_events.add_listener(_on_config_change)
@@ -0,0 +1,443 @@
+# api_admin/app/core/json_stream.py
+"""
+Incremental response_mapping extraction for large JSON and NDJSON bodies
+
+The body is fed chunk by chunk. Subtrees no mapped path can reach are scanned for
+brackets without being decoded, and only the values the mapping names are passed
+to json.loads. Once every mapped path is settled the extractor reports done so the
+caller can stop reading the body.
+
+    mapping = StreamingMapping({"salary": "$.data.base_salary"})
+    result = mapping.extract(response.iter_content(65536))
+"""
+import codecs
+import json
+import re
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from .jsonpath import FILTER, INDEX, KEY, WILDCARD, JSONPath, compile_path
+
+class JSONStreamError(ValueError):
+    """Raised when the streamed body is not valid JSON"""
+
+Chunk = Union[bytes, str]
+
+# Value positions: a value is expected, or the first value/']' of an array
+_VALUE, _ARRAY_START = 0, 1
+# Object positions: first key/'}', a key after ',', ':' after a key
+_OBJECT_START, _KEY, _COLON = 2, 3, 4
+_COMMA_OR_END = 5
+
+_SKIP, _DESCEND, _CAPTURE = 0, 1, 2
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# Everything up to the next bracket outside a string, in one regex call
+_STRUCTURE = re.compile(r'(?:[^"\[\]{}]+|"[^"\\]*(?:\\.[^"\\]*)*")*')
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+# Numbers and literals run until a delimiter; they're only validated when captured
+_SCALAR = re.compile(r'[^ \t\n\r,:\]}\[{"]+')
+
+class _PathPlan:
+    """How one mapped path is matched while streaming"""
+    __slots__ = ("field", "steps", "definite", "match_steps", "capture_depth", "settle_depth", "_remainders")
+
+    def __init__(self, field: str, path: JSONPath):
+        self.field = field
+        self.steps = path.steps
+        self.definite = path.definite
+        # Wildcard and filter children are captured one at a time (json.loads beats
+        # tokenizing them in Python), negative indexes need the whole array; the
+        # remaining steps are evaluated in memory on the captured value
+        cut = len(self.steps)
+        for position, (kind, value) in enumerate(self.steps):
+            if kind in (WILDCARD, FILTER):
+                cut = position + 1
+                break
+            if kind == INDEX and value < 0:
+                cut = position
+                break
+        self.match_steps = tuple(
+            (WILDCARD, None) if kind == FILTER else (kind, value)
+            for kind, value in self.steps[:cut]
+        )
+        self.capture_depth = cut
+        # Closing the container at this depth (or above) means nothing more can match
+        first_open = next(
+            (position for position, (kind, _) in enumerate(self.steps) if kind in (WILDCARD, FILTER)),
+            None
+        )
+        self.settle_depth = cut - 1 if first_open is None else first_open
+        self._remainders: Dict[int, Optional[JSONPath]] = {}
+
+    def remainder(self, depth: int) -> Optional[JSONPath]:
+        """Steps left to evaluate in memory on a value captured at `depth`"""
+        if depth not in self._remainders:
+            if self.definite:
+                steps = self.steps[depth:]
+            elif depth == self.capture_depth and self.steps[depth - 1][0] == FILTER:
+                # A filter candidate is tested as the only child of a one-item list
+                steps = self.steps[depth - 1:]
+            else:
+                # Lists collect every match, so wrap the value and walk it as a child
+                steps = [(WILDCARD, None)] + self.steps[depth:]
+            self._remainders[depth] = JSONPath(self.field, steps) if steps else None
+        return self._remainders[depth]
+
+    def matches(self, path: List[Any], in_object: List[bool]) -> bool:
+        """Whether `path` lies on the way to (or at) this plan's capture depth"""
+        for (kind, value), key, is_object in zip(self.match_steps, path, in_object):
+            if kind == KEY:
+                if not is_object or key != value:
+                    return False
+            elif kind == INDEX:
+                if is_object or key != value:
+                    return False
+        return True
+
+class StreamingMapping:
+    """A response_mapping compiled for incremental extraction; reusable across responses"""
+
+    def __init__(self, mapping: Optional[Dict[str, str]]):
+        self.plans: Tuple[_PathPlan, ...] = tuple(
+            _PathPlan(field, compile_path(expression))
+            for field, expression in (mapping or {}).items()
+        )
+
+    def extractor(self) -> "StreamingExtractor":
+        return StreamingExtractor(self.plans)
+
+    def extract(self, chunks: Iterable[Chunk]) -> Dict[str, Any]:
+        """Mapped fields of one JSON document; stops consuming `chunks` once they're all found"""
+        extractor = self.extractor()
+        iterator = iter(chunks)
+        try:
+            for chunk in iterator:
+                if extractor.feed(chunk):
+                    break
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+        return extractor.close()
+
+    async def aextract(self, chunks: AsyncIterable[Chunk]) -> Dict[str, Any]:
+        """Async variant of extract, e.g. for httpx's response.aiter_bytes()"""
+        extractor = self.extractor()
+        iterator = chunks.__aiter__()
+        try:
+            async for chunk in iterator:
+                if extractor.feed(chunk):
+                    break
+        finally:
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        return extractor.close()
+
+    def iter_ndjson(self, chunks: Iterable[Chunk]) -> Iterator[Dict[str, Any]]:
+        """Mapped fields of each NDJSON record, yielded as each line completes"""
+        splitter = _NDJSONSplitter(self)
+        for chunk in chunks:
+            yield from splitter.feed(chunk)
+        yield from splitter.close()
+
+    async def aiter_ndjson(self, chunks: AsyncIterable[Chunk]) -> AsyncIterator[Dict[str, Any]]:
+        splitter = _NDJSONSplitter(self)
+        async for chunk in chunks:
+            for record in splitter.feed(chunk):
+                yield record
+        for record in splitter.close():
+            yield record
+
+class StreamingExtractor:
+    """Push parser for one JSON document; feed() chunks, then close() for the result"""
+
+    def __init__(self, plans: Tuple[_PathPlan, ...]):
+        self._pending: List[_PathPlan] = list(plans)
+        self.result: Dict[str, Any] = {
+            plan.field: None if plan.definite else [] for plan in plans
+        }
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._position = 0
+        self._offset = 0
+        self._keys: List[Any] = []
+        self._in_object: List[bool] = []
+        self._state = _VALUE
+        # Depth inside a container being skipped or captured, and where a capture began
+        self._skip_depth = 0
+        self._capture_start: Optional[int] = None
+        # Set when a plan settles, to check whether the open container still matters
+        self._recheck = False
+        self._abandoning = False
+        self.finished = False
+
+    @property
+    def done(self) -> bool:
+        """True once every mapped path is settled or the document ended"""
+        return self.finished or not self._pending
+
+    def feed(self, chunk: Chunk) -> bool:
+        """Consume a chunk; returns True when no further input is needed"""
+        if self.done:
+            return True
+        text = self._decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        keep = self._position if self._capture_start is None else self._capture_start
+        self._offset += keep
+        if self._capture_start is not None:
+            self._capture_start -= keep
+        self._buffer = self._buffer[keep:] + text
+        self._position -= keep
+        self._run(final=False)
+        return self.done
+
+    def close(self) -> Dict[str, Any]:
+        """The extracted fields; raises JSONStreamError if the document was cut short"""
+        if not self.done:
+            self._buffer += self._decoder.decode(b"", final=True)
+            self._run(final=True)
+            if not self.done:
+                self._fail("Unexpected end of JSON document")
+        return self.result
+
+    # Matching
+
+    def _fail(self, message: str):
+        raise JSONStreamError(f"{message} at offset {self._offset + self._position}")
+
+    def _classify(self) -> int:
+        keys, in_object = self._keys, self._in_object
+        depth = len(keys)
+        action = _SKIP
+        for plan in self._pending:
+            if depth <= plan.capture_depth and plan.matches(keys, in_object):
+                if depth == plan.capture_depth:
+                    return _CAPTURE
+                action = _DESCEND
+        return action
+
+    def _deliver(self, value: Any):
+        """Hand a captured value to every pending plan it belongs to"""
+        keys, in_object = self._keys, self._in_object
+        depth = len(keys)
+        for plan in list(self._pending):
+            if depth > plan.capture_depth or not plan.matches(keys, in_object):
+                continue
+            remainder = plan.remainder(depth)
+            if plan.definite:
+                self.result[plan.field] = value if remainder is None else remainder.find(value)
+                self._pending.remove(plan)
+                self._recheck = True
+            else:
+                self.result[plan.field].extend(remainder.find([value]))
+
+    def _settle(self):
+        """The container at the current depth closed; settle plans that can't match deeper"""
+        depth = len(self._keys)
+        for plan in list(self._pending):
+            if depth <= plan.settle_depth and plan.matches(self._keys, self._in_object):
+                self._pending.remove(plan)
+                self._recheck = True
+
+    def _container_reachable(self) -> bool:
+        """Whether any pending plan can still match inside the innermost open container"""
+        depth = len(self._keys) - 1
+        keys, in_object = self._keys[:-1], self._in_object[:-1]
+        return any(
+            depth < plan.capture_depth and plan.matches(keys, in_object)
+            for plan in self._pending
+        )
+
+    # Parsing
+
+    def _value_done(self):
+        if not self._keys:
+            self.finished = True
+            self._pending.clear()
+        else:
+            self._state = _COMMA_OR_END
+
+    def _close_container(self):
+        self._position += 1
+        self._keys.pop()
+        self._in_object.pop()
+        self._settle()
+        self._value_done()
+
+    def _scan_container(self, final: bool) -> bool:
+        """Advance through a skipped/captured container; False if more input is needed"""
+        buffer = self._buffer
+        position = self._position
+        depth = self._skip_depth
+        while depth:
+            position = _STRUCTURE.match(buffer, position).end()
+            if position >= len(buffer):
+                break
+            char = buffer[position]
+            if char == '"':
+                match = _STRING.match(buffer, position)
+                if match is None:
+                    break
+                position = match.end()
+            elif char in "[{":
+                depth += 1
+                position += 1
+            else:
+                depth -= 1
+                position += 1
+        self._position = position
+        self._skip_depth = depth
+        if depth and final:
+            self._fail("Unexpected end of JSON document")
+        return depth == 0
+
+    def _run(self, final: bool):
+        buffer = self._buffer
+        length = len(buffer)
+        while not self.done:
+            if self._skip_depth:
+                if not self._scan_container(final):
+                    return
+                if self._abandoning:
+                    # Scanned to the end of a container nothing needs anymore
+                    self._abandoning = False
+                    self._keys.pop()
+                    self._in_object.pop()
+                    self._settle()
+                    self._value_done()
+                    self._recheck = True
+                    continue
+                if self._capture_start is not None:
+                    start, self._capture_start = self._capture_start, None
+                    try:
+                        self._deliver(json.loads(buffer[start:self._position]))
+                    except ValueError as e:
+                        self._fail(f"Invalid JSON value ({e})")
+                self._value_done()
+                continue
+
+            if self._recheck:
+                self._recheck = False
+                if self._keys and not self._container_reachable():
+                    # e.g. $.rows[0] was found: skip the rest of rows without tokenizing it
+                    self._skip_depth = 1
+                    self._abandoning = True
+                    continue
+
+            self._position = _WHITESPACE.match(buffer, self._position).end()
+            if self._position >= length:
+                return
+            char = buffer[self._position]
+            state = self._state
+
+            if state == _VALUE or state == _ARRAY_START:
+                if state == _ARRAY_START and char == "]":
+                    self._close_container()
+                    continue
+                action = self._classify()
+                if char in "[{":
+                    if action == _DESCEND:
+                        self._keys.append(None if char == "{" else 0)
+                        self._in_object.append(char == "{")
+                        self._state = _OBJECT_START if char == "{" else _ARRAY_START
+                        self._position += 1
+                    else:
+                        if action == _CAPTURE:
+                            self._capture_start = self._position
+                        self._skip_depth = 1
+                        self._position += 1
+                    continue
+                if char == '"':
+                    match = _STRING.match(buffer, self._position)
+                    if match is None:
+                        if final:
+                            self._fail("Unterminated string")
+                        return
+                else:
+                    match = _SCALAR.match(buffer, self._position)
+                    if match is None:
+                        self._fail(f"Unexpected character {char!r}")
+                    if match.end() >= length and not final:
+                        # The number or literal may continue in the next chunk
+                        return
+                if action == _CAPTURE:
+                    try:
+                        self._deliver(json.loads(match.group(0)))
+                    except ValueError:
+                        self._fail(f"Invalid JSON value {match.group(0)!r}")
+                self._position = match.end()
+                self._value_done()
+
+            elif state == _OBJECT_START or state == _KEY:
+                if state == _OBJECT_START and char == "}":
+                    self._close_container()
+                    continue
+                if char != '"':
+                    self._fail(f"Expected an object key, found {char!r}")
+                match = _STRING.match(buffer, self._position)
+                if match is None:
+                    if final:
+                        self._fail("Unterminated string")
+                    return
+                key = match.group(0)
+                self._keys[-1] = json.loads(key) if "\\" in key else key[1:-1]
+                self._position = match.end()
+                self._state = _COLON
+
+            elif state == _COLON:
+                if char != ":":
+                    self._fail(f"Expected ':', found {char!r}")
+                self._position += 1
+                self._state = _VALUE
+
+            else:
+                if char == ",":
+                    self._position += 1
+                    if self._in_object[-1]:
+                        self._state = _KEY
+                    else:
+                        self._keys[-1] += 1
+                        self._state = _VALUE
+                elif char == ("}" if self._in_object[-1] else "]"):
+                    self._close_container()
+                else:
+                    self._fail(f"Expected ',' or a closing bracket, found {char!r}")
+
+class _NDJSONSplitter:
+    """Routes each line of an NDJSON body to its own extractor without joining lines"""
+
+    def __init__(self, mapping: StreamingMapping):
+        self._mapping = mapping
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._extractor = mapping.extractor()
+        self._empty = True
+
+    def feed(self, chunk: Chunk) -> List[Dict[str, Any]]:
+        text = self._decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        records = []
+        start = 0
+        while start < len(text):
+            newline = text.find("\n", start)
+            end = len(text) if newline == -1 else newline
+            if not self._extractor.done and start < end:
+                piece = text[start:end]
+                if self._empty and piece.strip():
+                    self._empty = False
+                # Once a record's fields are found the rest of its line is dropped unread
+                self._extractor.feed(piece)
+            if newline == -1:
+                break
+            records.extend(self._end_line())
+            start = newline + 1
+        return records
+
+    def close(self) -> List[Dict[str, Any]]:
+        self._extractor.feed(self._decoder.decode(b"", final=True))
+        return self._end_line()
+
+    def _end_line(self) -> List[Dict[str, Any]]:
+        if self._empty:
+            return []
+        extractor = self._extractor
+        self._extractor = self._mapping.extractor()
+        self._empty = True
+        return [extractor.close()]
@@ -0,0 +1,238 @@
+# api_admin/app/core/jsonpath.py
+"""
+JSONPath subset for parameter template response_mapping
+
+Supported: $.a.b, $['a'], $.a[0], $.a[-1], $.a[*], $.a.*, and filters such as
+$.items[?(@.status == 'active')].name or $.items[?(@.price > 10)] or $.items[?(@.tag)].
+Paths made only of keys and indexes return a single value (None when absent);
+wildcards and filters return a list of matches.
+"""
+import operator
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+class JSONPathError(ValueError):
+    """Raised for expressions outside the supported subset"""
+
+KEY, INDEX, WILDCARD, FILTER = "key", "index", "wildcard", "filter"
+
+_MISSING = object()
+
+_NAME = re.compile(r'[^.\[\]\s]+')
+_FILTER = re.compile(
+    r'^\?\(\s*@(?P<path>[^=!<>\s]*)\s*(?:(?P<op>==|!=|<=|>=|<|>)\s*(?P<literal>.+?))?\s*\)$'
+)
+_OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+def _parse_literal(text: str) -> Any:
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "'\"":
+        return text[1:-1]
+    if text == "true":
+        return True
+    if text == "false":
+        return False
+    if text == "null":
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        raise JSONPathError(f"Invalid filter literal: {text}")
+
+def _bracket_end(expression: str, start: int) -> int:
+    """Index of the ']' closing the '[' at `start`, skipping quotes and nesting"""
+    depth = 0
+    quote = None
+    for position in range(start, len(expression)):
+        char = expression[position]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+            if depth == 0:
+                return position
+    raise JSONPathError(f"Unclosed '[' in {expression}")
+
+def _parse_steps(expression: str, position: int) -> List[Tuple[str, Any]]:
+    steps = []
+    length = len(expression)
+    while position < length:
+        char = expression[position]
+        if char == ".":
+            if expression.startswith("..", position):
+                raise JSONPathError(f"Recursive descent is not supported: {expression}")
+            position += 1
+            if expression.startswith("*", position):
+                steps.append((WILDCARD, None))
+                position += 1
+                continue
+            match = _NAME.match(expression, position)
+            if not match:
+                raise JSONPathError(f"Expected a name at position {position} in {expression}")
+            steps.append((KEY, match.group(0)))
+            position = match.end()
+        elif char == "[":
+            end = _bracket_end(expression, position)
+            content = expression[position + 1:end].strip()
+            position = end + 1
+            if content == "*":
+                steps.append((WILDCARD, None))
+            elif content.startswith("?"):
+                steps.append((FILTER, _compile_filter(content, expression)))
+            elif len(content) >= 2 and content[0] == content[-1] and content[0] in "'\"":
+                steps.append((KEY, content[1:-1]))
+            else:
+                try:
+                    steps.append((INDEX, int(content)))
+                except ValueError:
+                    raise JSONPathError(f"Unsupported selector [{content}] in {expression}")
+        else:
+            raise JSONPathError(f"Unexpected '{char}' at position {position} in {expression}")
+    return steps
+
+def _definite_getter(steps: List[Tuple[str, Any]]) -> Callable[[Any], Any]:
+    """Nested lookups for a key/index-only path; returns _MISSING when absent"""
+    keys = tuple(value for _, value in steps)
+    if not any(kind == INDEX for kind, _ in steps):
+        def get(document):
+            try:
+                for key in keys:
+                    document = document[key]
+                return document
+            except (KeyError, TypeError):
+                return _MISSING
+        return get
+
+    def get_with_indexes(document):
+        try:
+            for kind, key in steps:
+                # Keep integer steps off strings and string steps off lists
+                if (kind == INDEX) is not (document.__class__ is list):
+                    return _MISSING
+                document = document[key]
+            return document
+        except (KeyError, IndexError, TypeError):
+            return _MISSING
+    return get_with_indexes
+
+def _compile_filter(content: str, expression: str) -> Callable[[Any], bool]:
+    match = _FILTER.match(content)
+    if not match:
+        raise JSONPathError(f"Unsupported filter [{content}] in {expression}")
+    steps = _parse_steps(match.group("path"), 0)
+    if any(kind in (WILDCARD, FILTER) for kind, _ in steps):
+        raise JSONPathError(f"Filter paths must be definite: [{content}]")
+    get = _definite_getter(steps)
+
+    if match.group("op") is None:
+        return lambda item: get(item) is not _MISSING
+
+    compare = _OPERATORS[match.group("op")]
+    literal = _parse_literal(match.group("literal").strip())
+
+    def predicate(item):
+        value = get(item)
+        if value is _MISSING:
+            return False
+        try:
+            return compare(value, literal)
+        except TypeError:
+            return False
+    return predicate
+
+def _children(node: Any) -> List[Any]:
+    if node.__class__ is list:
+        return node
+    if node.__class__ is dict:
+        return list(node.values())
+    return []
+
+def _step_function(kind: str, value: Any) -> Callable[[List[Any]], List[Any]]:
+    """One step of a non-definite path, mapping the current node list to the next"""
+    if kind == KEY:
+        return lambda nodes: [node[value] for node in nodes if node.__class__ is dict and value in node]
+    if kind == INDEX:
+        return lambda nodes: [
+            node[value] for node in nodes if node.__class__ is list and -len(node) <= value < len(node)
+        ]
+    if kind == WILDCARD:
+        return lambda nodes: [child for node in nodes for child in _children(node)]
+    return lambda nodes: [child for node in nodes for child in _children(node) if value(child)]
+
+class JSONPath:
+    """A compiled expression; call it with a parsed JSON document"""
+
+    def __init__(self, expression: str, steps: Optional[List[Tuple[str, Any]]] = None):
+        self.expression = expression
+        text = expression.strip()
+        if steps is not None:
+            self.steps = list(steps)
+        elif text.startswith("$"):
+            self.steps = _parse_steps(text, 1)
+        else:
+            # Be lenient with bare dotted paths such as "data.salary"
+            self.steps = _parse_steps(text if text.startswith((".", "[")) else "." + text, 0)
+        self.definite = all(kind in (KEY, INDEX) for kind, _ in self.steps)
+
+        if self.definite:
+            get = _definite_getter(self.steps)
+
+            def find(document):
+                value = get(document)
+                return None if value is _MISSING else value
+        else:
+            # Leading keys/indexes are one nested lookup; the rest is a chain of list steps
+            split = next(i for i, (kind, _) in enumerate(self.steps) if kind in (WILDCARD, FILTER))
+            get_prefix = _definite_getter(self.steps[:split])
+            chain = tuple(_step_function(kind, value) for kind, value in self.steps[split:])
+
+            def find(document):
+                node = get_prefix(document)
+                if node is _MISSING:
+                    return []
+                nodes = [node]
+                for step in chain:
+                    nodes = step(nodes)
+                    if not nodes:
+                        break
+                return nodes
+        self.find = find
+
+    def __call__(self, document: Any) -> Any:
+        return self.find(document)
+
+    def __repr__(self) -> str:
+        return f"JSONPath({self.expression!r})"
+
+@lru_cache(maxsize=4096)
+def compile_path(expression: str) -> JSONPath:
+    """Compiled path, shared by every mapping that uses the same expression"""
+    return JSONPath(expression)
+
+class CompiledMapping:
+    """A response_mapping compiled into (field, accessor) pairs"""
+
+    def __init__(self, mapping: Optional[Dict[str, str]]):
+        self.fields: Tuple[Tuple[str, Callable[[Any], Any]], ...] = tuple(
+            (field, compile_path(expression).find)
+            for field, expression in (mapping or {}).items()
+        )
+
+    def __call__(self, document: Any) -> Dict[str, Any]:
+        return {field: find(document) for field, find in self.fields}
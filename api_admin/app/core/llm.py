@@ -0,0 +1,205 @@
+# api_admin/app/core/llm.py
+import json
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+import logging
+from .intent_router import IntentDocument
+from .text import normalize_query, terms
+
+logger = logging.getLogger(__name__)
+
+class IntentModelError(Exception):
+    """Raised when the model could not be reached or gave an unusable answer"""
+
+# The placeholder scripts/migrate_env_to_db.py seeds; not a usable key
+_PLACEHOLDER_KEYS = frozenset({"sk-proj-xxxxxx"})
+
+_SYSTEM_PROMPT = (
+    "You route user questions to API parameter templates. "
+    "Answer with a JSON object {\"template_name\": <one of the listed names or null>, "
+    "\"confidence\": <number from 0 to 1>} and nothing else."
+)
+_BATCH_SYSTEM_PROMPT = (
+    "You route user questions to API parameter templates. "
+    "Answer with a JSON object {\"answers\": [...]} holding one {\"template_name\": <one of the listed "
+    "names or null>, \"confidence\": <number from 0 to 1>} per question, in question order, and nothing else."
+)
+
+def _candidate_lines(candidates: List[IntentDocument]) -> str:
+    return "\n".join(
+        f"- {document.template_name} ({document.api_name} API): {document.description or 'no description'}"
+        for document in candidates
+    )
+
+class OpenAIIntentModel:
+    """
+    Intent classification through the chat completions API of the configured openai_model
+    Only used when the local intent router is not confident enough.
+    """
+
+    def __init__(self):
+        self.api_key = ""
+        self.model = "gpt-3.5-turbo"
+        self.base_url = "https://api.openai.com/v1"
+        self.timeout_seconds = 10.0
+        self._client: Optional[httpx.AsyncClient] = None
+        self.calls = 0
+        self.failures = 0
+
+    def configure(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        base_url: Optional[str] = None,
+        timeout_seconds: Optional[float] = None
+    ):
+        if api_key is not None:
+            self.api_key = api_key
+        if model is not None:
+            self.model = model
+        if base_url is not None:
+            self.base_url = base_url.rstrip("/")
+        if timeout_seconds is not None:
+            self.timeout_seconds = timeout_seconds
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.api_key) and self.api_key not in _PLACEHOLDER_KEYS
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient()
+        return self._client
+
+    async def _complete(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+        self.calls += 1
+        payload = {
+            "model": self.model,
+            "temperature": 0,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ]
+        }
+        try:
+            response = await self._http().post(
+                f"{self.base_url}/chat/completions",
+                json=payload,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=self.timeout_seconds
+            )
+            response.raise_for_status()
+            answer = json.loads(response.json()["choices"][0]["message"]["content"])
+        except (httpx.HTTPError, ValueError, KeyError, IndexError, TypeError) as e:
+            self.failures += 1
+            raise IntentModelError(f"Intent model call failed: {e}") from e
+
+        if not isinstance(answer, dict):
+            self.failures += 1
+            raise IntentModelError("Intent model returned an unexpected answer")
+        return answer
+
+    @staticmethod
+    def _pick(answer: Any, candidates: List[IntentDocument]) -> Tuple[Optional[IntentDocument], float]:
+        if not isinstance(answer, dict):
+            return None, 0.0
+        by_name = {document.template_name: document for document in candidates}
+        document = by_name.get(answer.get("template_name"))
+        try:
+            confidence = min(max(float(answer.get("confidence") or 0), 0.0), 1.0)
+        except (TypeError, ValueError):
+            confidence = 0.0
+        return document, confidence if document else 0.0
+
+    async def classify(self, query: str, candidates: List[IntentDocument]) -> Tuple[Optional[IntentDocument], float]:
+        """The candidate the model picks for the query (None if it picks none) and its confidence"""
+        if not candidates:
+            return None, 0.0
+        answer = await self._complete(
+            _SYSTEM_PROMPT, f"Templates:\n{_candidate_lines(candidates)}\n\nQuestion: {query}"
+        )
+        return self._pick(answer, candidates)
+
+    async def classify_batch(
+        self,
+        queries: List[str],
+        candidates: List[List[IntentDocument]]
+    ) -> List[Tuple[Optional[IntentDocument], float]]:
+        """
+        classify() for several queries in one completion
+        The prompt lists the union of the candidates; a query's answer only counts
+        if it names one of that query's own candidates.
+        """
+        if len(queries) == 1:
+            return [await self.classify(queries[0], candidates[0])]
+        union = list(dict.fromkeys(document for query_candidates in candidates for document in query_candidates))
+        if not union:
+            return [(None, 0.0)] * len(queries)
+        questions = "\n".join(f"{number}. {query}" for number, query in enumerate(queries, 1))
+        answer = await self._complete(
+            _BATCH_SYSTEM_PROMPT, f"Templates:\n{_candidate_lines(union)}\n\nQuestions:\n{questions}"
+        )
+        answers = answer.get("answers")
+        if not isinstance(answers, list) or len(answers) != len(queries):
+            self.failures += 1
+            raise IntentModelError("Intent model answered a different number of questions than it was asked")
+        return [self._pick(item, query_candidates) for item, query_candidates in zip(answers, candidates)]
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "model": self.model,
+            "calls": self.calls,
+            "failures": self.failures
+        }
+
+class LocalIntentModel:
+    """
+    Offline stand-in for the OpenAI model, for tests and air-gapped installs
+    Picks the candidate whose name and description share the most terms with the
+    question; deterministic and instant, but with none of a real model's judgement.
+    """
+
+    enabled = True
+    model = "local"
+
+    def __init__(self):
+        self.calls = 0
+
+    @staticmethod
+    def _pick(query: str, candidates: List[IntentDocument]) -> Tuple[Optional[IntentDocument], float]:
+        query_terms = set(normalize_query(query))
+        best, best_overlap = None, 0.0
+        for document in candidates:
+            document_terms = set(terms(f"{document.template_name} {document.api_name} {document.description}"))
+            union = query_terms | document_terms
+            overlap = len(query_terms & document_terms) / len(union) if union else 0.0
+            if overlap > best_overlap:
+                best, best_overlap = document, overlap
+        return best, round(best_overlap, 4)
+
+    async def classify(self, query: str, candidates: List[IntentDocument]) -> Tuple[Optional[IntentDocument], float]:
+        self.calls += 1
+        return self._pick(query, candidates)
+
+    async def classify_batch(
+        self,
+        queries: List[str],
+        candidates: List[List[IntentDocument]]
+    ) -> List[Tuple[Optional[IntentDocument], float]]:
+        self.calls += 1
+        return [self._pick(query, query_candidates) for query, query_candidates in zip(queries, candidates)]
+
+    async def aclose(self):
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": True, "model": self.model, "calls": self.calls, "failures": 0}
+
+intent_model = OpenAIIntentModel()
+local_intent_model = LocalIntentModel()
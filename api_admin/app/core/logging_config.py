@@ -0,0 +1,212 @@
+# api_admin/app/core/logging_config.py
+import atexit
+import copy
+import json
+import logging
+import queue
+import re
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Attributes every LogRecord has; anything else on a record came in through `extra`
+_RECORD_FIELDS = frozenset(logging.LogRecord("", 0, "", 0, "", None, None).__dict__) | {"message", "asctime"}
+
+_SECRET_NAMES = r"password|passwd|secret|token|api_key|api_token|authorization|credentials"
+_REDACTIONS = [
+    (re.compile(r"eyJ[\w-]+\.[\w-]+\.[\w-]+"), "[REDACTED_JWT]"),
+    (re.compile(r"\$2[aby]\$\d{2}\$[./A-Za-z0-9]{53}"), "[REDACTED_HASH]"),
+    (re.compile(r"\bsk-[\w-]{8,}"), "[REDACTED_KEY]"),
+    (re.compile(r"(?i)\b(bearer\s+)\S+"), r"\1[REDACTED]"),
+    (re.compile(rf"(?i)\b((?:{_SECRET_NAMES})['\"]?\s*[:=]\s*['\"]?)[^\s'\",}}]+"), r"\1[REDACTED]"),
+]
+_SECRET_FIELD = re.compile(rf"(?i){_SECRET_NAMES}")
+
+def redact(text: str) -> str:
+    for pattern, replacement in _REDACTIONS:
+        text = pattern.sub(replacement, text)
+    return text
+
+def parse_sample_rates(value: Optional[str]) -> Dict[str, float]:
+    """'app.core.auth=0.01,app.crud=0.1' -> {'app.core.auth': 0.01, 'app.crud': 0.1}"""
+    rates = {}
+    for part in (value or "").split(","):
+        name, _, rate = part.partition("=")
+        try:
+            rates[name.strip()] = min(max(float(rate), 0.0), 1.0)
+        except ValueError:
+            continue
+    return {name: rate for name, rate in rates.items() if name}
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps one in every 1/rate records below WARNING for the configured loggers
+    A rate applies to its logger and the loggers below it, like logging levels do.
+    Runs in the calling thread, so dropped records never reach the queue.
+    """
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None):
+        super().__init__()
+        self.rates = rates or {}
+        self._rate_for: Dict[str, Optional[float]] = {}
+        self._counts: Dict[str, int] = {}
+        self.sampled_out = 0
+
+    def _lookup(self, name: str) -> Optional[float]:
+        rate = self._rate_for.get(name, ...)
+        if rate is ...:
+            rate, prefix = None, name
+            while prefix:
+                if prefix in self.rates:
+                    rate = self.rates[prefix]
+                    break
+                prefix = prefix.rpartition(".")[0]
+            self._rate_for[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._lookup(record.name)
+        if rate is None or rate >= 1.0:
+            return True
+        count = self._counts.get(record.name, 0)
+        self._counts[record.name] = count + 1
+        if rate > 0 and count % round(1 / rate) == 0:
+            return True
+        self.sampled_out += 1
+        return False
+
+class RedactingFilter(logging.Filter):
+    """Masks tokens, password hashes and secret-looking values; runs on the listener thread"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.msg = redact(str(record.msg))
+        if record.exc_text:
+            record.exc_text = redact(record.exc_text)
+        for field, value in list(record.__dict__.items()):
+            if field not in _RECORD_FIELDS:
+                if _SECRET_FIELD.search(field):
+                    record.__dict__[field] = "[REDACTED]"
+                elif isinstance(value, str):
+                    record.__dict__[field] = redact(value)
+        return True
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line; `extra` fields are included as top-level keys"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field, value in record.__dict__.items():
+            if field not in _RECORD_FIELDS:
+                entry[field] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class _DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks the caller: a full queue drops the record"""
+
+    def __init__(self, log_queue: "queue.Queue"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args and render the traceback here, while they are still valid
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class LoggingSystem:
+    """
+    Root logging through a bounded queue drained by a background listener thread
+    Callers only pay for sampling and putting the record on the queue; formatting,
+    redaction and the stdout write happen on the listener thread.
+    """
+
+    def __init__(self, max_queue_size: int = 10000):
+        self.max_queue_size = max_queue_size
+        self.level = "INFO"
+        self.log_format = "text"
+        self.sampling = SamplingFilter()
+        self._handler: Optional[_DroppingQueueHandler] = None
+        self._listener: Optional[QueueListener] = None
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        level: Optional[str] = None,
+        log_format: Optional[str] = None,
+        sample_rates: Optional[str] = None
+    ):
+        with self._lock:
+            if level is not None:
+                if not isinstance(logging.getLevelName(level.upper()), int):
+                    raise ValueError(f"Unknown log level: {level}")
+                self.level = level.upper()
+            if log_format is not None:
+                if log_format not in ("text", "json"):
+                    raise ValueError(f"Unknown log format: {log_format}")
+                self.log_format = log_format
+            if sample_rates is not None:
+                self.sampling = SamplingFilter(parse_sample_rates(sample_rates))
+            self._install()
+
+    def _install(self):
+        self._stop()
+        output = logging.StreamHandler(sys.stdout)
+        output.setFormatter(JSONFormatter() if self.log_format == "json" else logging.Formatter(TEXT_FORMAT))
+        output.addFilter(RedactingFilter())
+
+        handler = _DroppingQueueHandler(queue.Queue(self.max_queue_size))
+        handler.addFilter(self.sampling)
+        root = logging.getLogger()
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+        root.addHandler(handler)
+        root.setLevel(self.level)
+
+        self._handler = handler
+        self._listener = QueueListener(handler.queue, output, respect_handler_level=True)
+        self._listener.start()
+
+    def _stop(self):
+        if self._listener is not None:
+            self._listener.stop()  # Drains what is already queued
+            self._listener = None
+
+    def shutdown(self):
+        with self._lock:
+            self._stop()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "level": self.level,
+            "format": self.log_format,
+            "sample_rates": self.sampling.rates,
+            "sampled_out": self.sampling.sampled_out,
+            "dropped": self._handler.dropped if self._handler else 0,
+            "queued": self._handler.queue.qsize() if self._handler else 0
+        }
+
+logging_system = LoggingSystem()
+atexit.register(logging_system.shutdown)
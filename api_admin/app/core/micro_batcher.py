@@ -0,0 +1,88 @@
+# api_admin/app/core/micro_batcher.py
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Set, Tuple
+
+class MicroBatcher:
+    """
+    Gathers concurrent submissions for the same key into one handler call
+    The first submission for a key opens a window of `window_seconds`; everything
+    submitted for that key until it closes, or until `max_batch_size` items are
+    waiting, goes to `handler(key, items)` together and each caller gets its own
+    result back. The handler must return one result per item, in order.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Hashable, List[Any]], Awaitable[List[Any]]],
+        window_seconds: float = 0.005,
+        max_batch_size: int = 32
+    ):
+        self.handler = handler
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[Hashable, List[Tuple[Any, asyncio.Future]]] = {}
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._stats = {"submitted": 0, "batches": 0, "largest_batch": 0}
+
+    def configure(self, window_seconds: float = None, max_batch_size: int = None):
+        if window_seconds is not None:
+            self.window_seconds = window_seconds
+        if max_batch_size is not None:
+            self.max_batch_size = max(max_batch_size, 1)
+
+    async def submit(self, key: Hashable, item: Any) -> Any:
+        self._stats["submitted"] += 1
+        if self.window_seconds <= 0 or self.max_batch_size <= 1:
+            self._count_batch(1)
+            return (await self.handler(key, [item]))[0]
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = []
+            self._timers[key] = loop.call_later(self.window_seconds, self._flush, key)
+        batch.append((item, future))
+        if len(batch) >= self.max_batch_size:
+            self._flush(key)
+        return await future
+
+    def _flush(self, key: Hashable):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, None)
+        if not batch:
+            return
+        self._count_batch(len(batch))
+        # The batch outlives any one caller, so it runs as its own task
+        task = asyncio.ensure_future(self._run(key, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _count_batch(self, size: int):
+        self._stats["batches"] += 1
+        self._stats["largest_batch"] = max(self._stats["largest_batch"], size)
+
+    async def _run(self, key: Hashable, batch: List[Tuple[Any, asyncio.Future]]):
+        try:
+            results = await self.handler(key, [item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():  # The caller may have gone away
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        batches = self._stats["batches"]
+        return {
+            **self._stats,
+            "average_batch": round(self._stats["submitted"] / batches, 2) if batches else 0.0,
+            "waiting": sum(len(batch) for batch in self._pending.values()),
+            "window_ms": round(self.window_seconds * 1000, 3),
+            "max_batch_size": self.max_batch_size
+        }
@@ -0,0 +1,233 @@
+# api_admin/app/core/rate_limit.py
+import asyncio
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from fastapi import HTTPException, Response
+
+MEMORY_BACKEND = "memory"
+SQLITE_BACKEND = "sqlite"
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int  # Calls per minute; also the bucket size, so a quiet client may burst this many
+    remaining: int
+    reset_seconds: float  # Until the bucket is full again
+    retry_after: float  # Until `cost` tokens are available; 0 when allowed
+
+def _take(tokens: float, elapsed: float, limit: int, cost: int):
+    """
+    Refill a bucket for `elapsed` seconds and try to take `cost` tokens from it
+    A bucket never holds more than `limit` tokens, so a larger cost is charged as a
+    full bucket: a batch bigger than the limit waits for a full bucket instead of forever.
+    """
+    rate = limit / 60.0
+    tokens = min(float(limit), tokens + max(elapsed, 0.0) * rate)
+    cost = min(cost, limit)
+    allowed = tokens >= cost
+    if allowed:
+        tokens -= cost
+    result = RateLimitResult(
+        allowed=allowed,
+        limit=limit,
+        remaining=int(tokens),
+        reset_seconds=(limit - tokens) / rate,
+        retry_after=0.0 if allowed else (cost - tokens) / rate
+    )
+    return tokens, result
+
+class MemoryTokenBuckets:
+    """Token buckets for one process"""
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._buckets: Dict[str, List[float]] = {}
+
+    async def hit(self, key: str, limit: int, cost: int = 1) -> RateLimitResult:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self._prune(now, limit)
+            bucket = self._buckets[key] = [float(limit), now]
+        bucket[0], result = _take(bucket[0], now - bucket[1], limit, cost)
+        bucket[1] = now
+        return result
+
+    def _prune(self, now: float, limit: int):
+        # A bucket that has refilled completely is the same as no bucket
+        for key, (tokens, updated) in list(self._buckets.items()):
+            if tokens + (now - updated) * limit / 60.0 >= limit:
+                del self._buckets[key]
+
+    def clear(self):
+        self._buckets.clear()
+
+class SQLiteTokenBuckets:
+    """
+    Token buckets in a SQLite file shared by every worker process on the host
+    Each hit is one IMMEDIATE transaction, so concurrent workers never double-spend a token.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._hits = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections stay on the thread that opened them
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _hit(self, key: str, limit: int, cost: int) -> RateLimitResult:
+        conn = self._connection()
+        # Wall-clock time, since monotonic clocks are not comparable across processes
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens, updated = row if row else (float(limit), now)
+            tokens, result = _take(tokens, now - updated, limit, cost)
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated_at) VALUES (?, ?, ?)",
+                (key, tokens, now)
+            )
+            self._hits += 1
+            if self._hits % 1000 == 0:
+                # Idle buckets have long since refilled; keep the table small
+                conn.execute("DELETE FROM rate_limit_buckets WHERE updated_at < ?", (now - 3600,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return result
+
+    async def hit(self, key: str, limit: int, cost: int = 1) -> RateLimitResult:
+        return await asyncio.to_thread(self._hit, key, limit, cost)
+
+    def clear(self):
+        self._connection().execute("DELETE FROM rate_limit_buckets")
+
+class RateLimiter:
+    """
+    Per-client call limits, keyed by Client.id
+    Never key it by the raw API key: the sqlite backend writes keys to disk.
+    The default comes from the api_rate_limit setting; a client's rate_limit_per_minute
+    overrides it. A limit of 0 or less disables limiting. Overrides are kept in memory
+    so a call can be limited before anything is read from the database.
+    """
+
+    def __init__(self, default_limit: int = 100):
+        self.default_limit = default_limit
+        self._overrides: Dict[str, int] = {}
+        self.backend_name = MEMORY_BACKEND
+        self._backend = MemoryTokenBuckets()
+        self._stats = {"allowed": 0, "limited": 0}
+
+    def configure(
+        self,
+        default_limit: Optional[int] = None,
+        backend: Optional[str] = None,
+        path: Optional[str] = None
+    ):
+        if default_limit is not None:
+            self.default_limit = default_limit
+        if backend is None:
+            return
+        if backend == self.backend_name and (backend == MEMORY_BACKEND or path == self._backend.path):
+            return
+        if backend == SQLITE_BACKEND:
+            if not path:
+                raise ValueError("The sqlite rate limit backend needs a file path")
+            self._backend = SQLiteTokenBuckets(path)
+        elif backend == MEMORY_BACKEND:
+            self._backend = MemoryTokenBuckets()
+        else:
+            raise ValueError(f"Unknown rate limit backend: {backend}")
+        self.backend_name = backend
+
+    def load_overrides(self, rows: Iterable[Tuple[str, Optional[int]]]):
+        """Replace the per-client limits with (client_id, rate_limit_per_minute) rows"""
+        self._overrides = {client_id: limit for client_id, limit in rows if limit is not None}
+
+    def set_override(self, client_id: str, limit: Optional[int]):
+        """A client's own limit; None puts it back on the default"""
+        if limit is None:
+            self._overrides.pop(client_id, None)
+        else:
+            self._overrides[client_id] = limit
+
+    def limit_for(self, client_id: str) -> int:
+        return self._overrides.get(client_id, self.default_limit)
+
+    async def hit(self, client_id: str, cost: int = 1) -> Optional[RateLimitResult]:
+        """Spend `cost` calls for a client; None when the client is not limited"""
+        limit = self.limit_for(client_id)
+        if limit <= 0:
+            return None
+        result = await self._backend.hit(client_id, limit, cost)
+        self._stats["allowed" if result.allowed else "limited"] += 1
+        return result
+
+    def clear(self):
+        self._backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "backend": self.backend_name,
+            "default_limit_per_minute": self.default_limit,
+            "client_overrides": len(self._overrides)
+        }
+
+rate_limiter = RateLimiter()
+# Login attempts, keyed by "login:ip:<address>" and "login:user:<username>"
+login_ip_limiter = RateLimiter(default_limit=20)
+login_user_limiter = RateLimiter(default_limit=10)
+
+def rate_limit_headers(result: RateLimitResult) -> Dict[str, str]:
+    headers = {
+        "X-RateLimit-Limit": str(result.limit),
+        "X-RateLimit-Remaining": str(result.remaining),
+        "X-RateLimit-Reset": str(math.ceil(result.reset_seconds))
+    }
+    if not result.allowed:
+        headers["Retry-After"] = str(max(math.ceil(result.retry_after), 1))
+    return headers
+
+async def enforce_rate_limit(
+    response: Response,
+    client_id: str,
+    cost: int = 1
+) -> Optional[RateLimitResult]:
+    """Spend calls for a client and add the rate limit headers; raises 429 once it is out of calls"""
+    result = await rate_limiter.hit(client_id, cost)
+    if result is None:
+        return None
+    headers = rate_limit_headers(result)
+    if not result.allowed:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Rate limit of {result.limit} calls per minute exceeded",
+            headers=headers
+        )
+    response.headers.update(headers)
+    return result
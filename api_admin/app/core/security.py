@@ -1,20 +1,22 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Dict, Optional
 from jose import JWTError, jwt
 import bcrypt
 
 from .config import settings
+import logging
+
+logger = logging.getLogger(__name__)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     try:
-        print(f"Verifying password - Plain: {plain_password}, Hash: {hashed_password}")
         password_bytes = plain_password.encode('utf-8')
         hashed_bytes = hashed_password.encode('utf-8')
-        result = bcrypt.checkpw(password_bytes, hashed_bytes)
-        print(f"Password verification result: {result}")
-        return result
+        return bcrypt.checkpw(password_bytes, hashed_bytes)
     except Exception as e:
-        print(f"Password verification error: {e}")
+        logger.error(f"Password verification error: {e}")
         return False
 
 def get_password_hash(password: str) -> str:
@@ -23,6 +25,68 @@ def get_password_hash(password: str) -> str:
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
+class PasswordHasherBusyError(Exception):
+    """Raised when a hash could not start within the queue timeout"""
+
+class PasswordHasher:
+    """
+    Runs bcrypt on its own small thread pool so hashing never blocks the event loop
+    At most `max_concurrency` hashes run at once; callers waiting longer than
+    `queue_timeout_seconds` for a turn get PasswordHasherBusyError.
+    """
+
+    def __init__(self, max_concurrency: int = 2, queue_timeout_seconds: float = 5.0):
+        self.max_concurrency = max_concurrency
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._stats = {"hashed": 0, "verified": 0, "rejected": 0}
+
+    def configure(self, max_concurrency: Optional[int] = None, queue_timeout_seconds: Optional[float] = None):
+        if max_concurrency is not None and max_concurrency != self.max_concurrency:
+            self.max_concurrency = max(max_concurrency, 1)
+            self.shutdown()
+        if queue_timeout_seconds is not None:
+            self.queue_timeout_seconds = queue_timeout_seconds
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="bcrypt")
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        semaphore, executor = self._semaphore, self._executor
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=self.queue_timeout_seconds)
+        except asyncio.TimeoutError:
+            self._stats["rejected"] += 1
+            raise PasswordHasherBusyError(f"No password hashing slot within {self.queue_timeout_seconds}s")
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        finally:
+            semaphore.release()
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        self._stats["verified"] += 1
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        self._stats["hashed"] += 1
+        return await self._run(get_password_hash, password)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = None
+        self._semaphore = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "max_concurrency": self.max_concurrency,
+            "queue_timeout_seconds": self.queue_timeout_seconds
+        }
+
+password_hasher = PasswordHasher()
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
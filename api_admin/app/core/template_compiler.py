@@ -0,0 +1,247 @@
+# api_admin/app/core/template_compiler.py
+import re
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from .events import config_events
+from .cache import ResponseCachePolicy
+from .jsonpath import CompiledMapping
+from .json_stream import StreamingMapping
+
+class MissingParametersError(ValueError):
+    """Raised with every missing required parameter at once"""
+
+    def __init__(self, missing: List[str]):
+        self.missing = missing
+        names = ", ".join(f"'{name}'" for name in missing)
+        plural = "s" if len(missing) > 1 else ""
+        super().__init__(f"Required parameter{plural} {names} not provided")
+
+def _coerce_boolean(value: Any) -> str:
+    return str(value).lower()
+
+def _coerce_array(value: Any) -> str:
+    return ','.join(map(str, value)) if isinstance(value, list) else str(value)
+
+def _coerce_identity(value: Any) -> Any:
+    return value
+
+COERCERS: Dict[str, Callable[[Any], Any]] = {
+    'boolean': _coerce_boolean,
+    'array': _coerce_array,
+}
+
+_NO_DEFAULT = object()
+
+class ParamSpec:
+    """One query parameter with its source key, coercer and pre-coerced default"""
+    __slots__ = ("name", "source", "required", "coerce", "default")
+
+    def __init__(self, name: str, config: Dict[str, Any]):
+        self.name = name
+        self.source = config.get('source', name)
+        self.required = config.get('required', False)
+        self.coerce = COERCERS.get(config.get('type', 'string'), _coerce_identity)
+        # Defaults are invariant, so they are coerced once here
+        self.default = self.coerce(config['default']) if 'default' in config else _NO_DEFAULT
+
+class RenderedCall(NamedTuple):
+    """One row of a batch render: the call, or the error that row raised"""
+    index: int
+    call: Optional[Dict[str, Any]]
+    error: Optional[Exception]
+
+_PLACEHOLDER = re.compile(r'\{([^{}]+)\}')
+
+class CompiledTemplate:
+    """
+    A ClientApiParameter prepared for repeated rendering
+    Path segments, parameter specs and headers are resolved once; calling the
+    object with input data only does the per-request lookups.
+    """
+
+    def __init__(self, template: Any):
+        self.template_id = getattr(template, 'id', None)
+        self.http_method = template.http_method
+        self.response_mapping = template.response_mapping
+        cache_ttl_seconds = getattr(template, 'cache_ttl_seconds', None)
+        self.cache_policy: Optional[ResponseCachePolicy] = ResponseCachePolicy(
+            template_id=self.template_id,
+            version=getattr(template, 'updated_at', None),
+            config_id=getattr(template, 'client_api_config_id', None),
+            ttl_seconds=float(cache_ttl_seconds),
+            max_entries=getattr(template, 'cache_max_entries', None),
+            cache_errors=bool(getattr(template, 'cache_errors', 0))
+        ) if cache_ttl_seconds and self.template_id is not None else None
+        parameter_template = template.parameter_template or {}
+
+        # Pre-split path: literals stay strings, known placeholders become (literal, source)
+        path_params = parameter_template.get('path_params', {})
+        self.path_parts: List[Any] = []
+        position = 0
+        for match in _PLACEHOLDER.finditer(template.endpoint_path):
+            name = match.group(1)
+            if name not in path_params:
+                continue
+            self.path_parts.append(template.endpoint_path[position:match.start()])
+            self.path_parts.append((match.group(0), path_params[name].get('source', name)))
+            position = match.end()
+        self.path_parts.append(template.endpoint_path[position:])
+        self.path_parts = [part for part in self.path_parts if part != ""]
+        self.static_path: Optional[str] = (
+            "".join(self.path_parts) if all(isinstance(p, str) for p in self.path_parts) else None
+        )
+
+        self.params: Tuple[ParamSpec, ...] = tuple(
+            ParamSpec(name, config)
+            for name, config in parameter_template.get('query_params', {}).items()
+        )
+        # Flat tuples unpack faster than slot attribute reads in the render loop;
+        # string params carry no coercer so the common case skips a call
+        self._param_rows = tuple(
+            (spec.source, spec.name, None if spec.coerce is _coerce_identity else spec.coerce,
+             spec.default, spec.required)
+            for spec in self.params
+        )
+        self._headers = dict(parameter_template.get('headers', {}))
+        self.headers = MappingProxyType(self._headers)
+        # Compiled on first use so a bad mapping doesn't block request building
+        self._response_mapper: Optional[CompiledMapping] = None
+        self._streaming_mapping: Optional[StreamingMapping] = None
+
+    def render_path(self, input_data: Dict[str, Any]) -> str:
+        if self.static_path is not None:
+            return self.static_path
+        parts = []
+        for part in self.path_parts:
+            if part.__class__ is str:
+                parts.append(part)
+            else:
+                placeholder, source = part
+                parts.append(str(input_data[source]) if source in input_data else placeholder)
+        return "".join(parts)
+
+    def render_params(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        query_params = {}
+        missing = None
+        for source, name, coerce, default, required in self._param_rows:
+            if source in input_data:
+                value = input_data[source]
+                query_params[name] = value if coerce is None else coerce(value)
+            elif default is not _NO_DEFAULT:
+                query_params[name] = default
+            elif required:
+                if missing is None:
+                    missing = []
+                missing.append(name)
+        if missing:
+            raise MissingParametersError(missing)
+        return query_params
+
+    def map_response(self, response_data: Any) -> Dict[str, Any]:
+        """Apply response_mapping to a parsed upstream response"""
+        mapper = self._response_mapper
+        if mapper is None:
+            mapper = self._response_mapper = CompiledMapping(self.response_mapping)
+        return mapper(response_data)
+
+    @property
+    def streaming_mapping(self) -> StreamingMapping:
+        """response_mapping prepared for incremental extraction from a raw body"""
+        if self._streaming_mapping is None:
+            self._streaming_mapping = StreamingMapping(self.response_mapping)
+        return self._streaming_mapping
+
+    def __call__(self, input_data: Dict[str, Any], base_url: str) -> Dict[str, Any]:
+        return {
+            'url': f"{base_url.rstrip('/')}{self.render_path(input_data)}",
+            'method': self.http_method,
+            'params': self.render_params(input_data),
+            'headers': self._headers.copy(),
+            'response_mapping': self.response_mapping
+        }
+
+    def render_many(self, inputs: Iterable[Dict[str, Any]], base_url: str) -> Iterator[RenderedCall]:
+        """
+        Render one call per input row, lazily
+        The URL prefix, method, headers and mapping are bound once for the whole batch;
+        a failing row yields its error and the batch continues.
+        """
+        url_prefix = base_url.rstrip('/')
+        static_url = url_prefix + self.static_path if self.static_path is not None else None
+        method = self.http_method
+        headers = self._headers
+        response_mapping = self.response_mapping
+        render_path = self.render_path
+        render_params = self.render_params
+
+        for index, input_data in enumerate(inputs):
+            try:
+                url = static_url if static_url is not None else url_prefix + render_path(input_data)
+                params = render_params(input_data)
+            except Exception as e:
+                yield RenderedCall(index, None, e)
+                continue
+            yield RenderedCall(index, {
+                'url': url,
+                'method': method,
+                'params': params,
+                'headers': headers.copy(),
+                'response_mapping': response_mapping
+            }, None)
+
+class CompiledTemplateCache:
+    """
+    Compiled templates keyed by template id and validated against updated_at
+    A plain dict keeps the per-call lookup cheaper than rendering itself; same-second
+    edits that updated_at can't distinguish are dropped through change events.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[Any, CompiledTemplate]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, template: Any) -> CompiledTemplate:
+        template_id = getattr(template, 'id', None)
+        if template_id is None:
+            return CompiledTemplate(template)
+
+        updated_at = getattr(template, 'updated_at', None)
+        entry = self._entries.get(template_id)
+        if entry is not None and entry[0] == updated_at:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        compiled = CompiledTemplate(template)
+        if entry is None and len(self._entries) >= self.max_entries:
+            # Evict the oldest insertion; dicts keep insertion order
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[template_id] = (updated_at, compiled)
+        return compiled
+
+    def invalidate(self, template_id: str):
+        self._entries.pop(template_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+compiled_templates = CompiledTemplateCache()
+
+def compile_template(template: Any) -> CompiledTemplate:
+    """Compiled form of a parameter template, reused until the template changes"""
+    return compiled_templates.get(template)
+
+def _on_config_change(event: Dict[str, Any]):
+    if event.get("entity_type") == "parameter_template":
+        compiled_templates.invalidate(event["entity_id"])
+
+config_events.add_listener(_on_config_change)
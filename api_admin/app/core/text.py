@@ -0,0 +1,59 @@
+# api_admin/app/core/text.py
+import re
+from typing import Any, Dict, Iterator, List
+
+# Words that say nothing about which API a question is for
+STOPWORDS = frozenset("""
+a about all am an and any are as at be been but by can could did do does for from get give
+had has have how i if in is it its me my of on or our please show tell that the their them
+then there these this those to us was we were what when where which who whom why will with
+would you your
+""".split())
+
+_WORD = re.compile(r"[A-Za-z]+|\d+")
+# Whole tokens of a question, so ids like E-1042 or a UUID stay in one piece
+_TOKEN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+|[A-Za-z0-9][\w-]*")
+ENTITY_ID = "<id>"
+ENTITY_EMAIL = "<email>"
+_CAMEL = re.compile(r"(?<=[a-z])(?=[A-Z])")
+
+def _stem(word: str) -> str:
+    """Fold the common English plural forms onto one term"""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+def words(text: str) -> List[str]:
+    """Lowercased words of free text or identifiers; snake_case and camelCase are split"""
+    return [word.lower() for word in _WORD.findall(_CAMEL.sub(" ", text or "").replace("_", " "))]
+
+def terms(text: str) -> List[str]:
+    """Index terms: words without stopwords, numbers or stray letters, stemmed"""
+    return [
+        _stem(word) for word in words(text)
+        if len(word) > 1 and word not in STOPWORDS and not word.isdigit()
+    ]
+
+def normalize_query(text: str) -> List[str]:
+    """
+    Terms of a question with entity values masked, for matching rephrasings
+    "Salary of employee E-1042?" and "employee 77 salary" both give
+    salary, employee and ENTITY_ID.
+    """
+    normalized = []
+    for token in _TOKEN.findall(text or ""):
+        if "@" in token:
+            normalized.append(ENTITY_EMAIL)
+        elif any(char.isdigit() for char in token):
+            normalized.append(ENTITY_ID)
+        else:
+            normalized.extend(terms(token))
+    return normalized
+
+def template_sources(parameter_template: Dict[str, Any]) -> Iterator[str]:
+    """Input keys a parameter template reads, in declaration order"""
+    for section in ("path_params", "query_params"):
+        for name, config in (parameter_template or {}).get(section, {}).items():
+            yield (config or {}).get("source", name) if isinstance(config, dict) else name
@@ -0,0 +1,248 @@
+# api_admin/app/crud/crud_catalog.py
+from typing import List, Optional, Dict, Any
+from sqlalchemy import select, func, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.client import Client
+from ..models.client_api_config import ClientApiConfig
+from ..models.client_api_parameter import ClientApiParameter
+from ..models.config_change import ConfigChange
+from ..core.cache import resolution_cache
+from ..core.api_keys import api_key_index
+from ..core.rate_limit import rate_limiter
+from ..core.events import config_events
+
+ENTITY_CLIENT = "client"
+ENTITY_API_CONFIG = "api_config"
+ENTITY_PARAMETER_TEMPLATE = "parameter_template"
+
+def record_change(
+    session: AsyncSession,
+    entity_type: str,
+    entity_id: str,
+    operation: str = "upsert",
+    client_id: Optional[str] = None,
+    api_name: Optional[str] = None
+) -> ConfigChange:
+    """Stage a change-log row; it commits together with the write it describes"""
+    change = ConfigChange(
+        entity_type=entity_type,
+        entity_id=entity_id,
+        operation=operation,
+        client_id=client_id,
+        api_name=api_name
+    )
+    session.add(change)
+    return change
+
+def change_event(change: ConfigChange) -> Dict[str, Any]:
+    return {
+        "type": "config_change",
+        "version": change.id,
+        "entity_type": change.entity_type,
+        "entity_id": change.entity_id,
+        "operation": change.operation,
+        "client_id": change.client_id,
+        "api_name": change.api_name
+    }
+
+def publish_change(change: ConfigChange):
+    """Broadcast a committed change to in-process subscribers"""
+    config_events.publish(change_event(change))
+
+async def publish_changes_since(session: AsyncSession, since: int) -> int:
+    """
+    Publish changes committed by other worker processes, drop their cached resolutions
+    and bring the API key index and client rate limits up to date
+    Returns the highest version seen, to pass as `since` on the next call
+    """
+    result = await session.execute(
+        select(ConfigChange).where(ConfigChange.id > since).order_by(ConfigChange.id).limit(1000)
+    )
+    for change in result.scalars().all():
+        since = change.id
+        if not config_events.publish(change_event(change)):
+            continue  # written by this process, already handled
+        if change.entity_type == ENTITY_CLIENT:
+            # A client created, re-keyed, re-limited or deleted elsewhere
+            row = (await session.execute(
+                select(Client.api_key_hash, Client.rate_limit_per_minute).where(Client.id == change.entity_id)
+            )).one_or_none()
+            api_key_index.set(change.entity_id, row.api_key_hash if row else None)
+            rate_limiter.set_override(change.entity_id, row.rate_limit_per_minute if row else None)
+        if change.client_id:
+            resolution_cache.invalidate_client(change.client_id)
+        else:
+            resolution_cache.invalidate_all()
+    return since
+
+async def get_changes_since(session: AsyncSession, since: int, until: Optional[int] = None) -> List[ConfigChange]:
+    """Raw change-log rows in (since, until], oldest first"""
+    query = select(ConfigChange).where(ConfigChange.id > since)
+    if until is not None:
+        query = query.where(ConfigChange.id <= until)
+    result = await session.execute(query.order_by(ConfigChange.id))
+    return result.scalars().all()
+
+async def get_catalog_version(session: AsyncSession) -> int:
+    """Current global config version (0 before the first write)"""
+    result = await session.execute(select(func.max(ConfigChange.id)))
+    return result.scalar() or 0
+
+def _isoformat(value) -> Optional[str]:
+    return value.isoformat() if value else None
+
+def _client_row(client: Client) -> Dict[str, Any]:
+    return {
+        "id": client.id,
+        "name": client.name,
+        "description": client.description,
+        "api_key_prefix": client.api_key_prefix,
+        "rate_limit_per_minute": client.rate_limit_per_minute,
+        "max_concurrent_calls": client.max_concurrent_calls,
+        "max_queued_calls": client.max_queued_calls
+    }
+
+def _config_row(config: ClientApiConfig) -> Dict[str, Any]:
+    return {
+        "id": config.id,
+        "client_id": config.client_id,
+        "api_name": config.api_name,
+        "api_base_url": config.api_base_url,
+        "api_token": config.api_token,
+        "api_version": config.api_version,
+        "timeout_seconds": config.timeout_seconds,
+        "max_retries": config.max_retries,
+        "breaker_failure_rate": config.breaker_failure_rate,
+        "breaker_slow_call_ms": config.breaker_slow_call_ms,
+        "breaker_slow_call_rate": config.breaker_slow_call_rate,
+        "breaker_minimum_calls": config.breaker_minimum_calls,
+        "breaker_open_seconds": config.breaker_open_seconds,
+        "max_concurrent_calls": config.max_concurrent_calls,
+        "description": config.description,
+        "updated_at": _isoformat(config.updated_at)
+    }
+
+def _template_row(template: ClientApiParameter) -> Dict[str, Any]:
+    return {
+        "id": template.id,
+        "client_api_config_id": template.client_api_config_id,
+        "template_name": template.template_name,
+        "description": template.description,
+        "http_method": template.http_method,
+        "endpoint_path": template.endpoint_path,
+        "parameter_template": template.parameter_template,
+        "response_mapping": template.response_mapping,
+        "cache_ttl_seconds": template.cache_ttl_seconds,
+        "cache_max_entries": template.cache_max_entries,
+        "cache_errors": template.cache_errors,
+        "updated_at": _isoformat(template.updated_at)
+    }
+
+# A row is part of the catalog only if it and all of its parents are active
+def _visible_clients():
+    return select(Client).where(Client.active == 1)
+
+def _visible_configs():
+    return (
+        select(ClientApiConfig)
+        .join(Client, ClientApiConfig.client_id == Client.id)
+        .where(and_(Client.active == 1, ClientApiConfig.active == 1))
+    )
+
+def _visible_templates():
+    return (
+        select(ClientApiParameter)
+        .join(ClientApiConfig, ClientApiParameter.client_api_config_id == ClientApiConfig.id)
+        .join(Client, ClientApiConfig.client_id == Client.id)
+        .where(and_(
+            Client.active == 1,
+            ClientApiConfig.active == 1,
+            ClientApiParameter.active == 1
+        ))
+    )
+
+async def get_catalog_snapshot(session: AsyncSession) -> Dict[str, Any]:
+    """
+    All active clients, configs and templates tagged with the catalog version
+    Rows are flat lists linked by id; all reads share one transaction
+    """
+    version = await get_catalog_version(session)
+    clients = (await session.execute(_visible_clients())).scalars().all()
+    configs = (await session.execute(_visible_configs())).scalars().all()
+    templates = (await session.execute(_visible_templates())).scalars().all()
+
+    return {
+        "version": version,
+        "clients": [_client_row(client) for client in clients],
+        "api_configs": [_config_row(config) for config in configs],
+        "parameter_templates": [_template_row(template) for template in templates]
+    }
+
+async def get_catalog_changes(session: AsyncSession, since: int, limit: int = 500) -> Dict[str, Any]:
+    """
+    Rows changed after version `since`, in the snapshot row format
+    Rows that were deleted or are no longer visible are listed under "deleted";
+    consumers drop the children of a deleted parent themselves.
+    """
+    result = await session.execute(
+        select(ConfigChange)
+        .where(ConfigChange.id > since)
+        .order_by(ConfigChange.id)
+        .limit(limit + 1)
+    )
+    changes = result.scalars().all()
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    current_version = await get_catalog_version(session)
+    version = changes[-1].id if changes else current_version
+
+    touched = {ENTITY_CLIENT: set(), ENTITY_API_CONFIG: set(), ENTITY_PARAMETER_TEMPLATE: set()}
+    for change in changes:
+        touched.setdefault(change.entity_type, set()).add(change.entity_id)
+
+    clients: List[Client] = []
+    configs: List[ClientApiConfig] = []
+    templates: List[ClientApiParameter] = []
+
+    if touched[ENTITY_CLIENT]:
+        clients = (await session.execute(
+            _visible_clients().where(Client.id.in_(touched[ENTITY_CLIENT]))
+        )).scalars().all()
+
+    # A client or config that became visible again brings its children along
+    client_ids = [client.id for client in clients]
+    if touched[ENTITY_API_CONFIG] or client_ids:
+        configs = (await session.execute(
+            _visible_configs().where(or_(
+                ClientApiConfig.id.in_(touched[ENTITY_API_CONFIG]),
+                ClientApiConfig.client_id.in_(client_ids)
+            ))
+        )).scalars().all()
+
+    config_ids = [config.id for config in configs]
+    if touched[ENTITY_PARAMETER_TEMPLATE] or config_ids:
+        templates = (await session.execute(
+            _visible_templates().where(or_(
+                ClientApiParameter.id.in_(touched[ENTITY_PARAMETER_TEMPLATE]),
+                ClientApiParameter.client_api_config_id.in_(config_ids)
+            ))
+        )).scalars().all()
+
+    return {
+        "since": since,
+        "version": version,
+        "has_more": has_more,
+        # The consumer is ahead of this database (e.g. it was rebuilt); reload the snapshot
+        "reset": since > current_version,
+        "clients": [_client_row(client) for client in clients],
+        "api_configs": [_config_row(config) for config in configs],
+        "parameter_templates": [_template_row(template) for template in templates],
+        "deleted": {
+            "clients": sorted(touched[ENTITY_CLIENT] - set(client_ids)),
+            "api_configs": sorted(touched[ENTITY_API_CONFIG] - set(config_ids)),
+            "parameter_templates": sorted(
+                touched[ENTITY_PARAMETER_TEMPLATE] - {template.id for template in templates}
+            )
+        }
+    }
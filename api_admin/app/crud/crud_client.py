@@ -1,54 +1,121 @@
-from typing import List, Optional
+from typing import Any, List, Optional, Dict, Tuple
 import uuid
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from ..models.client import Client
+from ..core.cache import resolution_cache
+from ..core.api_keys import api_key_index, generate_api_key, hash_api_key, api_key_prefix
+from ..core.rate_limit import rate_limiter
+from .crud_catalog import record_change, publish_change, ENTITY_CLIENT
+import logging
 
-async def create_client(session: AsyncSession, name: str) -> Client:
-    api_key = str(uuid.uuid4())
+logger = logging.getLogger(__name__)
+
+# Client columns update_client may change
+UPDATABLE_FIELDS = frozenset({"name", "active", "rate_limit_per_minute", "max_concurrent_calls", "max_queued_calls"})
+
+async def create_client(
+    session: AsyncSession,
+    name: str,
+    rate_limit_per_minute: Optional[int] = None,
+    max_concurrent_calls: Optional[int] = None,
+    max_queued_calls: Optional[int] = None
+) -> Tuple[Client, str]:
+    """Create a client; returns it with its API key, which is only stored hashed"""
+    api_key = generate_api_key()
     client = Client(
         id=str(uuid.uuid4()),
         name=name,
-        api_key=api_key
+        api_key_hash=hash_api_key(api_key),
+        api_key_prefix=api_key_prefix(api_key),
+        rate_limit_per_minute=rate_limit_per_minute,
+        max_concurrent_calls=max_concurrent_calls,
+        max_queued_calls=max_queued_calls
     )
     session.add(client)
+    change = record_change(session, ENTITY_CLIENT, client.id, client_id=client.id)
     await session.commit()
     await session.refresh(client)
-    return client
+    api_key_index.set(client.id, client.api_key_hash)
+    rate_limiter.set_override(client.id, client.rate_limit_per_minute)
+    resolution_cache.invalidate_client(client.id)
+    publish_change(change)
+    return client, api_key
+
+async def rotate_api_key(session: AsyncSession, client_id: str) -> Optional[Tuple[Client, str]]:
+    """Issue a new API key for a client; the old one stops working at once"""
+    client = await get_client(session, client_id)
+    if not client:
+        return None
+    api_key = generate_api_key()
+    client.api_key = None
+    client.api_key_hash = hash_api_key(api_key)
+    client.api_key_prefix = api_key_prefix(api_key)
+    change = record_change(session, ENTITY_CLIENT, client.id, client_id=client.id)
+    await session.commit()
+    await session.refresh(client)
+    api_key_index.set(client.id, client.api_key_hash)
+    resolution_cache.invalidate_client(client.id)
+    publish_change(change)
+    return client, api_key
+
+async def get_client_key_hashes(session: AsyncSession) -> List[Tuple[str, Optional[str]]]:
+    """(client_id, api_key_hash) of every client, to load the API key index"""
+    result = await session.execute(select(Client.id, Client.api_key_hash))
+    return result.all()
+
+async def get_client_rate_limits(session: AsyncSession) -> List[Tuple[str, Optional[int]]]:
+    """(client_id, rate_limit_per_minute) of every client, to load the rate limiter's overrides"""
+    result = await session.execute(select(Client.id, Client.rate_limit_per_minute))
+    return result.all()
 
 async def get_clients(session: AsyncSession) -> List[Client]:
     try:
-        print("Executing query to get all clients")
-        query = select(Client)
-        print("Query:", query)
-        result = await session.execute(query)
-        clients = result.scalars().all()
-        print("Query result:", clients)
-        return clients
+        result = await session.execute(select(Client))
+        return result.scalars().all()
     except Exception as e:
-        import traceback
-        print("Error in get_clients:", str(e))
-        print("Traceback:")
-        print(traceback.format_exc())
+        logger.exception(f"Error in get_clients: {e}")
         raise
 
 async def get_client(session: AsyncSession, client_id: str) -> Optional[Client]:
     result = await session.execute(select(Client).where(Client.id == client_id))
     return result.scalar_one_or_none()
 
-async def update_client(session: AsyncSession, client_id: str, name: str, active: int) -> Optional[Client]:
+async def get_clients_by_ids(session: AsyncSession, client_ids: List[str]) -> Dict[str, Client]:
+    """Get several clients keyed by id in one query"""
+    if not client_ids:
+        return {}
+    result = await session.execute(select(Client).where(Client.id.in_(client_ids)))
+    return {client.id: client for client in result.scalars().all()}
+
+async def update_client(session: AsyncSession, client_id: str, changes: Dict[str, Any]) -> Optional[Client]:
+    """
+    Apply `changes` (field -> value) to a client
+    Fields left out keep their value, so a partial update can't wipe a client's
+    rate limit or bulkhead overrides; an explicit None puts one back on the default.
+    """
     client = await get_client(session, client_id)
     if client:
-        client.name = name
-        client.active = active
+        for field, value in changes.items():
+            if field in UPDATABLE_FIELDS:
+                setattr(client, field, value)
+        change = record_change(session, ENTITY_CLIENT, client.id, client_id=client.id)
         await session.commit()
         await session.refresh(client)
+        rate_limiter.set_override(client.id, client.rate_limit_per_minute)
+        resolution_cache.invalidate_client(client.id)
+        publish_change(change)
     return client
 
 async def delete_client(session: AsyncSession, client_id: str) -> bool:
     client = await get_client(session, client_id)
     if client:
         await session.delete(client)
+        change = record_change(session, ENTITY_CLIENT, client_id, "delete", client_id=client_id)
         await session.commit()
+        api_key_index.remove(client_id)
+        rate_limiter.set_override(client_id, None)
+        resolution_cache.invalidate_client(client_id)
+        publish_change(change)
         return True
     return False
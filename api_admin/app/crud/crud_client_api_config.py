@@ -1,11 +1,20 @@
 # api_admin/app/crud/crud_client_api_config.py
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Any, Iterable, Tuple
 import uuid
-from sqlalchemy import select, and_
+import hashlib
+from sqlalchemy import select, and_, func, distinct
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, contains_eager
 from ..models.client_api_config import ClientApiConfig
 from ..models.client import Client
+from ..models.client_api_parameter import ClientApiParameter
+from ..core.cache import resolution_cache
+from .crud_catalog import record_change, publish_change, ENTITY_API_CONFIG
+
+def invalidate_resolution_cache(client_id: str):
+    """Drop cached resolutions for the client owning a changed configuration"""
+    resolution_cache.invalidate_client(client_id)
 
 async def create_client_api_config(
     session: AsyncSession, 
@@ -16,9 +25,18 @@ async def create_client_api_config(
     api_version: str = 'v1',
     timeout_seconds: int = 30,
     max_retries: int = 3,
-    description: str = None
+    description: str = None,
+    breaker_failure_rate: float = None,
+    breaker_slow_call_ms: int = None,
+    breaker_slow_call_rate: float = None,
+    breaker_minimum_calls: int = None,
+    breaker_open_seconds: int = None,
+    max_concurrent_calls: int = None
 ) -> ClientApiConfig:
-    """Create a new API configuration for a client"""
+    """
+    Create a new API configuration for a client
+    Raises IntegrityError if the client already has a configuration with this api_name
+    """
     
     config = ClientApiConfig(
         id=str(uuid.uuid4()),
@@ -29,11 +47,24 @@ async def create_client_api_config(
         api_version=api_version,
         timeout_seconds=timeout_seconds,
         max_retries=max_retries,
+        breaker_failure_rate=breaker_failure_rate,
+        breaker_slow_call_ms=breaker_slow_call_ms,
+        breaker_slow_call_rate=breaker_slow_call_rate,
+        breaker_minimum_calls=breaker_minimum_calls,
+        breaker_open_seconds=breaker_open_seconds,
+        max_concurrent_calls=max_concurrent_calls,
         description=description
     )
     session.add(config)
-    await session.commit()
+    change = record_change(session, ENTITY_API_CONFIG, config.id, client_id=client_id, api_name=api_name)
+    try:
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        raise
     await session.refresh(config)
+    invalidate_resolution_cache(client_id)
+    publish_change(change)
     return config
 
 async def get_client_api_configs(session: AsyncSession, client_id: str) -> List[ClientApiConfig]:
@@ -61,16 +92,96 @@ async def get_client_api_config(
     )
     return result.scalar_one_or_none()
 
-async def get_client_with_api_configs(session: AsyncSession, client_api_key: str) -> Optional[Client]:
-    """Get client and all their API configurations by API key"""
+async def get_client_api_config_by_id(session: AsyncSession, config_id: str) -> Optional[ClientApiConfig]:
+    """Get an API configuration by id, active or not"""
+    result = await session.execute(
+        select(ClientApiConfig).where(ClientApiConfig.id == config_id)
+    )
+    return result.scalar_one_or_none()
+
+async def get_client_api_configs_by_ids(session: AsyncSession, config_ids: List[str]) -> Dict[str, ClientApiConfig]:
+    """Get several API configurations keyed by id in one query"""
+    if not config_ids:
+        return {}
+    result = await session.execute(
+        select(ClientApiConfig).where(ClientApiConfig.id.in_(config_ids))
+    )
+    return {config.id: config for config in result.scalars().all()}
+
+async def get_client_with_api_configs(session: AsyncSession, client_id: str) -> Optional[Client]:
+    """Get an active client and all their API configurations"""
     result = await session.execute(
         select(Client)
         .options(selectinload(Client.api_configs))
-        .where(Client.api_key == client_api_key)
+        .where(Client.id == client_id)
         .where(Client.active == 1)
     )
     return result.scalar_one_or_none()
 
+def _bundle_etag(*parts) -> str:
+    # Counts are part of the signature because deletions don't move max(updated_at)
+    signature = "|".join(str(part) for part in parts)
+    return f'W/"{hashlib.sha1(signature.encode("utf-8")).hexdigest()}"'
+
+async def get_client_bundle_etag(session: AsyncSession, client_id: str) -> Optional[str]:
+    """Compute the bundle ETag with one aggregate query, without loading the bundle"""
+    result = await session.execute(
+        select(
+            Client.id,
+            Client.name,
+            Client.description,
+            func.count(distinct(ClientApiConfig.id)),
+            func.max(ClientApiConfig.updated_at),
+            func.count(distinct(ClientApiParameter.id)),
+            func.max(ClientApiParameter.updated_at)
+        )
+        .outerjoin(ClientApiConfig, and_(
+            ClientApiConfig.client_id == Client.id,
+            ClientApiConfig.active == 1
+        ))
+        .outerjoin(ClientApiParameter, and_(
+            ClientApiParameter.client_api_config_id == ClientApiConfig.id,
+            ClientApiParameter.active == 1
+        ))
+        .where(Client.id == client_id)
+        .where(Client.active == 1)
+        .group_by(Client.id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+    return _bundle_etag(*row)
+
+async def get_client_bundle(session: AsyncSession, client_id: str) -> Optional[Tuple[Client, str]]:
+    """
+    Load a client with its active configs and their active templates
+    Uses the client query plus two selectinload queries; returns (client, etag)
+    """
+    result = await session.execute(
+        select(Client)
+        .options(
+            selectinload(Client.api_configs.and_(ClientApiConfig.active == 1))
+            .selectinload(ClientApiConfig.parameter_templates.and_(ClientApiParameter.active == 1))
+        )
+        .where(Client.id == client_id)
+        .where(Client.active == 1)
+    )
+    client = result.scalar_one_or_none()
+    if client is None:
+        return None
+    
+    templates = [t for config in client.api_configs for t in config.parameter_templates]
+    etag = _bundle_etag(
+        client.id,
+        client.name,
+        client.description,
+        len(client.api_configs),
+        max((config.updated_at for config in client.api_configs), default=None),
+        len(templates),
+        max((t.updated_at for t in templates), default=None)
+    )
+    return client, etag
+
 async def update_client_api_config(
     session: AsyncSession,
     config_id: str,
@@ -79,6 +190,12 @@ async def update_client_api_config(
     api_version: str = None,
     timeout_seconds: int = None,
     max_retries: int = None,
+    breaker_failure_rate: float = None,
+    breaker_slow_call_ms: int = None,
+    breaker_slow_call_rate: float = None,
+    breaker_minimum_calls: int = None,
+    breaker_open_seconds: int = None,
+    max_concurrent_calls: int = None,
     description: str = None,
     active: int = None
 ) -> Optional[ClientApiConfig]:
@@ -100,13 +217,28 @@ async def update_client_api_config(
             config.timeout_seconds = timeout_seconds
         if max_retries is not None:
             config.max_retries = max_retries
+        if breaker_failure_rate is not None:
+            config.breaker_failure_rate = breaker_failure_rate
+        if breaker_slow_call_ms is not None:
+            config.breaker_slow_call_ms = breaker_slow_call_ms
+        if breaker_slow_call_rate is not None:
+            config.breaker_slow_call_rate = breaker_slow_call_rate
+        if breaker_minimum_calls is not None:
+            config.breaker_minimum_calls = breaker_minimum_calls
+        if breaker_open_seconds is not None:
+            config.breaker_open_seconds = breaker_open_seconds
+        if max_concurrent_calls is not None:
+            config.max_concurrent_calls = max_concurrent_calls
         if description is not None:
             config.description = description
         if active is not None:
             config.active = active
             
+        change = record_change(session, ENTITY_API_CONFIG, config.id, client_id=config.client_id, api_name=config.api_name)
         await session.commit()
         await session.refresh(config)
+        invalidate_resolution_cache(config.client_id)
+        publish_change(change)
     
     return config
 
@@ -118,8 +250,12 @@ async def delete_client_api_config(session: AsyncSession, config_id: str) -> boo
     config = result.scalar_one_or_none()
     
     if config:
+        client_id = config.client_id
         await session.delete(config)
+        change = record_change(session, ENTITY_API_CONFIG, config_id, "delete", client_id=client_id, api_name=config.api_name)
         await session.commit()
+        invalidate_resolution_cache(client_id)
+        publish_change(change)
         return True
     return False
 
@@ -129,19 +265,106 @@ async def get_client_api_configs_dict(session: AsyncSession, client_id: str) ->
     return {config.api_name: config for config in configs}
 
 # Utility function for the main API middleware
-async def get_api_config_for_request(session: AsyncSession, client_api_key: str, api_name: str) -> Optional[ClientApiConfig]:
+async def get_api_config_for_request(session: AsyncSession, client_id: str, api_name: str) -> Optional[ClientApiConfig]:
     """
     Get the API configuration for a specific client and API type
     This is what your main middleware will use
     """
-    # First get the client by their API key
     result = await session.execute(
-        select(Client).where(and_(Client.api_key == client_api_key, Client.active == 1))
+        select(ClientApiConfig)
+        .join(Client, ClientApiConfig.client_id == Client.id)
+        .options(contains_eager(ClientApiConfig.client))
+        .where(and_(
+            Client.id == client_id,
+            Client.active == 1,
+            ClientApiConfig.api_name == api_name,
+            ClientApiConfig.active == 1
+        ))
     )
-    client = result.scalar_one_or_none()
+    return result.scalar_one_or_none()
+
+def _resolution_payload(config: ClientApiConfig) -> Dict[str, Any]:
+    return {
+        "config_id": config.id,
+        "client_id": config.client_id,
+        "api_base_url": config.api_base_url,
+        "api_token": config.api_token,
+        "api_version": config.api_version,
+        "timeout_seconds": config.timeout_seconds,
+        "max_retries": config.max_retries,
+        "breaker_failure_rate": config.breaker_failure_rate,
+        "breaker_slow_call_ms": config.breaker_slow_call_ms,
+        "breaker_slow_call_rate": config.breaker_slow_call_rate,
+        "breaker_minimum_calls": config.breaker_minimum_calls,
+        "breaker_open_seconds": config.breaker_open_seconds,
+        "max_concurrent_calls": config.max_concurrent_calls,
+        "rate_limit_per_minute": config.client.rate_limit_per_minute,
+        "client_max_concurrent_calls": config.client.max_concurrent_calls,
+        "client_max_queued_calls": config.client.max_queued_calls
+    }
+
+async def resolve_api_config(session: AsyncSession, client_id: str, api_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Read-through cached variant of get_api_config_for_request
+    Returns the middleware-facing payload, or None for unknown client/api pairs
+    """
+    found, payload = resolution_cache.lookup(client_id, api_name)
+    if found:
+        return payload
     
-    if not client:
-        return None
+    generation = resolution_cache.generation
+    config = await get_api_config_for_request(session, client_id, api_name)
+    payload = _resolution_payload(config) if config else None
+    resolution_cache.store(client_id, api_name, payload, generation=generation)
+    return payload
+
+async def get_api_configs_for_requests(
+    session: AsyncSession,
+    pairs: Iterable[Tuple[str, str]]
+) -> Dict[Tuple[str, str], ClientApiConfig]:
+    """Resolve many (client_id, api_name) pairs with one joined query"""
+    pairs = set(pairs)
+    if not pairs:
+        return {}
+    
+    result = await session.execute(
+        select(Client.id, ClientApiConfig)
+        .join(ClientApiConfig, ClientApiConfig.client_id == Client.id)
+        .options(contains_eager(ClientApiConfig.client))
+        .where(and_(
+            Client.id.in_({client_id for client_id, _ in pairs}),
+            ClientApiConfig.api_name.in_({api_name for _, api_name in pairs}),
+            Client.active == 1,
+            ClientApiConfig.active == 1
+        ))
+    )
+    configs = {}
+    for client_id, config in result.all():
+        if (client_id, config.api_name) in pairs:
+            configs[(client_id, config.api_name)] = config
+    return configs
+
+async def resolve_api_configs(
+    session: AsyncSession,
+    pairs: Iterable[Tuple[str, str]]
+) -> Dict[Tuple[str, str], Optional[Dict[str, Any]]]:
+    """Batch variant of resolve_api_config; cache misses share a single query"""
+    resolved = {}
+    misses = []
+    for pair in dict.fromkeys(pairs):
+        found, payload = resolution_cache.lookup(*pair)
+        if found:
+            resolved[pair] = payload
+        else:
+            misses.append(pair)
+    
+    if misses:
+        generation = resolution_cache.generation
+        configs = await get_api_configs_for_requests(session, misses)
+        for pair in misses:
+            config = configs.get(pair)
+            payload = _resolution_payload(config) if config else None
+            resolution_cache.store(*pair, payload, generation=generation)
+            resolved[pair] = payload
     
-    # Then get their specific API configuration
-    return await get_client_api_config(session, client.id, api_name)
\ No newline at end of file
+    return resolved
@@ -1,9 +1,33 @@
 # api_admin/app/crud/crud_client_api_parameter.py
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Iterable, Iterator, Union
 import uuid
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from ..models.client_api_parameter import ClientApiParameter
+from ..models.client_api_config import ClientApiConfig
+from ..models.config_change import ConfigChange
+from ..core.template_compiler import compile_template, MissingParametersError, RenderedCall
+from ..core.jsonpath import JSONPathError
+from ..core.json_stream import JSONStreamError
+from ..core.entity_extractor import check_entity_patterns
+from .crud_client_api_config import invalidate_resolution_cache
+from .crud_catalog import record_change, publish_change, ENTITY_PARAMETER_TEMPLATE
+
+async def _record_template_change(
+    session: AsyncSession,
+    template_id: str,
+    client_api_config_id: str,
+    operation: str = "upsert"
+) -> Tuple[ConfigChange, Optional[str]]:
+    """Stage a change-log row for a template; returns it with the owning client id"""
+    result = await session.execute(
+        select(ClientApiConfig.client_id, ClientApiConfig.api_name)
+        .where(ClientApiConfig.id == client_api_config_id)
+    )
+    owner = result.one_or_none()
+    client_id, api_name = owner if owner else (None, None)
+    change = record_change(session, ENTITY_PARAMETER_TEMPLATE, template_id, operation, client_id=client_id, api_name=api_name)
+    return change, client_id
 
 async def create_parameter_template(
     session: AsyncSession,
@@ -13,10 +37,14 @@ async def create_parameter_template(
     http_method: str,
     endpoint_path: str,
     parameter_template: Dict[str, Any],
-    response_mapping: Optional[Dict[str, str]] = None
+    response_mapping: Optional[Dict[str, str]] = None,
+    cache_ttl_seconds: Optional[int] = None,
+    cache_max_entries: Optional[int] = None,
+    cache_errors: int = 0
 ) -> ClientApiParameter:
-    """Create a new parameter template"""
+    """Create a new parameter template; ValueError if an entity pattern can't be used"""
     
+    check_entity_patterns(parameter_template)
     template = ClientApiParameter(
         id=str(uuid.uuid4()),
         client_api_config_id=client_api_config_id,
@@ -25,12 +53,19 @@ async def create_parameter_template(
         http_method=http_method,
         endpoint_path=endpoint_path,
         parameter_template=parameter_template,
-        response_mapping=response_mapping or {}
+        response_mapping=response_mapping or {},
+        cache_ttl_seconds=cache_ttl_seconds,
+        cache_max_entries=cache_max_entries,
+        cache_errors=cache_errors
     )
     
     session.add(template)
+    change, client_id = await _record_template_change(session, template.id, client_api_config_id)
     await session.commit()
     await session.refresh(template)
+    if client_id:
+        invalidate_resolution_cache(client_id)
+    publish_change(change)
     return template
 
 async def get_parameter_templates(
@@ -74,7 +109,9 @@ async def update_parameter_template(
     template_id: str,
     **kwargs
 ) -> Optional[ClientApiParameter]:
-    """Update a parameter template"""
+    """Update a parameter template; ValueError if an entity pattern can't be used"""
+    if kwargs.get("parameter_template") is not None:
+        check_entity_patterns(kwargs["parameter_template"])
     template = await get_parameter_template(session, template_id)
     
     if template:
@@ -82,8 +119,12 @@ async def update_parameter_template(
             if hasattr(template, key) and value is not None:
                 setattr(template, key, value)
         
+        change, client_id = await _record_template_change(session, template.id, template.client_api_config_id)
         await session.commit()
         await session.refresh(template)
+        if client_id:
+            invalidate_resolution_cache(client_id)
+        publish_change(change)
     
     return template
 
@@ -93,7 +134,11 @@ async def delete_parameter_template(session: AsyncSession, template_id: str) ->
     
     if template:
         await session.delete(template)
+        change, client_id = await _record_template_change(session, template_id, template.client_api_config_id, "delete")
         await session.commit()
+        if client_id:
+            invalidate_resolution_cache(client_id)
+        publish_change(change)
         return True
     return False
 
@@ -113,54 +158,58 @@ def build_api_call(
     
     Returns:
         Dictionary with URL, method, headers, params, etc.
-    """
     
-    # Start with the endpoint path
-    endpoint_path = template.endpoint_path
-    
-    # Handle path parameters
-    path_params = template.parameter_template.get('path_params', {})
-    for param_name, param_config in path_params.items():
-        source_key = param_config.get('source', param_name)
-        if source_key in input_data:
-            endpoint_path = endpoint_path.replace(f'{{{param_name}}}', str(input_data[source_key]))
+    Raises:
+        MissingParametersError: listing every required parameter that wasn't provided
+    """
+    return compile_template(template)(input_data, base_url)
+
+def build_api_calls(
+    template: ClientApiParameter,
+    inputs: Iterable[Dict[str, Any]],
+    base_url: str
+) -> Iterator[RenderedCall]:
+    """
+    Build one API call per input row from the same template
     
-    # Build query parameters
-    query_params = {}
-    query_param_configs = template.parameter_template.get('query_params', {})
+    Yields RenderedCall(index, call, error) lazily, so arbitrarily large inputs
+    are streamed with bounded memory; a row that fails (e.g. a missing required
+    parameter) carries its error instead of aborting the batch.
+    """
+    return compile_template(template).render_many(inputs, base_url)
+
+def apply_response_mapping(
+    template: ClientApiParameter,
+    response_data: Any
+) -> Dict[str, Any]:
+    """
+    Extract the template's response_mapping fields from a parsed API response
     
-    for param_name, param_config in query_param_configs.items():
-        source_key = param_config.get('source', param_name)
-        
-        # Get value from input data or use default
-        if source_key in input_data:
-            value = input_data[source_key]
-        elif 'default' in param_config:
-            value = param_config['default']
-        elif param_config.get('required', False):
-            raise ValueError(f"Required parameter '{param_name}' not provided")
-        else:
-            continue
-        
-        # Type conversion
-        param_type = param_config.get('type', 'string')
-        if param_type == 'boolean':
-            value = str(value).lower()
-        elif param_type == 'array':
-            value = ','.join(map(str, value)) if isinstance(value, list) else str(value)
-        
-        query_params[param_name] = value
+    Definite paths ($.data.base_salary, $.items[0].name) map to a single value or
+    None; wildcard and filter paths ($.items[*].name, $.items[?(@.n > 1)]) map to a list.
     
-    # Build headers
-    headers = template.parameter_template.get('headers', {})
+    Raises:
+        JSONPathError: if a mapping expression is outside the supported subset
+    """
+    return compile_template(template).map_response(response_data)
+
+def extract_response_mapping(
+    template: ClientApiParameter,
+    chunks: Iterable[Union[bytes, str]],
+    ndjson: bool = False
+) -> Union[Dict[str, Any], Iterator[Dict[str, Any]]]:
+    """
+    Apply response_mapping to a raw response body without parsing all of it
     
-    # Construct full URL
-    full_url = f"{base_url.rstrip('/')}{endpoint_path}"
+    `chunks` is the body as it arrives (e.g. requests' iter_content()); reading stops
+    as soon as every mapped path is found. With ndjson=True an iterator of one mapped
+    dict per line is returned instead. Use compile_template(template).streaming_mapping
+    for the async variants.
     
-    return {
-        'url': full_url,
-        'method': template.http_method,
-        'params': query_params,
-        'headers': headers,
-        'response_mapping': template.response_mapping
-    }
\ No newline at end of file
+    Raises:
+        JSONStreamError: if the body is not valid JSON
+    """
+    mapping = compile_template(template).streaming_mapping
+    if ndjson:
+        return mapping.iter_ndjson(chunks)
+    return mapping.extract(chunks)
@@ -0,0 +1,52 @@
+# api_admin/app/crud/crud_intent.py
+from typing import List, Optional, Tuple
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.client import Client
+from ..models.client_api_config import ClientApiConfig
+from ..models.client_api_parameter import ClientApiParameter
+from ..core.intent_router import ClientIntents, IntentIndex, intent_router, template_document, template_fields
+from ..core.entity_extractor import EntityExtractor, collect_entity_rules
+
+async def get_active_client(session: AsyncSession, client_id: str) -> Optional[Client]:
+    result = await session.execute(
+        select(Client).where(and_(Client.id == client_id, Client.active == 1))
+    )
+    return result.scalar_one_or_none()
+
+async def get_client_templates(session: AsyncSession, client_id: str) -> List[Tuple[ClientApiParameter, str]]:
+    """Active templates of a client's active configurations, with their api_name"""
+    result = await session.execute(
+        select(ClientApiParameter, ClientApiConfig.api_name)
+        .join(ClientApiConfig, ClientApiParameter.client_api_config_id == ClientApiConfig.id)
+        .where(and_(
+            ClientApiConfig.client_id == client_id,
+            ClientApiConfig.active == 1,
+            ClientApiParameter.active == 1
+        ))
+        .order_by(ClientApiConfig.api_name, ClientApiParameter.template_name)
+    )
+    return result.all()
+
+async def get_client_intents(session: AsyncSession, client_id: str) -> Optional[ClientIntents]:
+    """
+    Read-through cached intent index and entity extractor for a client
+    Returns None for unknown or inactive clients
+    """
+    entry = intent_router.lookup(client_id)
+    if entry is not None:
+        return entry
+    
+    generation = intent_router.generation
+    client = await get_active_client(session, client_id)
+    if not client:
+        return None
+    templates = await get_client_templates(session, client.id)
+    index = IntentIndex(
+        (template_document(template, api_name), template_fields(template, api_name))
+        for template, api_name in templates
+    )
+    extractor = EntityExtractor(collect_entity_rules(template.parameter_template for template, _ in templates))
+    entry = ClientIntents(client.id, index, extractor)
+    intent_router.store(entry, generation)
+    return entry
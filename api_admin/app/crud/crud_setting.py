@@ -49,6 +49,150 @@ DEFAULT_SETTINGS = {
     "api_rate_limit": {
         "value": "100",
         "description": "Maximum API calls per minute per client"
+    },
+    "resolve_cache_max_entries": {
+        "value": "10000",
+        "description": "Resolved (client, API name) configurations kept in memory"
+    },
+    "resolve_cache_ttl_seconds": {
+        "value": "60",
+        "description": "Seconds a resolved API configuration is served from memory"
+    },
+    "resolve_cache_negative_ttl_seconds": {
+        "value": "10",
+        "description": "Seconds an unknown (client, API name) pair is remembered as not found"
+    },
+    "config_change_poll_seconds": {
+        "value": "1",
+        "description": "How often each worker checks for config changes made by other workers, in seconds"
+    },
+    "upstream_max_connections": {
+        "value": "100",
+        "description": "Connections per upstream API base URL (applies after a restart)"
+    },
+    "upstream_max_keepalive_connections": {
+        "value": "20",
+        "description": "Idle keep-alive connections kept per upstream API base URL (applies after a restart)"
+    },
+    "upstream_keepalive_expiry_seconds": {
+        "value": "30",
+        "description": "Seconds an idle upstream connection is kept open (applies after a restart)"
+    },
+    "upstream_retry_backoff_seconds": {
+        "value": "0.1",
+        "description": "Base delay before retrying an upstream call, doubled on every retry, in seconds"
+    },
+    "upstream_retry_backoff_max_seconds": {
+        "value": "2",
+        "description": "Longest delay between upstream retries, in seconds"
+    },
+    "response_cache_max_entries": {
+        "value": "1000",
+        "description": "Cached upstream responses per parameter template without its own cache_max_entries"
+    },
+    "breaker_failure_rate": {
+        "value": "0.5",
+        "description": "Share of failed upstream calls (0-1) that opens an API configuration's circuit breaker (0 disables)"
+    },
+    "breaker_slow_call_ms": {
+        "value": "0",
+        "description": "Upstream calls slower than this count as slow, in milliseconds (0 disables)"
+    },
+    "breaker_slow_call_rate": {
+        "value": "0.5",
+        "description": "Share of slow upstream calls (0-1) that opens the circuit breaker (0 disables)"
+    },
+    "breaker_minimum_calls": {
+        "value": "10",
+        "description": "Calls in a circuit breaker's window before its rates are judged"
+    },
+    "breaker_open_seconds": {
+        "value": "30",
+        "description": "Seconds an open circuit breaker fails fast before letting a probe call through"
+    },
+    "rate_limit_backend": {
+        "value": "memory",
+        "description": "Where rate limit buckets live: 'memory' (per worker) or 'sqlite' (shared by workers through rate_limit_path)"
+    },
+    "bulkhead_max_concurrent_calls": {
+        "value": "20",
+        "description": "In-flight upstream calls per client without its own max_concurrent_calls"
+    },
+    "bulkhead_max_queued_calls": {
+        "value": "50",
+        "description": "Upstream calls per client waiting for a slot before new ones are rejected"
+    },
+    "bulkhead_queue_timeout_seconds": {
+        "value": "5",
+        "description": "Seconds a queued upstream call waits for a slot before it is rejected"
+    },
+    "intent_confidence_threshold": {
+        "value": "0.5",
+        "description": "Local intent ranking confidence (0-1) at or above which the model isn't asked"
+    },
+    "intent_model_timeout_seconds": {
+        "value": "10",
+        "description": "Seconds an intent model call may take before the local ranking is used"
+    },
+    "intent_model_backend": {
+        "value": "openai",
+        "description": "Model asked about low-confidence intents: 'openai' (needs openai_api_key) or 'local'"
+    },
+    "intent_cache_ttl_seconds": {
+        "value": "3600",
+        "description": "Seconds a model intent decision is reused for the same or a similar question (0 disables the cache)"
+    },
+    "intent_cache_max_entries": {
+        "value": "1000",
+        "description": "Cached intent decisions per client"
+    },
+    "intent_cache_similarity": {
+        "value": "0.8",
+        "description": "Term overlap (0-1) at which a new question reuses a cached decision"
+    },
+    "intent_batch_window_ms": {
+        "value": "5",
+        "description": "Milliseconds concurrent intent questions of one client wait to share a model call (0 disables batching)"
+    },
+    "intent_batch_max_size": {
+        "value": "16",
+        "description": "Questions per batched intent model call"
+    },
+    "auth_token_cache_max_entries": {
+        "value": "10000",
+        "description": "Verified admin bearer tokens kept so requests skip re-verifying the JWT"
+    },
+    "auth_user_cache_ttl_seconds": {
+        "value": "60",
+        "description": "Seconds a signed-in admin's user record is reused before it is read again"
+    },
+    "password_hash_max_concurrency": {
+        "value": "2",
+        "description": "Password hashes checked at once; each one keeps a CPU core busy"
+    },
+    "password_hash_queue_timeout_seconds": {
+        "value": "5",
+        "description": "Seconds a login waits for a password hashing slot before it gets a 503"
+    },
+    "login_rate_limit_per_ip": {
+        "value": "20",
+        "description": "Login attempts per minute from one IP address"
+    },
+    "login_rate_limit_per_username": {
+        "value": "10",
+        "description": "Login attempts per minute for one username"
+    },
+    "log_level": {
+        "value": "INFO",
+        "description": "Lowest level written to the log: DEBUG, INFO, WARNING or ERROR"
+    },
+    "log_format": {
+        "value": "text",
+        "description": "Log line format: 'text' or 'json' (one object per line)"
+    },
+    "log_sample_rates": {
+        "value": "",
+        "description": "Share of sub-WARNING records kept per logger, e.g. 'app.core.auth=0.01,app.crud=0.1' (empty keeps all)"
     }
 }
 
@@ -1,32 +1,26 @@
 from typing import Optional
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from ..core.security import verify_password
+from ..core.security import password_hasher
 from ..models.user import User
 from ..database import get_async_session
+import logging
+
+logger = logging.getLogger(__name__)
 
 async def authenticate_user(username: str, password: str, session: AsyncSession) -> Optional[User]:
     try:
-        print(f"Executing query for username: {username}")
-        query = select(User).where(User.username == username)
-        print(f"Query: {query}")
-        result = await session.execute(query)
+        result = await session.execute(select(User).where(User.username == username))
         user = result.scalar_one_or_none()
-        print(f"Query result: {user}")
         if not user:
-            print("No user found")
+            logger.debug(f"No user named {username}")
             return None
-        print("Verifying password...")
-        if not verify_password(password, user.password_hash):
-            print("Invalid password")
+        if not await password_hasher.verify(password, user.password_hash):
+            logger.debug(f"Invalid password for {username}")
             return None
-        print("Password verified successfully")
         return user
     except Exception as e:
-        import traceback
-        print(f"Authentication error: {e}")
-        print("Traceback:")
-        print(traceback.format_exc())
+        logger.exception(f"Authentication error: {e}")
         raise
 
 async def get_user(username: str, session: AsyncSession) -> Optional[User]:
@@ -34,5 +28,5 @@ async def get_user(username: str, session: AsyncSession) -> Optional[User]:
         result = await session.execute(select(User).where(User.username == username))
         return result.scalar_one_or_none()
     except Exception as e:
-        print(f"Get user error: {e}")
+        logger.error(f"Get user error: {e}")
         return None
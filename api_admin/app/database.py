@@ -3,6 +3,9 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 import os
+import logging
+
+logger = logging.getLogger(__name__)
 
 Base = declarative_base()
 
@@ -16,7 +19,7 @@ DATABASE_FILE = os.path.join(DATABASE_DIR, 'api_middleware.sqlite')
 # SQLAlchemy database URL
 SQLALCHEMY_DATABASE_URL = f"sqlite+aiosqlite:///{DATABASE_FILE}"
 
-print(f"Database will be created at: {DATABASE_FILE}")
+logger.info(f"Database will be created at: {DATABASE_FILE}")
 
 engine = create_async_engine(
     SQLALCHEMY_DATABASE_URL, 
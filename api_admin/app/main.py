@@ -6,20 +6,49 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from .api.auth import router as auth_router
 from .api.clients import router as clients_router
-from .api.settings import router as settings_router
+from .api.settings import (
+    router as settings_router, configure_logging, configure_resolution_cache, configure_response_cache,
+    configure_auth_cache, configure_upstream, configure_circuit_breakers, configure_bulkheads,
+    configure_intents, configure_intent_cache, configure_rate_limits, configure_password_hasher
+)
 from .api.client_api_configs import router as client_api_configs_router 
+from .api.catalog import router as catalog_router
+from .api.execute import router as execute_router
+from .api.intents import router as intents_router
 from .database import Base, engine, AsyncSessionLocal, database_exists, get_database_path
-from .crud import crud_setting
+from .migrations import upgrade_schema
+from .crud import crud_setting, crud_catalog, crud_client
 from .core.config import settings
+from .core.api_keys import api_key_index
+from .core.executor import upstream_executor
+from .core.rate_limit import rate_limiter
+from .core.security import password_hasher
+from .core.llm import intent_model
+from .core.intent_classifier import intent_classifier
+from .core.logging_config import logging_system
 # Import models through __init__.py to ensure proper order
-from .models import User, Setting, Client, ClientApiConfig, ClientApiParameter
+from .models import User, Setting, Client, ClientApiConfig, ClientApiParameter, ConfigChange
+import asyncio
 import logging
 
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+logging_system.configure()
 logger = logging.getLogger(__name__)
 
+async def tail_config_changes():
+    """Publish config changes committed by other worker processes"""
+    async with AsyncSessionLocal() as session:
+        version = await crud_catalog.get_catalog_version(session)
+    while True:
+        # Read every round so a changed config_change_poll_seconds applies without a restart
+        await asyncio.sleep(settings.get_config_change_poll_seconds())
+        try:
+            async with AsyncSessionLocal() as session:
+                version = await crud_catalog.publish_changes_since(session, version)
+        except Exception as e:
+            logger.warning(f"Config change tailer error: {e}")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
@@ -30,7 +59,10 @@ async def lifespan(app: FastAPI):
         # Create all tables
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            applied = await conn.run_sync(upgrade_schema)
         logger.info("✅ Database tables created/verified")
+        for step in applied:
+            logger.info(f"✅ Schema upgrade: {step}")
         
         # Initialize settings
         async with AsyncSessionLocal() as session:
@@ -42,11 +74,42 @@ async def lifespan(app: FastAPI):
             db_settings = await crud_setting.get_settings_dict(session)
             settings.load_database_settings(db_settings)
             
+            try:
+                configure_logging()
+            except ValueError as e:
+                logger.warning(f"Keeping the current logging setup: {e}")
             logger.info(f"✅ Loaded {len(db_settings)} settings from database")
+            
+            api_key_index.load(await crud_client.get_client_key_hashes(session))
+            logger.info(f"✅ API key index: {api_key_index.stats()['keys']} client keys")
+            rate_limiter.load_overrides(await crud_client.get_client_rate_limits(session))
+            
+            configure_resolution_cache()
+            logger.info(f"✅ Resolution cache: {settings.get_resolve_cache_max_entries()} entries, {settings.get_resolve_cache_ttl_seconds()}s TTL")
+            
+            configure_response_cache()
+            configure_auth_cache()
+            
+            configure_upstream()
+            logger.info(f"✅ Upstream pools: {settings.get_upstream_max_connections()} connections per API base URL")
+            
+            configure_circuit_breakers()
+            
+            configure_bulkheads()
+            
+            configure_intents()
+            configure_intent_cache()
+            logger.info(f"✅ Intent routing: local threshold {settings.get_intent_confidence_threshold()}, model fallback {'on' if intent_classifier.model.enabled else 'off'}")
+            
+            configure_rate_limits()
+            logger.info(f"✅ Rate limit: {settings.get_api_rate_limit()} calls per minute per client ({rate_limiter.backend_name} backend)")
+            configure_password_hasher()
             logger.info(f"✅ JWT token expiration: {settings.get_token_expire_minutes()} minutes")
             logger.info(f"✅ Environment: {settings.get_environment()}")
             logger.info(f"✅ API Debug: {settings.get_api_debug()}")
         
+        change_tailer = asyncio.create_task(tail_config_changes())
+        
         logger.info("🎉 Application initialization completed successfully!")
         
     except Exception as e:
@@ -57,8 +120,12 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down application...")
-    # Add any cleanup code here if needed
+    change_tailer.cancel()
+    await upstream_executor.aclose()
+    await intent_model.aclose()
+    password_hasher.shutdown()
     logger.info("✅ Application shutdown completed")
+    logging_system.shutdown()
 
 # Create FastAPI app with lifespan
 app = FastAPI(
@@ -153,4 +220,7 @@ async def database_info():
 app.include_router(auth_router, tags=["Authentication"])
 app.include_router(clients_router, tags=["Clients"])
 app.include_router(settings_router, tags=["Settings"])
-app.include_router(client_api_configs_router, tags=["Client API Configurations"])  
\ No newline at end of file
+app.include_router(client_api_configs_router, tags=["Client API Configurations"])
+app.include_router(catalog_router, tags=["Catalog"])
+app.include_router(execute_router, tags=["Execution"])  
+app.include_router(intents_router, tags=["Intents"])
\ No newline at end of file
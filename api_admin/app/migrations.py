@@ -0,0 +1,83 @@
+# api_admin/app/migrations.py
+from typing import List
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import IntegrityError
+from .database import Base
+from .core.api_keys import hash_api_key, api_key_prefix
+import logging
+
+logger = logging.getLogger(__name__)
+
+def add_missing_indexes(conn) -> List[str]:
+    """Create model indexes that pre-date an existing database file"""
+    applied = []
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing_indexes:
+                continue
+            try:
+                with conn.begin_nested():
+                    index.create(conn)
+                applied.append(f"created index {index.name} on {table.name}")
+            except IntegrityError as e:
+                # Unique indexes can't be added while duplicate rows exist
+                logger.warning(f"Skipped index {index.name}: existing rows violate it ({e.orig})")
+
+    return applied
+
+def add_missing_columns(conn) -> List[str]:
+    """Add nullable or defaulted model columns that pre-date an existing database file"""
+    applied = []
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=conn.dialect)}"
+            default = column.default.arg if column.default is not None and column.default.is_scalar else None
+            if default is not None:
+                ddl += f" DEFAULT {default!r}" if isinstance(default, str) else f" DEFAULT {default}"
+            elif not column.nullable:
+                logger.warning(f"Skipped column {table.name}.{column.name}: NOT NULL without a default")
+                continue
+            conn.exec_driver_sql(ddl)
+            applied.append(f"added column {column.name} to {table.name}")
+
+    return applied
+
+def hash_client_api_keys(conn) -> List[str]:
+    """Replace plaintext client API keys with their hash and display prefix"""
+    if "clients" not in inspect(conn).get_table_names():
+        return []
+    rows = conn.execute(text("SELECT id, api_key FROM clients WHERE api_key IS NOT NULL")).all()
+    for client_id, api_key in rows:
+        conn.execute(
+            text("UPDATE clients SET api_key_hash = :hash, api_key_prefix = :prefix, api_key = NULL WHERE id = :id"),
+            {"hash": hash_api_key(api_key), "prefix": api_key_prefix(api_key), "id": client_id}
+        )
+    return [f"hashed {len(rows)} client API keys"] if rows else []
+
+# Ordered, idempotent upgrade steps applied on startup and by scripts/migrate_schema.py
+MIGRATION_STEPS = [
+    add_missing_columns,
+    hash_client_api_keys,
+    add_missing_indexes,
+]
+
+def upgrade_schema(conn) -> List[str]:
+    """Run every migration step against a synchronous connection"""
+    applied = []
+    for step in MIGRATION_STEPS:
+        applied.extend(step(conn))
+    return applied
@@ -6,6 +6,7 @@ from .setting import Setting
 from .client import Client
 from .client_api_config import ClientApiConfig
 from .client_api_parameter import ClientApiParameter
+from .config_change import ConfigChange
 
 # Make them available when importing from models
-__all__ = ["User", "Setting", "Client", "ClientApiConfig", "ClientApiParameter"]
\ No newline at end of file
+__all__ = ["User", "Setting", "Client", "ClientApiConfig", "ClientApiParameter", "ConfigChange"]
\ No newline at end of file
@@ -11,8 +11,14 @@ class Client(Base):
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String, unique=True, nullable=False)
     description = Column(String, nullable=True)
-    api_key = Column(String, unique=True, nullable=True)
+    api_key = Column(String, unique=True, nullable=True)  # Legacy plaintext key; emptied by migrations.hash_client_api_keys
+    api_key_hash = Column(String, unique=True, index=True, nullable=True)  # core.api_keys.hash_api_key of the key
+    api_key_prefix = Column(String, nullable=True)  # First characters of the key, for display
     active = Column(Integer, default=1)  # 1 for active, 0 for inactive
+    rate_limit_per_minute = Column(Integer, nullable=True)  # None uses the api_rate_limit setting, 0 disables
+    # Upstream call bulkhead (empty values use the bulkhead_* settings, 0 concurrent disables)
+    max_concurrent_calls = Column(Integer, nullable=True)
+    max_queued_calls = Column(Integer, nullable=True)
     created_at = Column(DateTime, server_default=func.now())
     
     # Relationship with lazy loading
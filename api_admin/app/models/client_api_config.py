@@ -1,5 +1,5 @@
 # api_admin/app/models/client_api_config.py
-from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey
+from sqlalchemy import Column, String, Integer, Float, DateTime, Text, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..database import Base
@@ -8,6 +8,11 @@ import uuid
 class ClientApiConfig(Base):
     """API configuration for each client - allows per-client API endpoints"""
     __tablename__ = "client_api_configs"
+    __table_args__ = (
+        # One configuration per API name per client; also serves resolution lookups
+        Index('uq_client_api_configs_client_api_name', 'client_id', 'api_name', unique=True),
+        Index('ix_client_api_configs_client_active', 'client_id', 'active'),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     client_id = Column(String, ForeignKey('clients.id'), nullable=False)
@@ -22,6 +27,16 @@ class ClientApiConfig(Base):
     timeout_seconds = Column(Integer, default=30)
     max_retries = Column(Integer, default=3)
     
+    # Circuit breaker thresholds (empty values use the breaker_* settings)
+    breaker_failure_rate = Column(Float, nullable=True)
+    breaker_slow_call_ms = Column(Integer, nullable=True)
+    breaker_slow_call_rate = Column(Float, nullable=True)
+    breaker_minimum_calls = Column(Integer, nullable=True)
+    breaker_open_seconds = Column(Integer, nullable=True)
+    
+    # Cap on in-flight calls through this configuration, within the client's own cap
+    max_concurrent_calls = Column(Integer, nullable=True)
+    
     # Status and metadata
     active = Column(Integer, default=1)
     description = Column(Text, nullable=True)
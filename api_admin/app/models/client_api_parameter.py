@@ -1,5 +1,5 @@
 # api_admin/app/models/client_api_parameter.py
-from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, JSON, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..database import Base
@@ -8,6 +8,9 @@ import uuid
 class ClientApiParameter(Base):
     """API parameter templates for different client API endpoints"""
     __tablename__ = "client_api_parameters"
+    __table_args__ = (
+        Index('ix_client_api_parameters_config_template_active', 'client_api_config_id', 'template_name', 'active'),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     client_api_config_id = Column(String, ForeignKey('client_api_configs.id'), nullable=False)
@@ -26,6 +29,11 @@ class ClientApiParameter(Base):
     # Response Configuration
     response_mapping = Column(JSON, nullable=True)
     
+    # Upstream response caching (disabled while cache_ttl_seconds is empty or 0)
+    cache_ttl_seconds = Column(Integer, nullable=True)
+    cache_max_entries = Column(Integer, nullable=True)
+    cache_errors = Column(Integer, default=0)
+    
     # Metadata
     active = Column(Integer, default=1)
     created_at = Column(DateTime, server_default=func.now())
@@ -0,0 +1,21 @@
+# api_admin/app/models/config_change.py
+from sqlalchemy import Column, String, Integer, DateTime
+from sqlalchemy.sql import func
+from ..database import Base
+
+class ConfigChange(Base):
+    """Append-only change log; the highest id is the global catalog version"""
+    __tablename__ = "config_changes"
+    # AUTOINCREMENT keeps versions monotonic even if old rows are pruned
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = Column(Integer, primary_key=True)
+    entity_type = Column(String, nullable=False)  # 'client', 'api_config' or 'parameter_template'
+    entity_id = Column(String, nullable=False)
+    operation = Column(String, nullable=False)  # 'upsert' or 'delete'
+
+    # Owning client/API, so consumers can invalidate without a lookup
+    client_id = Column(String, nullable=True)
+    api_name = Column(String, nullable=True)
+
+    changed_at = Column(DateTime, server_default=func.now())
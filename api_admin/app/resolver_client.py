@@ -0,0 +1,294 @@
+# api_admin/app/resolver_client.py
+"""
+Embeddable client for the admin service's resolve and bundle endpoints
+
+    resolver = ResolverClient("http://admin:8000", snapshot_path="/var/cache/resolver.json")
+    config = resolver.resolve(client_api_key, "employee")
+
+Fresh entries are served from memory. Stale entries are served immediately while a
+background refresh runs, so a slow admin service never blocks a request. Concurrent
+misses on one key share a single HTTP call, and when the service is unreachable the
+last-known-good values persisted to disk are used. Any object with a requests-style
+get()/post() (e.g. fastapi.testclient.TestClient) can be passed as `session`.
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Marks "no fallback available"; None is a valid cached value (unknown key)
+_NOTHING = object()
+
+class ResolverError(Exception):
+    """Raised when a value can't be fetched and no cached or on-disk copy exists"""
+
+class _Entry:
+    __slots__ = ("value", "fetched_at", "etag")
+
+    def __init__(self, value: Any, fetched_at: float, etag: Optional[str] = None):
+        self.value = value
+        self.fetched_at = fetched_at
+        self.etag = etag
+
+class ResolverClient:
+    def __init__(
+        self,
+        base_url: str,
+        session: Any = None,
+        ttl_seconds: float = 30,
+        stale_ttl_seconds: float = 3600,
+        timeout_seconds: float = 2.0,
+        snapshot_path: Optional[str] = None,
+        snapshot_interval_seconds: float = 10,
+        pool_size: int = 10,
+        refresh_workers: int = 4
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.ttl_seconds = ttl_seconds
+        self.stale_ttl_seconds = stale_ttl_seconds
+        self.timeout_seconds = timeout_seconds
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval_seconds = snapshot_interval_seconds
+
+        if session is None:
+            # One keep-alive pool shared by every thread using this client
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix="resolver-refresh")
+        self._last_known_good: Dict[Hashable, Any] = self._load_snapshot()
+        self._snapshot_written_at = 0.0
+
+        self.stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "fetches": 0,
+            "fetch_errors": 0,
+            "fallbacks": 0
+        }
+
+    # Public API
+
+    def resolve(self, client_api_key: str, api_name: str) -> Optional[Dict[str, Any]]:
+        """Config payload for (client_api_key, api_name), or None if the pair is unknown"""
+        return self._get(("resolve", client_api_key, api_name))
+
+    def get_bundle(self, client_api_key: str) -> Optional[Dict[str, Any]]:
+        """Client bundle (configs + parameter templates), or None if the key is unknown"""
+        return self._get(("bundle", client_api_key))
+
+    def resolve_many(self, pairs: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], Optional[Dict[str, Any]]]:
+        """Resolve several pairs; all misses are fetched with one batch call"""
+        results = {}
+        missing = []
+        for api_key, api_name in dict.fromkeys(pairs):
+            entry = self._entries.get(("resolve", api_key, api_name))
+            if entry is not None and self._age(entry) < self.stale_ttl_seconds:
+                results[(api_key, api_name)] = self._serve(("resolve", api_key, api_name), entry)
+            else:
+                missing.append((api_key, api_name))
+
+        if missing:
+            try:
+                results.update(self._fetch_batch(missing))
+            except Exception as e:
+                self.stats["fetch_errors"] += 1
+                for pair in missing:
+                    value = self._fallback(("resolve",) + pair)
+                    if value is _NOTHING:
+                        raise ResolverError(f"Could not resolve {pair}: {e}") from e
+                    results[pair] = value
+        return results
+
+    def invalidate(self, client_api_key: Optional[str] = None):
+        """Drop cached entries for one key (e.g. on a config-change event) or all of them"""
+        with self._lock:
+            if client_api_key is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[1] == client_api_key]:
+                    del self._entries[key]
+
+    def close(self):
+        self._refresher.shutdown(wait=False)
+        self._write_snapshot(force=True)
+        if isinstance(self.session, requests.Session):
+            self.session.close()
+
+    # Cache policy
+
+    def _age(self, entry: _Entry) -> float:
+        return time.monotonic() - entry.fetched_at
+
+    def _get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = self._age(entry)
+            if age < self.ttl_seconds:
+                self.stats["hits"] += 1
+                return entry.value
+            if age < self.stale_ttl_seconds:
+                return self._serve(key, entry)
+
+        self.stats["misses"] += 1
+        future, leader = self._join_inflight(key)
+        if leader:
+            self._run_fetch(key, future)
+        try:
+            return future.result()
+        except Exception as e:
+            value = self._fallback(key, entry)
+            if value is _NOTHING:
+                raise ResolverError(f"Could not resolve {key[1:]}: {e}") from e
+            return value
+
+    def _serve(self, key: Hashable, entry: _Entry) -> Any:
+        """Return a stale entry now and refresh it in the background"""
+        self.stats["stale_hits"] += 1
+        future, leader = self._join_inflight(key)
+        if leader:
+            self._refresher.submit(self._run_fetch, key, future)
+        return entry.value
+
+    def _join_inflight(self, key: Hashable) -> Tuple[Future, bool]:
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.stats["coalesced"] += 1
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            return future, True
+
+    def _run_fetch(self, key: Hashable, future: Future):
+        try:
+            value = self._fetch(key)
+        except Exception as e:
+            self.stats["fetch_errors"] += 1
+            future.set_exception(e)
+        else:
+            future.set_result(value)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _fallback(self, key: Hashable, entry: Optional[_Entry] = None) -> Any:
+        """Last-known value when the service can't be reached"""
+        if entry is None:
+            entry = self._entries.get(key)
+        if entry is not None:
+            self.stats["fallbacks"] += 1
+            return entry.value
+        if key in self._last_known_good:
+            self.stats["fallbacks"] += 1
+            return self._last_known_good[key]
+        return _NOTHING
+
+    def _store(self, key: Hashable, value: Any, etag: Optional[str] = None):
+        with self._lock:
+            self._entries[key] = _Entry(value, time.monotonic(), etag)
+            if value is not None:
+                self._last_known_good[key] = value
+        self._write_snapshot()
+
+    # HTTP
+
+    def _fetch(self, key: Hashable) -> Any:
+        self.stats["fetches"] += 1
+        if key[0] == "resolve":
+            _, api_key, api_name = key
+            response = self.session.get(
+                f"{self.base_url}/api/resolve-client-api/{api_key}/{api_name}",
+                timeout=self.timeout_seconds
+            )
+            return self._handle(key, response)
+
+        _, api_key = key
+        headers = {}
+        cached = self._entries.get(key)
+        if cached is not None and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        response = self.session.get(
+            f"{self.base_url}/api/clients/by-key/{api_key}/bundle",
+            headers=headers,
+            timeout=self.timeout_seconds
+        )
+        if response.status_code == 304 and cached is not None:
+            self._store(key, cached.value, cached.etag)
+            return cached.value
+        return self._handle(key, response)
+
+    def _handle(self, key: Hashable, response: Any) -> Any:
+        if response.status_code == 404:
+            self._store(key, None)
+            return None
+        if response.status_code != 200:
+            raise ResolverError(f"Admin service returned HTTP {response.status_code}")
+        value = response.json()
+        self._store(key, value, response.headers.get("etag"))
+        return value
+
+    def _fetch_batch(self, pairs: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Optional[Dict[str, Any]]]:
+        self.stats["fetches"] += 1
+        response = self.session.post(
+            f"{self.base_url}/api/resolve-client-api:batch",
+            json={"items": [{"client_api_key": k, "api_name": n} for k, n in pairs]},
+            timeout=self.timeout_seconds
+        )
+        if response.status_code != 200:
+            raise ResolverError(f"Admin service returned HTTP {response.status_code}")
+        results = {}
+        for item in response.json():
+            pair = (item["client_api_key"], item["api_name"])
+            if item["status"] in ("ok", "not_found"):
+                results[pair] = item["config"] if item["status"] == "ok" else None
+                self._store(("resolve",) + pair, results[pair])
+                continue
+            # Rate limited (or anything else): says nothing about the config, so keep what we had
+            value = self._fallback(("resolve",) + pair)
+            if value is _NOTHING:
+                raise ResolverError(f"Admin service answered '{item['status']}' for {pair}")
+            results[pair] = value
+        return results
+
+    # Last-known-good snapshot on disk
+
+    def _load_snapshot(self) -> Dict[Hashable, Any]:
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return {}
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {tuple(item["key"]): item["value"] for item in data.get("entries", [])}
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}
+
+    def _write_snapshot(self, force: bool = False):
+        if not self.snapshot_path:
+            return
+        now = time.monotonic()
+        if not force and now - self._snapshot_written_at < self.snapshot_interval_seconds:
+            return
+        self._snapshot_written_at = now
+        with self._lock:
+            entries = [{"key": list(key), "value": value} for key, value in self._last_known_good.items()]
+        tmp_path = f"{self.snapshot_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"written_at": time.time(), "entries": entries}, f)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError:
+            pass
@@ -5,15 +5,22 @@ from typing import Optional
 class ClientBase(BaseModel):
     name: str
     description: Optional[str] = None
-    api_key: Optional[str] = None
     active: Optional[int] = 1
+    rate_limit_per_minute: Optional[int] = None
+    max_concurrent_calls: Optional[int] = None  # In-flight upstream calls for the whole client
+    max_queued_calls: Optional[int] = None  # Calls waiting for a slot before new ones are rejected
 
 class ClientCreate(ClientBase):
     pass
 
 class Client(ClientBase):
     id: str
+    api_key_prefix: Optional[str] = None
     created_at: datetime
 
     class Config:
         from_attributes = True
+
+class ClientWithApiKey(Client):
+    """Returned when a key is issued; the only time the full key is shown"""
+    api_key: str
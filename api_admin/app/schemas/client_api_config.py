@@ -1,7 +1,8 @@
 # api_admin/app/schemas/client_api_config.py
 from pydantic import BaseModel, HttpUrl
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List, Dict, Any
+from .client_api_parameter import ClientApiParameter
 
 class ClientApiConfigBase(BaseModel):
     api_name: str  # 'employee', 'client', 'project', etc.
@@ -10,6 +11,12 @@ class ClientApiConfigBase(BaseModel):
     api_version: Optional[str] = 'v1'
     timeout_seconds: Optional[int] = 30
     max_retries: Optional[int] = 3
+    breaker_failure_rate: Optional[float] = None  # Share of failed calls (0-1) that opens the breaker; 0 disables
+    breaker_slow_call_ms: Optional[int] = None  # Calls slower than this count as slow; 0 disables
+    breaker_slow_call_rate: Optional[float] = None  # Share of slow calls (0-1) that opens the breaker; 0 disables
+    breaker_minimum_calls: Optional[int] = None  # Calls in the window before rates are judged
+    breaker_open_seconds: Optional[int] = None  # Fail-fast period before a probe call
+    max_concurrent_calls: Optional[int] = None  # In-flight calls through this configuration
     description: Optional[str] = None
     active: Optional[int] = 1
 
@@ -22,6 +29,12 @@ class ClientApiConfigUpdate(BaseModel):
     api_version: Optional[str] = None
     timeout_seconds: Optional[int] = None
     max_retries: Optional[int] = None
+    breaker_failure_rate: Optional[float] = None
+    breaker_slow_call_ms: Optional[int] = None
+    breaker_slow_call_rate: Optional[float] = None
+    breaker_minimum_calls: Optional[int] = None
+    breaker_open_seconds: Optional[int] = None
+    max_concurrent_calls: Optional[int] = None
     description: Optional[str] = None
     active: Optional[int] = None
 
@@ -38,11 +51,39 @@ class ClientWithApiConfigs(BaseModel):
     """Client model with their API configurations"""
     id: str
     name: str
-    api_key: str
+    api_key_prefix: Optional[str] = None
     active: int
     description: Optional[str] = None
     created_at: datetime
     api_configs: list[ClientApiConfig] = []
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ClientApiConfigBundle(ClientApiConfig):
+    """API configuration with its active parameter templates"""
+    parameter_templates: list[ClientApiParameter] = []
+
+class ClientBundle(BaseModel):
+    """Everything the middleware needs to serve one client"""
+    id: str
+    name: str
+    active: int
+    description: Optional[str] = None
+    api_configs: list[ClientApiConfigBundle] = []
+
+    class Config:
+        from_attributes = True
+
+class ResolveRequestItem(BaseModel):
+    client_api_key: str
+    api_name: str
+
+class ResolveBatchRequest(BaseModel):
+    items: List[ResolveRequestItem]
+
+class ResolveBatchResult(BaseModel):
+    client_api_key: str
+    api_name: str
+    status: str  # 'ok', 'not_found' or 'rate_limited'
+    config: Optional[Dict[str, Any]] = None
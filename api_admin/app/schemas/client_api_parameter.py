@@ -0,0 +1,22 @@
+# api_admin/app/schemas/client_api_parameter.py
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+class ClientApiParameter(BaseModel):
+    id: str
+    client_api_config_id: str
+    template_name: str
+    description: Optional[str] = None
+    http_method: Optional[str] = 'GET'
+    endpoint_path: str
+    parameter_template: Dict[str, Any]
+    response_mapping: Optional[Dict[str, Any]] = None
+    cache_ttl_seconds: Optional[int] = None  # Cache upstream responses this long; empty/0 disables
+    cache_max_entries: Optional[int] = None  # Per-template LRU bound; empty uses the global default
+    cache_errors: Optional[int] = 0  # 1 to also cache non-2xx responses and upstream failures
+    active: Optional[int] = 1
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
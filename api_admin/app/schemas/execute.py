@@ -0,0 +1,16 @@
+# api_admin/app/schemas/execute.py
+from pydantic import BaseModel
+from typing import Optional, Dict, Any
+
+class ExecuteRequest(BaseModel):
+    client_api_key: str
+    api_name: str  # 'employee', 'client', 'project', etc.
+    template_name: str  # e.g. 'salary_lookup'
+    input: Dict[str, Any] = {}  # Values for the template's parameter sources
+
+class ExecuteResult(BaseModel):
+    status_code: int  # Upstream HTTP status
+    data: Any = None  # response_mapping fields, or the raw body when there is no mapping
+    attempts: int
+    elapsed_ms: float
+    cached: bool = False  # Served from the template's response cache
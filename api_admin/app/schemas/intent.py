@@ -0,0 +1,32 @@
+# api_admin/app/schemas/intent.py
+from pydantic import BaseModel
+from typing import Optional, List, Dict
+
+class IntentClassifyRequest(BaseModel):
+    client_api_key: str
+    query: str  # The user's question, e.g. "what is the salary of employee 123"
+    top_k: int = 3  # Local candidates to return alongside the decision
+
+class IntentCandidate(BaseModel):
+    template_name: str
+    api_name: str
+    score: float  # BM25 score; only comparable within one response
+
+class IntentClassifyResult(BaseModel):
+    template_name: Optional[str] = None  # None when no template fits
+    api_name: Optional[str] = None
+    confidence: float  # 0-1
+    source: str  # 'local' (intent router), 'llm' (model fallback) or 'none'
+    cached: bool = False  # A model decision for a similar question was reused
+    entities: Dict[str, str] = {}  # Parameter source values found in the query, ready for /api/execute input
+    missing_sources: List[str] = []  # Required sources of the chosen template the query didn't mention
+    candidates: List[IntentCandidate] = []
+
+class IntentClassifyBatchRequest(BaseModel):
+    items: List[IntentClassifyRequest]
+
+class IntentClassifyBatchResult(BaseModel):
+    client_api_key: str
+    query: str
+    status: str  # 'ok', 'not_found' or 'rate_limited'
+    result: Optional[IntentClassifyResult] = None
@@ -0,0 +1,105 @@
+# api_admin/scripts/benchmark_response_mapping.py
+import sys
+import re
+import timeit
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path so we can import app
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.template_compiler import compile_template
+
+RESPONSE_MAPPING = {
+    "salary": "$.data.base_salary",
+    "currency": "$.data.currency",
+    "first_item": "$.data.items[0].name",
+    "last_item": "$.data.items[-1].name",
+    "item_names": "$.data.items[*].name",
+    "large_items": "$.data.items[?(@.amount > 100)].name",
+}
+
+RESPONSE = {
+    "data": {
+        "base_salary": 85000,
+        "currency": "USD",
+        "items": [{"name": f"item-{i}", "amount": i * 25} for i in range(10)],
+    }
+}
+
+_TOKEN = re.compile(r"\.([^.\[\]]+)|\[(\*|-?\d+|\?\(@\.(\w+)\s*(==|!=|>=|<=|>|<)\s*([^)]+)\))\]")
+
+def naive_evaluate(expression, document):
+    """Tokenize and walk the expression on every call, the way an ad-hoc evaluator would"""
+    nodes = [document]
+    wildcard = False
+    for match in _TOKEN.finditer(expression[1:]):
+        key, selector, field, op, literal = match.groups()
+        matched = []
+        for node in nodes:
+            if key is not None:
+                if isinstance(node, dict) and key in node:
+                    matched.append(node[key])
+            elif selector == "*":
+                wildcard = True
+                matched.extend(node if isinstance(node, list) else [])
+            elif field is not None:
+                wildcard = True
+                value = float(literal)
+                ops = {"==": lambda a: a == value, "!=": lambda a: a != value,
+                       ">": lambda a: a > value, "<": lambda a: a < value,
+                       ">=": lambda a: a >= value, "<=": lambda a: a <= value}
+                matched.extend(item for item in node if field in item and ops[op](item[field]))
+            else:
+                index = int(selector)
+                if isinstance(node, list) and -len(node) <= index < len(node):
+                    matched.append(node[index])
+        nodes = matched
+    if wildcard:
+        return nodes
+    return nodes[0] if nodes else None
+
+def naive_map(mapping, document):
+    return {field: naive_evaluate(expression, document) for field, expression in mapping.items()}
+
+def benchmark_response_mapping(number: int = 20000):
+    """Compare compiled response mapping against per-call path parsing"""
+
+    print("⏱️  Benchmarking response_mapping evaluation")
+    print("=" * 50)
+
+    template = SimpleNamespace(
+        id="benchmark-template",
+        updated_at=None,
+        http_method="GET",
+        endpoint_path="/salary",
+        parameter_template={},
+        response_mapping=RESPONSE_MAPPING,
+    )
+    compiled = compile_template(template)
+
+    try:
+        expected = naive_map(RESPONSE_MAPPING, RESPONSE)
+        actual = compiled.map_response(RESPONSE)
+        if actual != expected:
+            print(f"❌ Results differ:\n   naive:    {expected}\n   compiled: {actual}")
+            return
+        print(f"✅ Both evaluators agree: {actual}")
+
+        naive_seconds = min(timeit.repeat(lambda: naive_map(RESPONSE_MAPPING, RESPONSE), number=number, repeat=3))
+        compiled_seconds = min(timeit.repeat(lambda: compiled.map_response(RESPONSE), number=number, repeat=3))
+
+        print(f"\n📊 {number} mappings of {len(RESPONSE_MAPPING)} fields each")
+        print(f"   Naive per-call parsing: {naive_seconds / number * 1e6:8.2f} µs/mapping")
+        print(f"   Compiled accessors:     {compiled_seconds / number * 1e6:8.2f} µs/mapping")
+        print(f"   Speedup:                {naive_seconds / compiled_seconds:8.1f}x")
+
+    except Exception as e:
+        print(f"❌ Error during benchmark: {e}")
+        import traceback
+        print("Traceback:")
+        print(traceback.format_exc())
+        raise
+
+if __name__ == "__main__":
+    benchmark_response_mapping()
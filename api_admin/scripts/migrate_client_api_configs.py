@@ -101,7 +101,7 @@ async def show_client_api_configs():
                 if current_client != client.name:
                     current_client = client.name
                     print(f"\n🏢 Client: {client.name}")
-                    print(f"   🔑 API Key: {client.api_key}")
+                    print(f"   🔑 API Key: {client.api_key_prefix}…")
                 
                 print(f"   📡 {config.api_name.upper()} API:")
                 print(f"      URL: {config.api_base_url}")
@@ -0,0 +1,42 @@
+# api_admin/scripts/migrate_schema.py
+import sys
+import asyncio
+from pathlib import Path
+
+# Add parent directory to path so we can import app
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.database import engine, get_database_path, database_exists
+from app.migrations import upgrade_schema
+from app import models  # noqa: F401 - registers all tables on Base.metadata
+
+async def migrate_schema():
+    """Bring an existing database up to date with the current models"""
+
+    print(f"🔄 Upgrading schema for: {get_database_path()}")
+
+    if not database_exists():
+        print("❌ Database does not exist! Run scripts/init_db.py first.")
+        return
+
+    try:
+        async with engine.begin() as conn:
+            applied = await conn.run_sync(upgrade_schema)
+
+        if applied:
+            for step in applied:
+                print(f"   ✅ {step}")
+        else:
+            print("   ✅ Schema already up to date")
+
+        print("\n🎉 Schema migration completed!")
+
+    except Exception as e:
+        print(f"❌ Error during migration: {e}")
+        import traceback
+        print("Traceback:")
+        print(traceback.format_exc())
+        raise
+
+if __name__ == "__main__":
+    asyncio.run(migrate_schema())
@@ -0,0 +1,71 @@
+# api_admin/tests/conftest.py
+import asyncio
+import os
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import app
+from app.database import Base, get_async_session
+from app.migrations import upgrade_schema
+from app.core.auth import get_current_user
+from app.core.api_keys import api_key_index
+from app.core.cache import resolution_cache, response_cache
+from app.core.rate_limit import rate_limiter
+from app.models import User
+
+@pytest.fixture
+def api(tmp_path):
+    """
+    TestClient for the app on a scratch database, signed in as an admin
+    The lifespan doesn't run, so nothing touches the real database file.
+    """
+    # NullPool: every request runs on its own event loop, so connections can't be shared
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.sqlite'}", poolclass=NullPool)
+
+    async def create_schema():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(upgrade_schema)
+
+    asyncio.run(create_schema())
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def get_test_session():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_async_session] = get_test_session
+    app.dependency_overrides[get_current_user] = lambda: User(id="test-admin", username="admin", is_admin=1)
+    api_key_index.load([])
+    resolution_cache.invalidate_all()
+    response_cache.invalidate_all()
+    rate_limiter.clear()
+    rate_limiter.load_overrides([])
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+        asyncio.run(engine.dispose())
+
+def create_client(api: TestClient, **fields) -> dict:
+    response = api.post("/api/clients", json={"name": "acme", **fields})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def create_api_config(api: TestClient, client_id: str, api_name: str = "employee", **fields) -> dict:
+    response = api.post(f"/api/clients/{client_id}/api-configs", json={
+        "client_id": client_id,
+        "api_name": api_name,
+        "api_base_url": f"http://{api_name}.example",
+        "api_token": "upstream-token",
+        **fields
+    })
+    assert response.status_code == 200, response.text
+    return response.json()
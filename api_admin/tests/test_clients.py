@@ -0,0 +1,28 @@
+# api_admin/tests/test_clients.py
+from conftest import create_client
+
+OVERRIDES = {"rate_limit_per_minute": 7, "max_concurrent_calls": 3, "max_queued_calls": 4}
+
+def test_rename_keeps_rate_limit_and_bulkhead_overrides(api):
+    client = create_client(api, **OVERRIDES)
+    # What the dashboard's edit form sends
+    response = api.put(f"/api/clients/{client['id']}", json={"name": "renamed"})
+    assert response.status_code == 200, response.text
+    updated = response.json()
+    assert updated["name"] == "renamed"
+    assert updated["active"] == 1
+    for field, value in OVERRIDES.items():
+        assert updated[field] == value, field
+
+def test_explicit_null_puts_an_override_back_on_the_default(api):
+    client = create_client(api, **OVERRIDES)
+    response = api.put(f"/api/clients/{client['id']}", json={"name": "acme", "rate_limit_per_minute": None})
+    assert response.status_code == 200, response.text
+    assert response.json()["rate_limit_per_minute"] is None
+    assert response.json()["max_concurrent_calls"] == 3
+
+def test_toggling_active_keeps_the_overrides(api):
+    client = create_client(api, **OVERRIDES)
+    response = api.put(f"/api/clients/{client['id']}", json={"name": "acme", "active": 0})
+    assert response.json()["active"] == 0
+    assert response.json()["max_queued_calls"] == 4
@@ -0,0 +1,42 @@
+# api_admin/tests/test_entity_extractor.py
+import pytest
+
+from app.core.entity_extractor import EntityExtractor, EntityRule, check_entity_patterns, collect_entity_rules
+
+def template(**params) -> dict:
+    return {"query_params": params}
+
+def test_all_sources_come_out_in_one_pass():
+    extractor = EntityExtractor(collect_entity_rules([
+        template(employee_id={"source": "employee_id"}),
+        template(project={"source": "project_code", "pattern": r"PRJ-\d{3}"}),
+        template(email={"source": "email"})
+    ]))
+    assert extractor.extract("Is employee E-1042 on PRJ-007? Ask ann@example.com") == {
+        "employee_id": "E-1042",
+        "project_code": "PRJ-007",
+        "email": "ann@example.com"
+    }
+
+def test_patterns_with_plain_groups_still_work():
+    extractor = EntityExtractor([EntityRule("ticket", r"(?:INC|REQ)(\d+)", None, ())])
+    assert extractor.extract("see REQ123") == {"ticket": "REQ123"}
+
+@pytest.mark.parametrize("pattern", [r"(\d)\1", r"(a)?(?(1)b|c)", r"(?P<code>\d+)", r"[0-9"])
+def test_patterns_the_combined_regex_would_break_are_refused_on_save(pattern):
+    with pytest.raises(ValueError):
+        check_entity_patterns(template(code={"source": "code", "pattern": pattern}))
+
+def test_escaped_backslash_and_class_are_not_backreferences():
+    check_entity_patterns(template(
+        path={"source": "path", "pattern": r"\\1[a-z]+"},
+        octal={"source": "octal", "pattern": r"[\1-\7]+"}
+    ))
+
+def test_backreference_pattern_is_ignored_without_breaking_other_sources():
+    extractor = EntityExtractor([
+        EntityRule("pair", r"(\d)\1", None, ()),
+        EntityRule("project_code", r"PRJ-\d{3}", None, ())
+    ])
+    assert [rule.source for rule in extractor.rules] == ["project_code"]
+    assert extractor.extract("PRJ-123 and 55") == {"project_code": "PRJ-123"}
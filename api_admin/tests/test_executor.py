@@ -0,0 +1,179 @@
+# api_admin/tests/test_executor.py
+import asyncio
+import uuid
+
+import httpx
+import pytest
+
+from app.core.bulkhead import BulkheadFullError, bulkheads, CLIENT_SCOPE
+from app.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, circuit_breakers
+from app.core.executor import CircuitOpenError, UpstreamError, UpstreamExecutor
+
+class StubUpstream:
+    """Answers each request with the next of `replies` (a status code, an exception or a callable)"""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.requests = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        reply = self.replies.pop(0) if len(self.replies) > 1 else self.replies[0]
+        if callable(reply):
+            reply = await reply(request)
+        if isinstance(reply, Exception):
+            raise reply
+        if isinstance(reply, httpx.Response):
+            return reply
+        return httpx.Response(reply, json={"status": reply})
+
+def executor_for(upstream: StubUpstream, **options) -> UpstreamExecutor:
+    return UpstreamExecutor(transport=httpx.MockTransport(upstream), backoff_base_seconds=0, **options)
+
+def call(path: str = "/employees/1", method: str = "GET") -> dict:
+    return {"method": method, "url": f"http://upstream.example{path}", "params": {}, "headers": {}}
+
+def config(**fields) -> dict:
+    return {"api_base_url": "http://upstream.example", "timeout_seconds": 5, "max_retries": 3, **fields}
+
+def test_idempotent_call_is_retried_until_it_succeeds():
+    upstream = StubUpstream(503, 502, 200)
+    response = asyncio.run(executor_for(upstream).execute(call(), config()))
+    assert response.status_code == 200
+    assert response.attempts == 3
+    assert len(upstream.requests) == 3
+
+def test_retries_stop_at_max_retries():
+    upstream = StubUpstream(503)
+    response = asyncio.run(executor_for(upstream).execute(call(), config(max_retries=2)))
+    assert response.status_code == 503
+    assert response.attempts == 3
+
+def test_post_is_only_retried_when_it_never_reached_the_upstream():
+    upstream = StubUpstream(503)
+    response = asyncio.run(executor_for(upstream).execute(call(method="POST"), config()))
+    assert response.attempts == 1
+
+    upstream = StubUpstream(httpx.ConnectError("refused"), 201)
+    response = asyncio.run(executor_for(upstream).execute(call(method="POST"), config()))
+    assert response.status_code == 201
+    assert response.attempts == 2
+
+def test_timeout_is_raised_after_the_last_attempt():
+    async def hang(request):
+        await asyncio.sleep(1)
+
+    upstream = StubUpstream(hang)
+    with pytest.raises(UpstreamError) as raised:
+        asyncio.run(executor_for(upstream).execute(call(), config(timeout_seconds=0.05, max_retries=1)))
+    assert raised.value.timed_out
+    assert raised.value.attempts == 2
+
+def test_backoff_is_capped_and_honours_retry_after():
+    executor = UpstreamExecutor(backoff_base_seconds=0.1, backoff_max_seconds=0.5)
+    for attempt in range(1, 10):
+        assert 0 <= executor._backoff(attempt) <= min(0.5, 0.1 * 2 ** (attempt - 1))
+    throttled = httpx.Response(429, headers={"retry-after": "30"})
+    assert executor._backoff(1, throttled) == 0.5
+
+def test_breaker_opens_then_half_opens_then_closes():
+    config_id = f"breaker-{uuid.uuid4()}"
+    upstream = StubUpstream(500, 500, 200)
+    executor = executor_for(upstream)
+    breaker_config = config(
+        config_id=config_id, max_retries=0,
+        breaker_minimum_calls=2, breaker_failure_rate=0.5, breaker_open_seconds=0.05
+    )
+
+    async def scenario():
+        for path in ("/a", "/b"):
+            assert (await executor.execute(call(path), breaker_config)).status_code == 500
+        breaker = circuit_breakers.find(config_id)
+        assert breaker.state == OPEN
+
+        with pytest.raises(CircuitOpenError):
+            await executor.execute(call("/c"), breaker_config)
+        assert len(upstream.requests) == 2  # Failed fast
+
+        await asyncio.sleep(0.06)
+        assert breaker.allow() is None and breaker.state == HALF_OPEN
+        breaker.release()
+        assert (await executor.execute(call("/d"), breaker_config)).status_code == 200
+        assert breaker.state == CLOSED
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        circuit_breakers.remove(config_id)
+
+def test_failed_probe_reopens_the_breaker():
+    config_id = f"breaker-{uuid.uuid4()}"
+    executor = executor_for(StubUpstream(500))
+    breaker_config = config(
+        config_id=config_id, max_retries=0,
+        breaker_minimum_calls=1, breaker_failure_rate=1, breaker_open_seconds=0.05
+    )
+
+    async def scenario():
+        await executor.execute(call("/a"), breaker_config)
+        await asyncio.sleep(0.06)
+        await executor.execute(call("/b"), breaker_config)
+        breaker = circuit_breakers.find(config_id)
+        assert breaker.state == OPEN
+        assert breaker.opened_count == 2
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        circuit_breakers.remove(config_id)
+
+def test_zero_on_a_config_disables_a_check_instead_of_using_the_default():
+    config_id = f"breaker-{uuid.uuid4()}"
+    executor = executor_for(StubUpstream(500))
+    breaker_config = config(
+        config_id=config_id, max_retries=0,
+        breaker_minimum_calls=1, breaker_failure_rate=0, breaker_slow_call_ms=0
+    )
+
+    async def scenario():
+        for path in ("/a", "/b", "/c"):
+            assert (await executor.execute(call(path), breaker_config)).status_code == 500
+        breaker = circuit_breakers.find(config_id)
+        assert breaker.state == CLOSED
+        assert breaker.settings.failure_rate == 0
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        circuit_breakers.remove(config_id)
+
+def test_bulkhead_rejects_calls_beyond_its_slots_and_queue():
+    client_id = f"client-{uuid.uuid4()}"
+    release = None
+
+    async def slow(request):
+        await release.wait()
+        return httpx.Response(200, json={})
+
+    executor = executor_for(StubUpstream(slow))
+    limited = config(client_id=client_id, client_max_concurrent_calls=1, client_max_queued_calls=1)
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        first = asyncio.ensure_future(executor.execute(call("/a"), limited))
+        await asyncio.sleep(0.01)
+        queued = asyncio.ensure_future(executor.execute(call("/b"), limited))
+        await asyncio.sleep(0.01)
+        with pytest.raises(BulkheadFullError):
+            await executor.execute(call("/c"), limited)
+        assert executor.stats()["rejected_bulkhead"] == 1
+
+        release.set()
+        assert (await first).status_code == 200
+        assert (await queued).status_code == 200
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        bulkheads.discard_idle(CLIENT_SCOPE, client_id)
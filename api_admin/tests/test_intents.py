@@ -0,0 +1,140 @@
+# api_admin/tests/test_intents.py
+import asyncio
+import time
+
+import pytest
+
+from app.core.entity_extractor import EntityExtractor
+from app.core.intent_cache import intent_cache
+from app.core.intent_classifier import SOURCE_LOCAL, SOURCE_MODEL, intent_classifier
+from app.core.intent_router import ClientIntents, IntentDocument, IntentIndex
+from app.core.llm import LocalIntentModel, local_intent_model
+from app.crud import crud_intent
+from conftest import create_client
+
+DOCUMENTS = [
+    IntentDocument("t-1", "employee_details", "employee", "Profile of one employee", ("employee_id",)),
+    IntentDocument("t-2", "employee_projects", "project", "Projects an employee is staffed on", ("employee_id",))
+]
+
+# Both templates are about employees, so these stay below the local confidence threshold
+VAGUE = "what about employee info"
+
+@pytest.fixture
+def classifier():
+    """intent_classifier on the local stand-in model, with an empty semantic cache"""
+    previous = intent_classifier.model
+    window, max_size = intent_classifier.batcher.window_seconds, intent_classifier.batcher.max_batch_size
+    intent_classifier.configure(model_backend="local")
+    intent_cache.invalidate_all()
+    try:
+        yield intent_classifier
+    finally:
+        intent_classifier.model = previous
+        intent_classifier.batcher.configure(window_seconds=window, max_batch_size=max_size)
+        intent_cache.invalidate_all()
+
+def index() -> IntentIndex:
+    return IntentIndex([
+        (document, {
+            "template_name": document.template_name,
+            "sources": " ".join(document.sources),
+            "api_name": document.api_name,
+            "description": document.description
+        })
+        for document in DOCUMENTS
+    ])
+
+def classify_many(classifier, queries, client_id="client-1"):
+    return asyncio.run(classifier.classify_many(index(), queries, client_id))
+
+def test_confident_local_match_skips_the_model(classifier):
+    calls = local_intent_model.calls
+    [decision] = classify_many(classifier, ["employee details"])
+    assert decision.source == SOURCE_LOCAL
+    assert decision.document.template_id == "t-1"
+    assert local_intent_model.calls == calls
+
+def test_rephrasing_reuses_the_model_decision(classifier):
+    calls = local_intent_model.calls
+    [first] = classify_many(classifier, [VAGUE])
+    assert first.source == SOURCE_MODEL and not first.cached
+    assert local_intent_model.calls == calls + 1
+
+    # Same terms once stopwords are gone
+    [again] = classify_many(classifier, ["Please tell me the employee info"])
+    assert again.cached
+    assert again.document == first.document
+    assert local_intent_model.calls == calls + 1
+
+def test_near_duplicate_question_is_a_cache_hit(classifier):
+    classify_many(classifier, ["employee info card summary record"])
+    calls, similar_hits = local_intent_model.calls, intent_cache.similar_hits
+    [decision] = classify_many(classifier, ["employee info card summary"])  # Jaccard 4/5
+    assert decision.cached
+    assert local_intent_model.calls == calls
+    assert intent_cache.similar_hits == similar_hits + 1
+
+def test_cache_is_per_client_and_dropped_when_templates_change(classifier):
+    classify_many(classifier, [VAGUE], client_id="client-1")
+    assert not classify_many(classifier, [VAGUE], client_id="client-2")[0].cached
+    assert classify_many(classifier, [VAGUE], client_id="client-1")[0].cached
+
+    intent_cache.invalidate_client("client-1")
+    assert not classify_many(classifier, [VAGUE], client_id="client-1")[0].cached
+
+def test_concurrent_single_questions_share_one_model_call(classifier):
+    classifier.configure(batch_window_ms=20, batch_max_size=16)
+    shared = index()
+    calls = local_intent_model.calls
+
+    async def burst():
+        return await asyncio.gather(*(
+            classifier.classify(shared, query, "client-1")
+            for query in (VAGUE, "employee summary", "employee card")
+        ))
+
+    decisions = asyncio.run(burst())
+    assert [decision.source for decision in decisions] == [SOURCE_MODEL] * 3
+    assert local_intent_model.calls == calls + 1
+
+def test_cached_question_does_not_wait_for_the_batch_window(classifier):
+    classify_many(classifier, [VAGUE])
+    classifier.configure(batch_window_ms=1000)
+    calls = local_intent_model.calls
+
+    started = time.monotonic()
+    decision = asyncio.run(classifier.classify(index(), "Please tell me the employee info", "client-1"))
+    assert decision.cached
+    assert time.monotonic() - started < 0.5
+    assert local_intent_model.calls == calls
+
+class SlowModel(LocalIntentModel):
+    """The local stand-in taking as long as a remote model round-trip"""
+
+    async def classify_batch(self, queries, candidates):
+        await asyncio.sleep(0.2)
+        return await super().classify_batch(queries, candidates)
+
+def test_batch_endpoint_asks_the_model_for_all_clients_at_once(api, classifier, monkeypatch):
+    first, second = create_client(api, name="first"), create_client(api, name="second")
+
+    async def get_client_intents(session, client_id):
+        return ClientIntents(client_id, index(), EntityExtractor([]))
+
+    monkeypatch.setattr(crud_intent, "get_client_intents", get_client_intents)
+    classifier.model = SlowModel()
+    items = [
+        {"client_api_key": first["api_key"], "query": VAGUE},
+        {"client_api_key": second["api_key"], "query": "employee summary"},
+        {"client_api_key": first["api_key"], "query": "employee details"}
+    ]
+
+    started = time.monotonic()
+    response = api.post("/api/intents:classify-batch", json={"items": items})
+    assert response.status_code == 200, response.text
+    assert time.monotonic() - started < 0.35  # One model round-trip, not one per client
+    results = response.json()
+    assert [result["query"] for result in results] == [item["query"] for item in items]
+    assert [result["result"]["source"] for result in results] == [SOURCE_MODEL, SOURCE_MODEL, SOURCE_LOCAL]
+    assert classifier.model.calls == 2
@@ -0,0 +1,56 @@
+# api_admin/tests/test_rate_limit.py
+import asyncio
+
+from app.core.cache import resolution_cache
+from app.core.rate_limit import MemoryTokenBuckets, RateLimiter, rate_limiter
+from conftest import create_api_config, create_client
+
+def test_cost_above_the_limit_is_charged_as_a_full_bucket():
+    buckets = MemoryTokenBuckets()
+
+    async def scenario():
+        first = await buckets.hit("client-1", limit=5, cost=20)
+        second = await buckets.hit("client-1", limit=5, cost=20)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first.allowed and first.remaining == 0
+    assert not second.allowed and 0 < second.retry_after <= 60
+
+def test_throttled_resolve_reads_nothing_from_the_database(api):
+    client = create_client(api, rate_limit_per_minute=1)
+    create_api_config(api, client["id"])
+    url = f"/api/resolve-client-api/{client['api_key']}/employee"
+    assert api.get(url).status_code == 200
+    misses = resolution_cache.stats()["misses"]
+
+    response = api.get(url)
+    assert response.status_code == 429
+    assert "Retry-After" in response.headers
+    assert resolution_cache.stats()["misses"] == misses
+
+def test_client_limit_change_applies_at_once(api):
+    client = create_client(api)
+    assert rate_limiter.limit_for(client["id"]) == rate_limiter.default_limit
+    api.put(f"/api/clients/{client['id']}", json={"name": "acme", "rate_limit_per_minute": 3})
+    assert rate_limiter.limit_for(client["id"]) == 3
+    api.delete(f"/api/clients/{client['id']}")
+    assert rate_limiter.limit_for(client["id"]) == rate_limiter.default_limit
+
+def test_batch_larger_than_the_limit_is_not_throttled_forever(api):
+    client = create_client(api, rate_limit_per_minute=2)
+    create_api_config(api, client["id"])
+    items = [{"client_api_key": client["api_key"], "api_name": "employee"}] * 3
+
+    response = api.post("/api/resolve-client-api:batch", json={"items": items})
+    assert [item["status"] for item in response.json()] == ["ok"] * 3
+
+    response = api.post("/api/resolve-client-api:batch", json={"items": items})
+    assert [item["status"] for item in response.json()] == ["rate_limited"] * 3
+    assert response.json()[0]["config"] is None
+
+def test_sqlite_backend_moves_to_a_new_path(tmp_path):
+    limiter = RateLimiter(default_limit=5)
+    limiter.configure(backend="sqlite", path=str(tmp_path / "a.sqlite"))
+    limiter.configure(backend="sqlite", path=str(tmp_path / "b.sqlite"))
+    assert limiter._backend.path == str(tmp_path / "b.sqlite")
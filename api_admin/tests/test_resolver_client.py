@@ -0,0 +1,165 @@
+# api_admin/tests/test_resolver_client.py
+import threading
+import time
+
+import pytest
+
+from app.resolver_client import ResolverClient, ResolverError
+from conftest import create_api_config, create_client
+
+class FakeResponse:
+    def __init__(self, status_code: int, body=None, headers=None):
+        self.status_code = status_code
+        self._body = body
+        self.headers = headers or {}
+
+    def json(self):
+        return self._body
+
+class FakeSession:
+    """requests-style session answering from `routes`; `gate`, when set, holds every call until it opens"""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.requests = []
+        self.gate = None
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append((url, headers or {}))
+        if self.gate is not None:
+            self.gate.wait(5)
+        route = self.routes[url]
+        if isinstance(route, Exception):
+            raise route
+        return route(headers or {}) if callable(route) else route
+
+    def post(self, url, json=None, timeout=None):
+        self.requests.append((url, json))
+        route = self.routes[url]
+        return route(json) if callable(route) else route
+
+URL = "http://admin/api/resolve-client-api/key-1/employee"
+
+def wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+def test_resolves_against_the_app_in_process(api):
+    client = create_client(api)
+    create_api_config(api, client["id"])
+    resolver = ResolverClient("http://testserver", session=api)
+    try:
+        config = resolver.resolve(client["api_key"], "employee")
+        assert config["api_base_url"] == "http://employee.example"
+        assert resolver.resolve(client["api_key"], "employee") == config
+        assert resolver.resolve(client["api_key"], "project") is None
+        assert resolver.stats["hits"] == 1
+        assert resolver.stats["fetches"] == 2
+
+        pairs = resolver.resolve_many([(client["api_key"], "employee"), ("unknown-key", "employee")])
+        assert pairs[(client["api_key"], "employee")] == config
+        assert pairs[("unknown-key", "employee")] is None
+    finally:
+        resolver.close()
+
+def test_stale_entry_is_served_while_it_refreshes():
+    versions = iter([{"version": 1}, {"version": 2}])
+    session = FakeSession({URL: lambda headers: FakeResponse(200, next(versions))})
+    resolver = ResolverClient("http://admin", session=session, ttl_seconds=0)
+    try:
+        assert resolver.resolve("key-1", "employee") == {"version": 1}
+        assert resolver.resolve("key-1", "employee") == {"version": 1}
+        assert resolver.stats["stale_hits"] == 1
+        wait_for(lambda: resolver._entries[("resolve", "key-1", "employee")].value == {"version": 2})
+        assert len(session.requests) == 2
+    finally:
+        resolver.close()
+
+def test_concurrent_misses_share_one_fetch():
+    session = FakeSession({URL: FakeResponse(200, {"api_name": "employee"})})
+    session.gate = threading.Event()
+    resolver = ResolverClient("http://admin", session=session)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(resolver.resolve("key-1", "employee")))
+        for _ in range(5)
+    ]
+    try:
+        for thread in threads:
+            thread.start()
+        wait_for(lambda: resolver.stats["coalesced"] == 4)
+        session.gate.set()
+        for thread in threads:
+            thread.join(5)
+        assert results == [{"api_name": "employee"}] * 5
+        assert len(session.requests) == 1
+    finally:
+        resolver.close()
+
+def test_falls_back_to_the_snapshot_when_the_service_is_down(tmp_path):
+    snapshot_path = str(tmp_path / "resolver.json")
+    resolver = ResolverClient(
+        "http://admin", session=FakeSession({URL: FakeResponse(200, {"api_name": "employee"})}),
+        snapshot_path=snapshot_path
+    )
+    resolver.resolve("key-1", "employee")
+    resolver.close()
+
+    down = FakeSession({URL: ConnectionError("admin service unreachable")})
+    restarted = ResolverClient("http://admin", session=down, snapshot_path=snapshot_path)
+    try:
+        assert restarted.resolve("key-1", "employee") == {"api_name": "employee"}
+        assert restarted.stats["fallbacks"] == 1
+    finally:
+        restarted.close()
+
+    without_snapshot = ResolverClient("http://admin", session=down)
+    try:
+        with pytest.raises(ResolverError):
+            without_snapshot.resolve("key-1", "employee")
+    finally:
+        without_snapshot.close()
+
+def test_bundle_is_revalidated_with_its_etag():
+    bundle = {"client_id": "c-1", "configs": []}
+
+    def answer(headers):
+        if headers.get("If-None-Match") == '"v1"':
+            return FakeResponse(304)
+        return FakeResponse(200, bundle, {"etag": '"v1"'})
+
+    session = FakeSession({"http://admin/api/clients/by-key/key-1/bundle": answer})
+    resolver = ResolverClient("http://admin", session=session, ttl_seconds=0)
+    try:
+        assert resolver.get_bundle("key-1") == bundle
+        assert resolver.get_bundle("key-1") == bundle
+        wait_for(lambda: len(session.requests) == 2 and not resolver._inflight)
+        assert session.requests[1][1] == {"If-None-Match": '"v1"'}
+        assert resolver.get_bundle("key-1") == bundle
+    finally:
+        resolver.close()
+
+def test_rate_limited_batch_keeps_what_was_cached():
+    batch_url = "http://admin/api/resolve-client-api:batch"
+
+    def throttled(body):
+        return FakeResponse(200, [
+            {"client_api_key": item["client_api_key"], "api_name": item["api_name"], "status": "rate_limited"}
+            for item in body["items"]
+        ])
+
+    session = FakeSession({URL: FakeResponse(200, {"api_name": "employee"}), batch_url: throttled})
+    resolver = ResolverClient("http://admin", session=session, stale_ttl_seconds=0)
+    try:
+        assert resolver.resolve("key-1", "employee") == {"api_name": "employee"}
+        pairs = resolver.resolve_many([("key-1", "employee")])
+        assert pairs[("key-1", "employee")] == {"api_name": "employee"}
+        assert resolver._entries[("resolve", "key-1", "employee")].value == {"api_name": "employee"}
+
+        # Nothing known about the pair: fail like an unreachable service, don't report "not found"
+        with pytest.raises(ResolverError):
+            resolver.resolve_many([("key-1", "project")])
+    finally:
+        resolver.close()
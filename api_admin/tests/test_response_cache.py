@@ -0,0 +1,22 @@
+# api_admin/tests/test_response_cache.py
+from datetime import datetime, timedelta
+
+from app.core.cache import ResponseCache, ResponseCachePolicy
+
+def policy(version) -> ResponseCachePolicy:
+    return ResponseCachePolicy("template-1", version, "config-1", ttl_seconds=60, max_entries=None, cache_errors=False)
+
+def test_newer_template_version_starts_a_fresh_cache():
+    cache = ResponseCache()
+    old, new = datetime(2026, 1, 1), datetime(2026, 1, 1) + timedelta(seconds=1)
+    cache.store(policy(old), "key", "old response")
+    assert cache.lookup(policy(new), "key") == (False, None)
+
+def test_older_template_version_leaves_the_current_cache_alone():
+    cache = ResponseCache()
+    old, new = datetime(2026, 1, 1), datetime(2026, 1, 1) + timedelta(seconds=1)
+    cache.store(policy(new), "key", "new response")
+    # A request that compiled the template before the update races the warm cache
+    assert cache.lookup(policy(old), "key") == (False, None)
+    cache.store(policy(old), "key", "old response")
+    assert cache.lookup(policy(new), "key") == (True, "new response")
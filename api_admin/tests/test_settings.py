@@ -0,0 +1,68 @@
+# api_admin/tests/test_settings.py
+from app.core.bulkhead import bulkheads
+from app.core.circuit_breaker import circuit_breakers
+from app.core.config import Settings
+from app.core.executor import upstream_executor
+from app.core.intent_classifier import intent_classifier
+from app.core.llm import intent_model, local_intent_model
+from app.core.rate_limit import login_ip_limiter, login_user_limiter
+from app.crud.crud_setting import DEFAULT_SETTINGS
+
+def test_seeded_defaults_match_the_built_in_ones():
+    built_in = Settings()
+    for key, data in DEFAULT_SETTINGS.items():
+        getter = getattr(built_in, f"get_{key}", None)
+        if getter is None:
+            continue
+        value = getter()
+        if value is None:
+            continue  # A getter that maps its "off" value to None
+        assert type(value)(data["value"]) == value, key
+
+def test_changed_setting_applies_without_a_restart(api):
+    assert api.post("/api/settings", json={"key": "upstream_retry_backoff_seconds", "value": "0.1"}).status_code == 200
+    try:
+        assert api.put("/api/settings/upstream_retry_backoff_seconds", json={"value": "0.5"}).status_code == 200
+        assert upstream_executor.backoff_base_seconds == 0.5
+    finally:
+        assert api.delete("/api/settings/upstream_retry_backoff_seconds").status_code == 200
+    assert upstream_executor.backoff_base_seconds == 0.1
+
+def test_bulkhead_defaults_apply_without_a_restart(api):
+    assert api.post("/api/settings", json={"key": "bulkhead_max_queued_calls", "value": "7"}).status_code == 200
+    try:
+        assert bulkheads.defaults.max_queued == 7
+    finally:
+        assert api.delete("/api/settings/bulkhead_max_queued_calls").status_code == 200
+    assert bulkheads.defaults.max_queued == 50
+
+def test_intent_model_backend_switches_without_a_restart(api):
+    assert api.post("/api/settings", json={"key": "intent_model_backend", "value": "local"}).status_code == 200
+    try:
+        assert intent_classifier.model is local_intent_model
+        # An unknown backend is logged and leaves the current one in place
+        assert api.put("/api/settings/intent_model_backend", json={"value": "nope"}).status_code == 200
+        assert intent_classifier.model is local_intent_model
+    finally:
+        assert api.delete("/api/settings/intent_model_backend").status_code == 200
+    assert intent_classifier.model is intent_model
+
+def test_login_limits_apply_without_a_restart(api):
+    assert api.post("/api/settings", json={"key": "login_rate_limit_per_username", "value": "3"}).status_code == 200
+    try:
+        assert login_user_limiter.default_limit == 3
+        assert login_ip_limiter.default_limit == 20
+    finally:
+        assert api.delete("/api/settings/login_rate_limit_per_username").status_code == 200
+    assert login_user_limiter.default_limit == 10
+
+def test_slow_call_tracking_can_be_switched_off_again(api):
+    assert api.post("/api/settings", json={"key": "breaker_slow_call_ms", "value": "500"}).status_code == 200
+    try:
+        assert circuit_breakers.defaults.slow_call_ms == 500
+        assert api.put("/api/settings/breaker_slow_call_ms", json={"value": "0"}).status_code == 200
+        assert circuit_breakers.defaults.slow_call_ms is None
+        assert api.put("/api/settings/breaker_slow_call_ms", json={"value": "500"}).status_code == 200
+    finally:
+        assert api.delete("/api/settings/breaker_slow_call_ms").status_code == 200
+    assert circuit_breakers.defaults.slow_call_ms is None
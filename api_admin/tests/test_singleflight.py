@@ -0,0 +1,46 @@
+# api_admin/tests/test_singleflight.py
+import asyncio
+import gc
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    executions = 0
+
+    async def fetch():
+        nonlocal executions
+        executions += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def scenario():
+        return await asyncio.gather(*(flights.do("key", fetch) for _ in range(5)))
+
+    assert asyncio.run(scenario()) == ["value"] * 5
+    assert executions == 1
+    assert flights.stats()["coalesced"] == 4
+
+def test_failure_after_every_waiter_left_is_not_reported_as_unretrieved():
+    flights = SingleFlight()
+    unhandled = []
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def scenario():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: unhandled.append(context))
+        waiter = asyncio.ensure_future(flights.do("key", fail))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.sleep(0.05)
+        gc.collect()
+
+    asyncio.run(scenario())
+    assert unhandled == []
+    assert flights.stats()["in_flight"] == 0